@@ -0,0 +1,32 @@
+import sys
+import tracemalloc
+
+from physics import Quantity
+from physics import units as U
+
+
+# Number of scalar quantities in the simulated event list.
+N = 1_000_000
+
+
+def bytes_per_quantity(n, make):
+    # Memory allocated per element of a list of n quantities, the list itself excluded.
+    tracemalloc.start()
+    events = [None] * n
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(n):
+        events[i] = make(i)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / n
+
+
+if __name__ == "__main__":
+    q = Quantity(1.0, U.m)
+    print(f"Quantity instance: {sys.getsizeof(q)} bytes, has __dict__: {hasattr(q, '__dict__')}")
+    print(f"float value: {sys.getsizeof(q.value)} bytes")
+
+    # The units are interned, so every quantity only holds a reference to a shared Unit
+    print(f"Quantity(float, m):      {bytes_per_quantity(N, lambda i: Quantity(float(i), U.m)):.1f} bytes per scalar")
+    print(f"Quantity(float, N*m):    {bytes_per_quantity(N, lambda i: Quantity(float(i), U.N * U.m)):.1f} bytes per scalar")
+    print(f"Quantity(float, km) * s: {bytes_per_quantity(N, lambda i: Quantity(float(i), U.km) * Quantity(2.0, U.s)):.1f} bytes per scalar")
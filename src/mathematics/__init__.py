@@ -1,4 +1,13 @@
-from .autodiff import Variable
-from .gradients import gradients
+from .autodiff import Variable, Constant, stop_gradient
+from .gradients import gradients, multi_gradients
+from .taylor import taylor_series, taylor_derivatives
+from .tape import Tape
+from .scheduler import ThreadScheduler
+from .precision import use_precision, set_precision, get_precision
+from .serialization import GraphCache, structural_hash
+from .packing import ParameterVector
+from .optimize import minimize
+from .uncertainty import propagate_uncertainty
+from .service import CompiledExpression, EvaluationService, InProcessClient
 from .functions import *
-from .curves import *
\ No newline at end of file
+from .curves import *
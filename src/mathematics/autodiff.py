@@ -1,6 +1,16 @@
 import numpy as np
 import math as math
 
+from . import series
+from . import precision
+
+
+def _call_ufunc(ufunc, method, value):
+    """Apply an element-wise function to a value, deferring to its own implementation (e.g. Quantity.__cos__) if any."""
+    if hasattr(type(value), method):
+        return getattr(value, method)()
+    return ufunc(value)
+
 
 class NodeDict(dict):
     def __getitem__(self, key):
@@ -40,6 +50,17 @@ class NodeDict(dict):
             raise KeyError(key)
 
 
+# Binary ufuncs redirected by Node.__array_ufunc__ to the operator and reflected operator.
+_binary_ufuncs = {
+    np.add: ("__add__", "__radd__"),
+    np.subtract: ("__sub__", "__rsub__"),
+    np.multiply: ("__mul__", "__rmul__"),
+    np.true_divide: ("__truediv__", "__rtruediv__"),
+    np.power: ("__pow__", "__rpow__"),
+    np.matmul: ("__matmul__", "__rmatmul__"),
+}
+
+
 # Node in a computation graph.
 class Node(object):
 
@@ -53,14 +74,26 @@ class Node(object):
             self.inputs: the list of input nodes.
             self.op: the associated op object, e.g. add_op object if this node is created by adding two other nodes.
             self.const_attr: the add or multiply constant, e.g. self.const_attr=5 if this node is created by x+5.
+            self.dtypes: the precision policy in effect when the node was built.
         """
         self.name = name
+        self.dtypes = precision.current_policy()
         self.value = value
         self.inputs = []
         self.op = None
         self.const_attr = None
 
 
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        # Values are stored in the compute dtype of the node's precision policy, if any.
+        self._value = precision.cast(value, precision.compute_dtype(self.dtypes))
+
+
     def __add__(self, other):
         """Adding two nodes return a new node."""
         if isinstance(other, Node):
@@ -74,19 +107,19 @@ class Node(object):
     def __sub__(self, other):
         """Subtracting two nodes return a new node."""
         if isinstance(other, Node):
-            new_node = add_op(self, -other)
+            new_node = sub_op(self, other)
         else:
             # Subtract by a constant stores the constant in the new node's const_attr field.
-            new_node = add_byconst_op(self, -other)
+            new_node = sub_byconst_op(self, other)
         return new_node
 
     def __rsub__(self, other):  
         """Subtracting a node from a constant return a new node."""
         if isinstance(other, Node):
-            new_node = add_op(self, -other)
+            new_node = sub_op(other, self)
         else:
-            # Subtract a constant from a node stores the constant in the new node's const_attr field.
-            new_node = add_byconst_op(self, -other)
+            # Subtract a node from a constant stores the constant in the new node's const_attr field.
+            new_node = add_byconst_op(-self, other)
         return new_node
         
 
@@ -123,8 +156,9 @@ class Node(object):
         return new_node
     
 
-    # Allow left-hand-side matrix multiply.
-    __rmatmul__ = __matmul__
+    def __rmatmul__(self, other):
+        """Matrix multiplying a constant by a node return a new node."""
+        return matmul_op(as_node(other), self)
 
 
     def __truediv__(self, other):
@@ -137,8 +171,11 @@ class Node(object):
         return new_node
     
 
-    # Allow left-hand-side division.
-    __rtruediv__ = __truediv__
+    def __rtruediv__(self, other):
+        """Dividing a constant by a node return a new node."""
+        if isinstance(other, Node):
+            return div_op(other, self)
+        return mul_byconst_op(pow_byconst_op(self, -1), other)
 
     
     def __pow__(self, other):
@@ -151,40 +188,50 @@ class Node(object):
         return new_node
     
 
+    def __rpow__(self, other):
+        """Exponentiating a constant by a node return a new node."""
+        return pow_op(as_node(other), self)
+
+
     def __square__(self):
         """Element-wise square function."""
-        return pow_op(self, 2)
+        return pow_byconst_op(self, 2)
     
 
     # Logical operators
     def __eq__(self, other):
         """Element-wise equality comparison."""
-        return equal_op(self, other)
+        return equal_op(self, as_node(other))
 
     def __ne__(self, other):
         """Element-wise inequality comparison."""
-        return not_equal_op(self, other)
+        return not_op(equal_op(self, as_node(other)))
 
     def __lt__(self, other):
         """Element-wise less-than comparison."""
-        return less_op(self, other)
+        return lt_op(self, as_node(other))
 
     def __le__(self, other):
         """Element-wise less-than-or-equal-to comparison."""
-        return less_equal_op(self, other)
+        return le_op(self, as_node(other))
 
     def __gt__(self, other):
         """Element-wise greater-than comparison."""
-        return greater_op(self, other)
+        return gt_op(self, as_node(other))
 
     def __ge__(self, other):
         """Element-wise greater-than-or-equal-to comparison."""
-        return greater_equal_op(self, other)
+        return ge_op(self, as_node(other))
+
+
+    def __bool__(self):
+        """Truth value of the node's value, e.g. of a comparison node."""
+        return bool(self.value)
     
 
     def __sqrt__(self):
         """Element-wise square root function."""
-        return pow_op(self, 0.5)
+        return pow_byconst_op(self, 0.5)
     
 
     def __neg__(self):
@@ -289,7 +336,14 @@ class Node(object):
     
 
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
-        if ufunc in (np.add, np.subtract, np.multiply, np.true_divide, np.power, np.equal, np.not_equal, np.less, np.less_equal, np.greater, np.greater_equal, np.dot):
+        if ufunc in _binary_ufuncs and method == "__call__":
+            # Redirect to the (reflected) operator, e.g. ndarray * Node -> Node.__rmul__.
+            operator, reflected = _binary_ufuncs[ufunc]
+            lhs, rhs = inputs
+            if lhs is self:
+                return getattr(self, operator)(rhs)
+            return getattr(self, reflected)(lhs)
+        elif ufunc in (np.equal, np.not_equal, np.less, np.less_equal, np.greater, np.greater_equal, np.dot):
             return getattr(self, method)(*inputs, **kwargs)
         elif ufunc is np.sqrt: 
             return self.__pow__(1/2)
@@ -329,6 +383,9 @@ class Node(object):
 # Op represents operations performed on nodes.
 class Op(object):
 
+    # Whether gradients flow through the nodes of this op to their inputs.
+    differentiable = True
+
     def __call__(self):
         # Create a new node and associate the op object with the node.
         new_node = Node()
@@ -366,6 +423,21 @@ class Op(object):
         raise NotImplementedError
 
 
+    def taylor(self, node, input_series):
+        """Given the Taylor series of the input nodes, compute the Taylor series of the output node.
+
+        Parameters
+        ----------
+        node: node that performs the expansion, its value is the zeroth coefficient.
+        input_series: list of normalized Taylor coefficients [c_0, ..., c_k] for each input node.
+
+        Returns
+        -------
+        The list of normalized Taylor coefficients [c_0, ..., c_k] of the node.
+        """
+        raise NotImplementedError
+
+
 # Op to feed value to a nodes.
 class PlaceholderOp(Op):
 
@@ -387,6 +459,61 @@ def Variable(name, value):
     return placeholder_node
 
 
+# Op to feed a frozen value, skipped by the backward sweep.
+class ConstantOp(Op):
+    differentiable = False
+
+    def __call__(self):
+        """Creates a constant node."""
+        return Op.__call__(self)
+
+    def gradient(self, node, output_grad):
+        """No gradient function since node has no inputs."""
+        return None
+
+
+def Constant(name, value):
+    # Constants in an expression, e.g. physical constants or reference positions.
+    constant_node = constant_op()
+    constant_node.name = name
+    constant_node.value = value
+    return constant_node
+
+
+def as_node(value):
+    # Wrap a constant operand in a constant node, nodes are returned unchanged.
+    if isinstance(value, Node):
+        return value
+    return Constant(str(value), value)
+
+
+# Op forwarding the value of a node while blocking its gradient.
+class StopGradientOp(Op):
+    differentiable = False
+
+    def __call__(self, node_A):
+        new_node = Op.__call__(self)
+        new_node.inputs = [node_A]
+        new_node.name = f"stop_gradient({node_A.name})"
+        new_node.value = self.compute(new_node, [node_A.value])
+        return new_node
+
+    def compute(self, node, input_vals):
+        return input_vals[0]
+
+    def gradient(self, node, output_grad):
+        """The input receives no gradient contribution."""
+        return [None]
+
+    def taylor(self, node, input_series):
+        return series.constant(node.value, len(input_series[0]) - 1)
+
+
+def stop_gradient(node):
+    # Treat a node (or a value) as a constant in the backward sweep, keeping its forward value.
+    return stop_gradient_op(as_node(node))
+
+
 # Op to element-wise add two nodes.
 class AddOp(Op):
 
@@ -395,13 +522,47 @@ class AddOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s+%s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value + node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] + input_vals[1]
+
     def gradient(self, node, output_grad):
         # Given gradient of add node, return gradient contributions to each input.
         return [output_grad, output_grad]
-    
+
+    def taylor(self, node, input_series):
+        return series.add(*input_series)
+
+
+# Op to element-wise sum several nodes, accumulating in the dtype of the precision policy.
+class SumOp(Op):
+
+    def __call__(self, *nodes):
+        # Create a new node that is the result of summing the input nodes.
+        new_node = Op.__call__(self)
+        new_node.inputs = list(nodes)
+        new_node.name = "(%s)" % "+".join(str(node.name) for node in nodes)
+        new_node.value = self.compute(new_node, [node.value for node in nodes])
+        return new_node
+
+    def compute(self, node, input_vals):
+        total = precision.accumulate(input_vals[0], node.dtypes)
+        for value in input_vals[1:]:
+            total = total + precision.accumulate(value, node.dtypes)
+        return total
+
+    def gradient(self, node, output_grad):
+        # Given gradient of sum node, return gradient contributions to each input.
+        return [output_grad] * len(node.inputs)
+
+    def taylor(self, node, input_series):
+        total = input_series[0]
+        for coefficients in input_series[1:]:
+            total = series.add(total, coefficients)
+        return total
+
 
 # Op to element-wise add a nodes by a constant.
 class AddByConstOp(Op):
@@ -412,46 +573,64 @@ class AddByConstOp(Op):
         new_node.const_attr = const_val
         new_node.inputs = [node_A]
         new_node.name = "(%s+%s)" % (node_A.name, str(const_val))
-        new_node.value = node_A.value + const_val
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] + node.const_attr
+
     def gradient(self, node, output_grad):
         # Given gradient of add node, return gradient contribution to input.
         return [output_grad]
-    
 
-# # Op to element-wise sub two nodes.
-# class SubOp(Op):
+    def taylor(self, node, input_series):
+        return series.shift(input_series[0], node.const_attr)
 
-#     def __call__(self, node_A, node_B):
-#         # Create a new node that is the result of subtracting two input nodes.
-#         new_node = Op.__call__(self)
-#         new_node.inputs = [node_A, node_B]
-#         new_node.name = "(%s-%s)" % (node_A.name, node_B.name)
-#         new_node.value = node_A.value - node_B.value
-#         return new_node
 
-#     def gradient(self, node, output_grad):
-#         # Given gradient of sub node, return gradient contributions to each input.
-#         return [-output_grad, -output_grad]
-    
+# Op to element-wise sub two nodes.
+class SubOp(Op):
+
+    def __call__(self, node_A, node_B):
+        # Create a new node that is the result of subtracting two input nodes.
+        new_node = Op.__call__(self)
+        new_node.inputs = [node_A, node_B]
+        new_node.name = "(%s-%s)" % (node_A.name, node_B.name)
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
+        return new_node
+
+    def compute(self, node, input_vals):
+        return input_vals[0] - input_vals[1]
+
+    def gradient(self, node, output_grad):
+        # Given gradient of sub node, return gradient contributions to each input.
+        return [output_grad, -output_grad]
+
+    def taylor(self, node, input_series):
+        return series.add(input_series[0], series.neg(input_series[1]))
+
+
+# Op to element-wise sub a nodes by a constant.
+class SubByConstOp(Op):
+
+    def __call__(self, node_A, const_val):
+        # Create a new node that is the result of subtracting a node and a constant.
+        new_node = Op.__call__(self)
+        new_node.const_attr = const_val
+        new_node.inputs = [node_A]
+        new_node.name = "(%s-%s)" % (node_A.name, str(const_val))
+        new_node.value = self.compute(new_node, [node_A.value])
+        return new_node
+
+    def compute(self, node, input_vals):
+        return input_vals[0] - node.const_attr
+
+    def gradient(self, node, output_grad):
+        # Given gradient of sub node, return gradient contribution to input.
+        return [output_grad]
+
+    def taylor(self, node, input_series):
+        return series.shift(input_series[0], -node.const_attr)
 
-# # Op to element-wise sub a nodes by a constant.
-# class SubByConstOp(Op):
-
-#     def __call__(self, node_A, const_val):
-#         # Create a new node that is the result of subtracting a node and a constant.
-#         new_node = Op.__call__(self)
-#         new_node.const_attr = const_val
-#         new_node.inputs = [node_A]
-#         new_node.name = "(%s-%s)" % (node_A.name, str(const_val))
-#         new_node.value = node_A.value - const_val
-#         return new_node
-
-#     def gradient(self, node, output_grad):
-#         # Given gradient of sub node, return gradient contribution to input.
-#         return [-output_grad]
-    
 
 # Op to element-wise multiply two nodes.
 class MulOp(Op):
@@ -461,13 +640,19 @@ class MulOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s*%s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value * node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] * input_vals[1]
+
     def gradient(self, node, output_grad):
         # Given gradient of multiply node, return gradient contributions to each input.
         return [output_grad * node.inputs[1], output_grad * node.inputs[0]]
 
+    def taylor(self, node, input_series):
+        return series.mul(*input_series)
+
 
 # Op to element-wise multiply a nodes by a constant.
 class MulByConstOp(Op):
@@ -478,13 +663,19 @@ class MulByConstOp(Op):
         new_node.const_attr = const_val
         new_node.inputs = [node_A]
         new_node.name = "(%s*%s)" % (node_A.name, str(const_val))
-        new_node.value = node_A.value * const_val
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
         
+    def compute(self, node, input_vals):
+        return input_vals[0] * node.const_attr
+
     def gradient(self, node, output_grad):
         # Given gradient of mul by const node, return gradient contributions to the input node.
         return [node.const_attr * output_grad]     
-       
+
+    def taylor(self, node, input_series):
+        return series.scale(input_series[0], node.const_attr)
+
 
 # Op to matrix multiply two nodes.
 class MatMulOp(Op):
@@ -505,21 +696,23 @@ class MatMulOp(Op):
         new_node.matmul_attr_trans_B = trans_B
         new_node.inputs = [node_A, node_B]
         new_node.name = "MatMul(%s,%s,%s,%s)" % (node_A.name, node_B.name, str(trans_A), str(trans_B))
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
+        return new_node
+    
 
+    def compute(self, node, input_vals):
         # Compute the matrix multiplication based on the transposition attributes
-        if trans_A:
-            A = node_A.value.T
+        if node.matmul_attr_trans_A:
+            A = input_vals[0].T
         else:
-            A = node_A.value
+            A = input_vals[0]
 
-        if trans_B:
-            B = node_B.value.T
+        if node.matmul_attr_trans_B:
+            B = input_vals[1].T
         else:
-            B = node_B.value
+            B = input_vals[1]
 
-        new_node.value = np.matmul(A, B)
-        return new_node
-    
+        return np.matmul(A, B)
 
     def gradient(self, node, output_grad):
         """
@@ -527,18 +720,26 @@ class MatMulOp(Op):
             
         Useful formula: if Y=AB, then dA=dY B^T, dB=A^T dY
         """
-        if node.matmul_attr_trans_A:
-            dA = MatMulOp(output_grad, node.inputs[1], trans_A=False, trans_B=True)
+        A, B = node.inputs
+        dY = as_node(output_grad)
+        trans_A, trans_B = node.matmul_attr_trans_A, node.matmul_attr_trans_B
+
+        if trans_A:
+            dA = matmul_op(B, dY, trans_A=trans_B, trans_B=True)
         else:
-            dA = MatMulOp(output_grad, node.inputs[1], trans_A=False, trans_B=False)
+            dA = matmul_op(dY, B, trans_A=False, trans_B=not trans_B)
 
-        if node.matmul_attr_trans_B:
-            dB = MatMulOp(node.inputs[0], output_grad, trans_A=True, trans_B=False)
+        if trans_B:
+            dB = matmul_op(dY, A, trans_A=True, trans_B=trans_A)
         else:
-            dB = MatMulOp(node.inputs[0], output_grad, trans_A=False, trans_B=False)
+            dB = matmul_op(A, dY, trans_A=not trans_A, trans_B=False)
 
         return [dA, dB]
 
+    def taylor(self, node, input_series):
+        trans_A, trans_B = node.matmul_attr_trans_A, node.matmul_attr_trans_B
+        return series.mul(*input_series, op=lambda A, B: np.matmul(A.T if trans_A else A, B.T if trans_B else B))
+
 
 # Op
 class MatMulByConstOp(Op):
@@ -548,14 +749,20 @@ class MatMulByConstOp(Op):
         new_node.const_attr = const_matrix
         new_node.inputs = [node_A]
         new_node.name = "(%s*%s)" % (node_A.name, str(const_matrix))
-        new_node.value = np.matmul(node_A.value, const_matrix)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return np.matmul(input_vals[0], node.const_attr)
+
     def gradient(self, node, output_grad):
         # Given gradient of matmul by const node, return gradient contributions to the input node.
-        const_matrix = node.const_attr
-        grad_A = np.matmul(output_grad, const_matrix.T)
-        return [grad_A]
+        if isinstance(output_grad, Node):
+            return [matmul_byconst_op(output_grad, node.const_attr.T)]
+        return [np.matmul(output_grad, node.const_attr.T)]
+
+    def taylor(self, node, input_series):
+        return [np.matmul(a_k, node.const_attr) for a_k in input_series[0]]
 
 
 # Op to element-wise divide two nodes.
@@ -565,13 +772,19 @@ class DivOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s/%s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value / node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] / input_vals[1]
+
     def gradient(self, node, output_grad):
         """Given gradient of divide node, return gradient contributions to each input."""
         return [output_grad / node.inputs[1], -output_grad * node.inputs[0] / (node.inputs[1] ** 2)]
 
+    def taylor(self, node, input_series):
+        return series.div(*input_series, node.value)
+
 
 # Op to element-wise divide a nodes by a constant.
 class DivByConstOp(Op):
@@ -581,13 +794,19 @@ class DivByConstOp(Op):
         new_node.const_attr = const_val
         new_node.inputs = [node_A]
         new_node.name = "(%s/%s)" % (node_A.name, str(const_val))
-        new_node.value = node_A.value / const_val
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] / node.const_attr
+
     def gradient(self, node, output_grad):
         """Given gradient of divide by const node, return gradient contributions to the input node."""
         return [output_grad / node.const_attr]
-        
+
+    def taylor(self, node, input_series):
+        return [a_k / node.const_attr for a_k in input_series[0]]
+
 
 # Op to perform element-wise power (exponentiation) of two nodes.
 class PowOp(Op):
@@ -596,16 +815,26 @@ class PowOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s^%s)" % (node_A.name, node_B.name)
-        new_node.value = np.power(node_A.value, node_B.value)
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return np.power(input_vals[0], input_vals[1])
+
     def gradient(self, node, output_grad):
         """Given gradient of pow node, return gradient contributions to each input."""
-        A, B = node.inputs[0].value, node.inputs[1].value
-        grad_A = output_grad * B * np.power(A, B - 1)
-        grad_B = output_grad * np.power(A, B) * np.log(A)
+        A, B = node.inputs
+        grad_A = output_grad * B * A ** (B - 1.0)
+        grad_B = output_grad * node * log_op(A)
         return [grad_A, grad_B]
-    
+
+    def taylor(self, node, input_series):
+        # A^B = exp(B log(A))
+        A, B = input_series
+        log_A = series.log(A, _call_ufunc(np.log, "__log__", A[0]))
+        exponent = series.mul(B, log_A)
+        return series.exp(exponent, node.value)
+
 
 # Op to perform element-wise power (exponentiation) of a node and a constant.
 class PowByConstOp(Op):
@@ -615,16 +844,23 @@ class PowByConstOp(Op):
         new_node.const_attr = const_val
         new_node.inputs = [node_A]
         new_node.name = "(%s^%s)" % (node_A.name, str(const_val))
-        new_node.value = node_A.value ** const_val
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] ** node.const_attr
+
     def gradient(self, node, output_grad):
         """Given gradient of pow by const node, return gradient contributions to the input node."""
-        A = node.inputs[0].value
+        A = node.inputs[0]
         const_val = node.const_attr
         grad_A = output_grad * const_val * A ** (const_val - 1)
         return [grad_A]
 
+    def taylor(self, node, input_series):
+        return series.pow_const(input_series[0], node.const_attr, node.value)
+
+
 # Op to perform element-wise norm of a node.
 class NormOp(Op):
     def __init__(self, axis=None):
@@ -634,15 +870,22 @@ class NormOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = f"norm({node_A.name})"
-        new_node.value = np.linalg.norm(node_A.value, axis=self.axis)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
     
+    def compute(self, node, input_vals):
+        return np.linalg.norm(precision.accumulate(input_vals[0], node.dtypes), axis=self.axis)
+
     def gradient(self, node, output_grad):
         """Given gradient of norm node, return gradient contributions to each input."""
-        A = node.inputs[0].value
-        norm = np.linalg.norm(A, axis=self.axis, keepdims=True)
-        return output_grad * A / norm
-    
+        return [output_grad * node.inputs[0] / node]
+
+    def taylor(self, node, input_series):
+        if self.axis is not None:
+            raise NotImplementedError("Taylor expansion of a norm along an axis is not supported.")
+        squared = series.mul(input_series[0], input_series[0], op=lambda A, B: np.sum(A * B))
+        return series.pow_const(squared, 0.5, node.value)
+
 
 class DotOp(Op):
 
@@ -650,50 +893,39 @@ class DotOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = f"dot({node_A.name}, {node_B.name})"
-        new_node.value = np.dot(node_A.value, node_B.value)
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return np.dot(precision.accumulate(input_vals[0], node.dtypes), precision.accumulate(input_vals[1], node.dtypes))
+
     def gradient(self, node, output_grad):
         """Given gradient of dot node, return gradient contributions to each input."""
-        A, B = node.inputs[0].value, node.inputs[1].value
-
-        if np.isscalar(A) or np.isscalar(B):
-            return (
-                np.sum(A * output_grad),
-                np.sum(B * output_grad),
-            )
-
-        # If both A and B are 1-D arrays (scalars handled above)
-        if A.ndim == 1 and B.ndim == 1:
-            return (
-                np.sum(output_grad * node.inputs[1].value),
-                np.sum(output_grad * node.inputs[0].value),
-            )
-
-        # If A is 2-D and B is 1-D, perform matrix-vector gradient calculation
-        if A.ndim == 2 and B.ndim == 1:
-            return (
-                np.dot(output_grad, node.inputs[1].value.T),
-                np.dot(node.inputs[0].value.T, output_grad),
-            )
-
-        # If A is 1-D and B is 2-D, perform vector-matrix gradient calculation
-        if A.ndim == 1 and B.ndim == 2:
-            return (
-                np.dot(node.inputs[1].value.T, output_grad),
-                np.dot(output_grad, node.inputs[0].value.T),
-            )
+        A, B = node.inputs
+        ndim_A = np.ndim(getattr(A.value, "value", A.value))
+        ndim_B = np.ndim(getattr(B.value, "value", B.value))
+
+        # If both A and B are scalars or 1-D arrays
+        if ndim_A == ndim_B and ndim_A <= 1:
+            return [output_grad * B, output_grad * A]
+
+        # If one of A and B is a scalar, the other one a 1-D array
+        if ndim_A == 0 and ndim_B == 1:
+            return [dot_op(as_node(output_grad), B), output_grad * A]
+        if ndim_A == 1 and ndim_B == 0:
+            return [output_grad * B, dot_op(as_node(output_grad), A)]
 
         # If both A and B are 2-D, perform matrix-matrix gradient calculation
-        if A.ndim == 2 and B.ndim == 2:
-            return (
-                np.dot(output_grad, node.inputs[1].value.T),
-                np.dot(node.inputs[0].value.T, output_grad),
-            )
+        if ndim_A == 2 and ndim_B == 2:
+            dY = as_node(output_grad)
+            return [matmul_op(dY, B, trans_B=True), matmul_op(A, dY, trans_A=True)]
 
         # For other cases, raise an error
         raise ValueError("Incompatible shapes for dot product.")
 
+    def taylor(self, node, input_series):
+        return series.mul(*input_series, op=np.dot)
+
 
 # Op to element-wise logical AND two nodes.
 class AndOp(Op):
@@ -701,13 +933,20 @@ class AndOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s and %s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value and node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] and input_vals[1]
+
     def gradient(self, node, output_grad):
         # Logical AND is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op to element-wise logical OR two nodes.
 class OrOp(Op):
@@ -715,13 +954,20 @@ class OrOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s or %s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value or node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] or input_vals[1]
+
     def gradient(self, node, output_grad):
         # Logical OR is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op to element-wise logical NOT a node.
 class NotOp(Op):
@@ -729,38 +975,62 @@ class NotOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "not %s" % node_A.name
-        new_node.value = not node_A.value
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return not input_vals[0]
+
     def gradient(self, node, output_grad):
         # Logical NOT is not differentiable, so return None for the input.
         return None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op to element-wise logical greater-than-or-equal-to comparison of two nodes.
 class EqOp(Op):
     def __call__(self, node_A, node_B):
-        new_node = Node(f"({node_A.name}=={node_B.name})", np.array_equal(node_A.value, node_B.value))
+        new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
+        new_node.name = "(%s==%s)" % (node_A.name, node_B.name)
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return np.array_equal(input_vals[0], input_vals[1])
+
     def gradient(self, node, output_grad):
         # Logical >= is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
+
 # Op to element-wise logical greater-than comparison of two nodes.
 class GtOp(Op):
     def __call__(self, node_A, node_B):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s > %s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value > node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] > input_vals[1]
+
     def gradient(self, node, output_grad):
         # Logical > is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op to element-wise logical less-than comparison of two nodes.
 class LtOp(Op):
@@ -768,13 +1038,20 @@ class LtOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s < %s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value < node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] < input_vals[1]
+
     def gradient(self, node, output_grad):
         # Logical < is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op to element-wise logical greater-than-or-equal-to comparison of two nodes.
 class GeOp(Op):
@@ -782,13 +1059,20 @@ class GeOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s >= %s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value >= node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] >= input_vals[1]
+
     def gradient(self, node, output_grad):
         # Logical >= is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op to element-wise logical less-than-or-equal-to comparison of two nodes.
 class LeOp(Op):
@@ -796,13 +1080,71 @@ class LeOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A, node_B]
         new_node.name = "(%s <= %s)" % (node_A.name, node_B.name)
-        new_node.value = node_A.value <= node_B.value
+        new_node.value = self.compute(new_node, [node_A.value, node_B.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return input_vals[0] <= input_vals[1]
+
     def gradient(self, node, output_grad):
         # Logical <= is not differentiable, so return None for both inputs.
         return None, None
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
+
+def _magnitude(value, unit):
+    # Magnitude of a value expressed in the given unit, plain numbers are returned unchanged.
+    if not hasattr(value, "unit"):
+        return value
+    if not value.unit.base == unit.base:
+        raise TypeError(f"Unsupported operands for where: 'Quantity' of base '{value.unit.base}' and '{unit.base}'")
+    if value.unit.prefix == unit.prefix:
+        return value.value
+    return value.value * value.unit.prefix.factor / unit.prefix.factor
+
+
+def _where(mask, a, b):
+    # Element-wise selection between two values, quantities are expressed in the unit of the first one.
+    if hasattr(a, "unit") or hasattr(b, "unit"):
+        quantity = a if hasattr(a, "unit") else b
+        return type(quantity)(np.where(mask, _magnitude(a, quantity.unit), _magnitude(b, quantity.unit)), quantity.unit)
+    return np.where(mask, a, b)
+
+
+# Op to element-wise select between two nodes according to a boolean mask.
+class WhereOp(Op):
+
+    def __call__(self, node_C, node_A, node_B, unbuilt=None):
+        new_node = Op.__call__(self)
+        new_node.inputs = [node_C, node_A, node_B]
+        new_node.name = "where(%s, %s, %s)" % (node_C.name, node_A.name, node_B.name)
+        # Which lazy branches were not built, and only hold a placeholder
+        new_node.const_attr = unbuilt
+        new_node.value = self.compute(new_node, [node_C.value, node_A.value, node_B.value])
+        return new_node
+
+    def compute(self, node, input_vals):
+        unbuilt = getattr(node, "const_attr", None)
+        if unbuilt:
+            mask = input_vals[0]
+            if (unbuilt[0] and np.any(mask)) or (unbuilt[1] and not np.all(mask)):
+                raise ValueError(f"{node.name} selects a lazy branch that was not built for the recorded mask; rebuild the graph.")
+        return _where(*input_vals)
+
+    def gradient(self, node, output_grad):
+        """The gradient is routed to the selected branch, the mask is not differentiable."""
+        mask = node.inputs[0]
+        g = as_node(output_grad)
+        zero = as_node(0.0)
+        return [None, where_op(mask, g, zero), where_op(mask, zero, g)]
+
+    def taylor(self, node, input_series):
+        mask = node.inputs[0].value
+        return [_where(mask, a_k, b_k) for a_k, b_k in zip(input_series[1], input_series[2])]
+
 
 # Op for element-wise negative function.
 class NegOp(Op):
@@ -812,13 +1154,19 @@ class NegOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "-(%s)" % node_A.name
-        new_node.value = -node_A.value
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return -input_vals[0]
+
     def gradient(self, node, output_grad):
         """Given gradient of negative node, return gradient contributions to the input node."""
         return [-output_grad]
-    
+
+    def taylor(self, node, input_series):
+        return series.neg(input_series[0])
+
 
 # Op for element-wise absolute function.
 class AbsOp(Op):
@@ -828,13 +1176,22 @@ class AbsOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "abs(%s)" % node_A.name
-        new_node.value = math.abs(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
     
+    def compute(self, node, input_vals):
+        return abs(input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of absolute node, return gradient contributions to the input node."""
-        return [output_grad * math.sign(node.inputs[0].value)]
-    
+        # d|A| = sign(A) dA = A / |A| dA
+        return [output_grad * node.inputs[0] / node]
+
+    def taylor(self, node, input_series):
+        # |A| = sign(A_0) A, with zero coefficients at the origin.
+        A = input_series[0]
+        return series.scale(A, np.sign(A[0]))
+
 
 # Op for element-wise exponential function.
 class ExpOp(Op):
@@ -844,12 +1201,18 @@ class ExpOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "exp(%s)" % node_A.name
-        new_node.value = math.exp(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.exp, "__exp__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of exponential node, return gradient contributions to the input node."""
-        return [output_grad * math.exp(node.inputs[0].value)]
+        return [output_grad * node]
+
+    def taylor(self, node, input_series):
+        return series.exp(input_series[0], node.value)
 
 
 # Op for element-wise natural logarithm function.
@@ -860,12 +1223,18 @@ class LogOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "log(%s)" % node_A.name
-        new_node.value = math.log(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.log, "__log__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of log node, return gradient contributions to the input node."""
-        return [output_grad / node.inputs[0].value]
+        return [output_grad / node.inputs[0]]
+
+    def taylor(self, node, input_series):
+        return series.log(input_series[0], node.value)
 
 
 # Op for element-wise sine function.
@@ -874,16 +1243,24 @@ class SinOp(Op):
     def __call__(self, node_A):
         """Creates a node that represents the sine of node_A."""
         if isinstance(node_A, Node):
-            new_node = Node(f"sin({node_A.name})", math.sin(node_A.value))
+            new_node = Op.__call__(self)
             new_node.inputs = [node_A]
-            new_node.op = SinOp()
+            new_node.name = "sin(%s)" % node_A.name
+            new_node.value = self.compute(new_node, [node_A.value])
             return new_node
         else:
             return math.sin(node_A)
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.sin, "__sin__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of sine node, return gradient contributions to the input node."""
-        return [output_grad * math.cos(node.inputs[0].value)]
+        return [output_grad * cos_op(node.inputs[0])]
+
+    def taylor(self, node, input_series):
+        A = input_series[0]
+        return series.sin_cos(A, node.value, _call_ufunc(np.cos, "__cos__", A[0]))[0]
 
 
 # Op for element-wise cosine function.
@@ -894,12 +1271,19 @@ class CosOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "cos(%s)" % node_A.name
-        new_node.value = math.cos(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.cos, "__cos__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of cosine node, return gradient contributions to the input node."""
-        return [-output_grad * math.sin(node.inputs[0].value)]
+        return [output_grad * -sin_op(node.inputs[0])]
+
+    def taylor(self, node, input_series):
+        A = input_series[0]
+        return series.sin_cos(A, _call_ufunc(np.sin, "__sin__", A[0]), node.value)[1]
 
 
 # Op for element-wise tangent function.
@@ -910,12 +1294,18 @@ class TanOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "tan(%s)" % node_A.name
-        new_node.value = math.tan(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.tan, "__tan__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of tangent node, return gradient contributions to the input node."""
-        return [output_grad / math.cos(node.inputs[0].value) ** 2]
+        return [output_grad * (node * node + 1.0)]
+
+    def taylor(self, node, input_series):
+        return series.tan(input_series[0], node.value)
 
 
 # Op for element-wise hyperbolic sine function.
@@ -926,12 +1316,19 @@ class SinhOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "sinh(%s)" % node_A.name
-        new_node.value = math.sinh(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.sinh, "__sinh__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of hyperbolic sine node, return gradient contributions to the input node."""
-        return [output_grad * math.cosh(node.inputs[0].value)]
+        return [output_grad * cosh_op(node.inputs[0])]
+
+    def taylor(self, node, input_series):
+        A = input_series[0]
+        return series.sin_cos(A, node.value, _call_ufunc(np.cosh, "__cosh__", A[0]), sign=1)[0]
 
 
 # Op for element-wise hyperbolic cosine function.
@@ -942,12 +1339,19 @@ class CoshOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "cosh(%s)" % node_A.name
-        new_node.value = math.cosh(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.cosh, "__cosh__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of hyperbolic cosine node, return gradient contributions to the input node."""
-        return [output_grad * math.sinh(node.inputs[0].value)]
+        return [output_grad * sinh_op(node.inputs[0])]
+
+    def taylor(self, node, input_series):
+        A = input_series[0]
+        return series.sin_cos(A, _call_ufunc(np.sinh, "__sinh__", A[0]), node.value, sign=1)[1]
 
 
 # Op for element-wise hyperbolic tangent function.
@@ -958,12 +1362,18 @@ class TanhOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "tanh(%s)" % node_A.name
-        new_node.value = math.tanh(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.tanh, "__tanh__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of hyperbolic tangent node, return gradient contributions to the input node."""
-        return [output_grad * (1 - math.tanh(node.inputs[0].value) ** 2)]
+        return [output_grad * (-(node * node) + 1.0)]
+
+    def taylor(self, node, input_series):
+        return series.tan(input_series[0], node.value, sign=-1)
 
 
 # Op for element-wise arcsine function.
@@ -974,12 +1384,21 @@ class AsinOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "asin(%s)" % node_A.name
-        new_node.value = np.arcsin(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.arcsin, "__asin__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of arcsine node, return gradient contributions to the input node."""
-        return [output_grad / np.sqrt(1 - node.inputs[0].value ** 2)]
+        return [output_grad * (-(node.inputs[0] * node.inputs[0]) + 1.0) ** -0.5]
+
+    def taylor(self, node, input_series):
+        # d asin(A) = (1 - A^2)^(-1/2) dA
+        A = input_series[0]
+        D = series.one_minus_square(A)
+        return series.integrate(A, series.pow_const(D, -0.5, D[0] ** -0.5), node.value)
 
 
 # Op for element-wise arccosine function.
@@ -990,12 +1409,21 @@ class AcosOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "acos(%s)" % node_A.name
-        new_node.value = np.arccos(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.arccos, "__acos__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of arccosine node, return gradient contributions to the input node."""
-        return [-output_grad / np.sqrt(1 - node.inputs[0].value ** 2)]
+        return [-output_grad * (-(node.inputs[0] * node.inputs[0]) + 1.0) ** -0.5]
+
+    def taylor(self, node, input_series):
+        # d acos(A) = -(1 - A^2)^(-1/2) dA
+        A = input_series[0]
+        D = series.one_minus_square(A)
+        return series.integrate(A, series.neg(series.pow_const(D, -0.5, D[0] ** -0.5)), node.value)
 
 
 # Op for element-wise arctangent function.
@@ -1006,12 +1434,21 @@ class AtanOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "atan(%s)" % node_A.name
-        new_node.value = np.arctan(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.arctan, "__atan__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of arctangent node, return gradient contributions to the input node."""
-        return [output_grad / (1 + node.inputs[0].value ** 2)]
+        return [output_grad * (node.inputs[0] * node.inputs[0] + 1.0) ** -1]
+
+    def taylor(self, node, input_series):
+        # d atan(A) = (1 + A^2)^(-1) dA
+        A = input_series[0]
+        D = series.one_minus_square(A, sign=1)
+        return series.integrate(A, series.pow_const(D, -1, D[0] ** -1), node.value)
 
 
 # Op for element-wise inverse hyperbolic sine function.
@@ -1022,12 +1459,21 @@ class AsinhOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "asinh(%s)" % node_A.name
-        new_node.value = np.arcsinh(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.arcsinh, "__asinh__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of inverse hyperbolic sine node, return gradient contributions to the input node."""
-        return [output_grad / np.sqrt(node.inputs[0].value ** 2 + 1)]
+        return [output_grad * (node.inputs[0] * node.inputs[0] + 1.0) ** -0.5]
+
+    def taylor(self, node, input_series):
+        # d asinh(A) = (A^2 + 1)^(-1/2) dA
+        A = input_series[0]
+        D = series.one_minus_square(A, sign=1)
+        return series.integrate(A, series.pow_const(D, -0.5, D[0] ** -0.5), node.value)
 
 
 # Op for element-wise inverse hyperbolic cosine function.
@@ -1038,12 +1484,21 @@ class AcoshOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "acosh(%s)" % node_A.name
-        new_node.value = np.arccosh(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.arccosh, "__acosh__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of inverse hyperbolic cosine node, return gradient contributions to the input node."""
-        return [output_grad / np.sqrt(node.inputs[0].value ** 2 - 1)]
+        return [output_grad * (node.inputs[0] * node.inputs[0] - 1.0) ** -0.5]
+
+    def taylor(self, node, input_series):
+        # d acosh(A) = (A^2 - 1)^(-1/2) dA
+        A = input_series[0]
+        D = series.shift(series.mul(A, A), -1)
+        return series.integrate(A, series.pow_const(D, -0.5, D[0] ** -0.5), node.value)
 
 
 # Op for element-wise inverse hyperbolic tangent function.
@@ -1054,12 +1509,21 @@ class AtanhOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "atanh(%s)" % node_A.name
-        new_node.value = np.arctanh(node_A.value)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return _call_ufunc(np.arctanh, "__atanh__", input_vals[0])
+
     def gradient(self, node, output_grad):
         """Given gradient of inverse hyperbolic tangent node, return gradient contributions to the input node."""
-        return [output_grad / (1 - node.inputs[0].value ** 2)]
+        return [output_grad * (-(node.inputs[0] * node.inputs[0]) + 1.0) ** -1]
+
+    def taylor(self, node, input_series):
+        # d atanh(A) = (1 - A^2)^(-1) dA
+        A = input_series[0]
+        D = series.one_minus_square(A)
+        return series.integrate(A, series.pow_const(D, -1, D[0] ** -1), node.value)
 
 
 # Op that represents a constant np.zeros_like.
@@ -1070,12 +1534,19 @@ class ZerosLikeOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "Zeroslike(%s)" % node_A.name
-        new_node.value = np.zeros(node_A.value.shape)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
+    def compute(self, node, input_vals):
+        return np.zeros(np.shape(getattr(input_vals[0], "value", input_vals[0])))
+
     def gradient(self, node, output_grad):
         return [zeroslike_op(node.inputs[0])]
 
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Op that represents a constant np.ones_like.
 class OnesLikeOp(Op):
@@ -1085,22 +1556,32 @@ class OnesLikeOp(Op):
         new_node = Op.__call__(self)
         new_node.inputs = [node_A]
         new_node.name = "Oneslike(%s)" % node_A.name
-        new_node.value = np.ones(node_A.value.shape)
+        new_node.value = self.compute(new_node, [node_A.value])
         return new_node
 
 
+    def compute(self, node, input_vals):
+        return np.ones(np.shape(getattr(input_vals[0], "value", input_vals[0])))
+
     def gradient(self, node, output_grad):
         return [zeroslike_op(node.inputs[0])]
-    
+
+    def taylor(self, node, input_series):
+        # Piecewise constant, all higher order coefficients vanish.
+        return series.constant(node.value, len(input_series[0]) - 1)
+
 
 # Create global singletons of operators.
 add_op = AddOp()
+sub_op = SubOp()
+sum_op = SumOp()
 mul_op = MulOp()
 matmul_op = MatMulOp()
 div_op = DivOp()
 pow_op = PowOp()
 
 add_byconst_op = AddByConstOp()
+sub_byconst_op = SubByConstOp()
 mul_byconst_op = MulByConstOp()
 matmul_byconst_op = MatMulByConstOp()
 div_byconst_op = DivByConstOp()
@@ -1114,6 +1595,7 @@ gt_op = GtOp()
 lt_op = LtOp()
 ge_op = GeOp()
 le_op = LeOp()
+where_op = WhereOp()
 
 neg_op = NegOp()
 abs_op = AbsOp()
@@ -1140,5 +1622,7 @@ acosh_op = AcoshOp()
 atanh_op = AtanhOp()
 
 placeholder_op = PlaceholderOp()
+constant_op = ConstantOp()
+stop_gradient_op = StopGradientOp()
 oneslike_op = OnesLikeOp()
 zeroslike_op = ZerosLikeOp()
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Unit-aware nonlinear least-squares fitting (Levenberg-Marquardt).
+
+The residuals r = (model(x, *params) - y) / sigma are built as a graph in
+which every parameter is broadcast to one copy per data point: the gradient of
+the residuals with a unit seed then yields the whole Jacobian column
+d r_i / d p_k of every parameter in a single backward pass. The graph is
+recorded once per chunk length on a unit-free tape, and the normal equations
+J^T J and J^T r are accumulated chunk by chunk, so the data never has to be in
+memory all at once.
+"""
+
+import numpy as np
+
+from .autodiff import Variable
+from .gradients import gradients
+from .tape import Tape
+
+
+class FitResult(object):
+    # Outcome of a least-squares fit.
+
+    def __init__(self, params, errors, covariance, covariance_units, chi2, n_data, n_iter, converged, message=""):
+        """
+        Parameters
+        ----------
+        params: List[Value]
+            The fitted parameters, as Quantities for Quantity initial values.
+        errors: List[Value]
+            The standard errors of the parameters, in the units of the parameters.
+        covariance: ndarray
+            The covariance matrix of the parameters, in covariance_units.
+        covariance_units: List[List[Unit]]
+            The unit of every covariance entry, p_i.unit * p_j.unit (None for plain parameters).
+        chi2: float
+            The sum of the squared residuals.
+        n_data: int
+            The number of residuals.
+        n_iter: int
+            The number of iterations.
+        converged: bool
+            Whether a tolerance was reached.
+        message: str
+            Why the iterations stopped.
+        """
+        self.params = params
+        self.errors = errors
+        self.covariance = covariance
+        self.covariance_units = covariance_units
+        self.chi2 = chi2
+        self.n_data = n_data
+        self.n_iter = n_iter
+        self.converged = converged
+        self.message = message
+
+    def __repr__(self):
+        return f"FitResult(params={self.params}, errors={self.errors}, chi2={self.chi2}, converged={self.converged})"
+
+
+def _unit(value):
+    return getattr(value, "unit", None)
+
+
+def _magnitude(value):
+    return getattr(value, "value", value)
+
+
+def _with_unit(magnitude, like):
+    # Wrap a magnitude in the unit of a reference value, if it has one.
+    unit = _unit(like)
+    return magnitude if unit is None else type(like)(magnitude, unit)
+
+
+def _chunks(data, chunk_size):
+    # Iterate over (x, y[, sigma]) chunks of in-memory arrays, or of a chunk factory.
+    if callable(data):
+        yield from data()
+        return
+    n = len(np.atleast_1d(_magnitude(data[1])))
+    chunk_size = chunk_size or n
+    for start in range(0, n, chunk_size):
+        yield tuple(array if np.ndim(_magnitude(array)) == 0 else array[start:start + chunk_size] for array in data)
+
+
+class _ResidualTape(object):
+    # Residuals and Jacobian columns of one chunk length, recorded on a unit-free tape.
+
+    def __init__(self, model, chunk, p0):
+        length = len(np.atleast_1d(_magnitude(chunk[1])))
+        self.length = length
+        self.x = Variable("x", chunk[0])
+        self.y = Variable("y", chunk[1])
+        self.params = [Variable(f"p{k}", _with_unit(np.full(length, float(_magnitude(p))), p)) for k, p in enumerate(p0)]
+
+        residuals = model(self.x, *self.params) - self.y
+        self.sigma = None
+        if len(chunk) > 2:
+            self.sigma = Variable("sigma", chunk[2])
+            residuals = residuals / self.sigma
+
+        grads = gradients(residuals, self.params)
+        self.tape = Tape([residuals] + [grads[param] for param in self.params], strip_units=True)
+
+        # Convert the Jacobian columns to (residual unit) / (parameter unit)
+        units = self.tape.output_units
+        self.scales = np.ones(len(p0))
+        for k, p in enumerate(p0):
+            if units[0] is not None and units[k + 1] is not None and _unit(p) is not None:
+                self.scales[k] = units[k + 1].prefix.factor * _unit(p).prefix.factor / units[0].prefix.factor
+
+
+    def __call__(self, chunk, p):
+        feed_dict = {self.x: chunk[0], self.y: chunk[1]}
+        if self.sigma is not None:
+            feed_dict[self.sigma] = chunk[2]
+        for param, value in zip(self.params, p):
+            feed_dict[param] = np.full(self.length, value)
+
+        values = self.tape.replay(feed_dict)
+        r = np.broadcast_to(values[0], (self.length,))
+        J = np.stack([np.broadcast_to(value, (self.length,)) for value in values[1:]], axis=-1) * self.scales
+        return r, J
+
+
+def _normal_equations(tapes, model, data, chunk_size, p0, p):
+    """Accumulate J^T J, J^T r and r^T r over the data chunks."""
+    JtJ = np.zeros((len(p), len(p)))
+    Jtr = np.zeros(len(p))
+    chi2, n_data = 0.0, 0
+    for chunk in _chunks(data, chunk_size):
+        length = len(np.atleast_1d(_magnitude(chunk[1])))
+        if length not in tapes:
+            tapes[length] = _ResidualTape(model, chunk, p0)
+        r, J = tapes[length](chunk, p)
+        JtJ += J.T @ J
+        Jtr += J.T @ r
+        chi2 += float(r @ r)
+        n_data += length
+    return JtJ, Jtr, chi2, n_data
+
+
+def curve_fit(model, data, p0, chunk_size=None, absolute_sigma=False, tol=1e-10, max_iter=100):
+    """
+    Fit the parameters of a model to data by Levenberg-Marquardt.
+
+    Parameters
+    ----------
+    model: Callable[[Node, *Node], Node]
+        Builds the predictions from the x node and the parameter nodes.
+        It must be element-wise in the parameters (each data point uses its own copy).
+    data: Tuple or Callable
+        Either a tuple of arrays (x, y) or (x, y, sigma), possibly Quantities,
+        or a function returning an iterable of such tuples, e.g. reading the
+        chunks of a dataset larger than memory.
+    p0: List[Value]
+        The initial parameters, floats or scalar Quantities.
+    chunk_size: int, optional
+        The number of data points per chunk for in-memory data. (Default is all)
+    absolute_sigma: bool, optional
+        Whether sigma holds absolute uncertainties; otherwise the covariance is
+        scaled by the reduced chi-square. (Default is False)
+    tol: float
+        The relative tolerance on the chi-square decrease and on the steps.
+    max_iter: int
+        The maximum number of iterations.
+
+    Returns
+    -------
+    result: FitResult
+    """
+    p0 = list(p0)
+    p = np.array([float(_magnitude(value)) for value in p0])
+    tapes = {}
+
+    JtJ, Jtr, chi2, n_data = _normal_equations(tapes, model, data, chunk_size, p0, p)
+    damping = 1e-3
+    converged = False
+    message = "The maximum number of iterations was reached."
+    n_iter = 0
+
+    while n_iter < max_iter:
+        n_iter += 1
+        scaled = JtJ + damping * np.diag(np.diag(JtJ) + 1e-12)
+        step = np.linalg.solve(scaled, -Jtr)
+        JtJ_new, Jtr_new, chi2_new, _ = _normal_equations(tapes, model, data, chunk_size, p0, p + step)
+
+        if chi2_new <= chi2:
+            decrease, small_step = chi2 - chi2_new <= tol * chi2, np.all(np.abs(step) <= tol * (np.abs(p) + tol))
+            p = p + step
+            JtJ, Jtr, chi2 = JtJ_new, Jtr_new, chi2_new
+            damping = max(damping / 10.0, 1e-12)
+            if decrease or small_step:
+                converged = True
+                message = "The chi-square decrease is within tol." if decrease else "The step is within tol."
+                break
+        else:
+            damping *= 10.0
+            if damping > 1e12:
+                # Every step was rejected: the fit stalled without reaching a tolerance
+                message = "The fit stalled: no step decreases the chi-square."
+                break
+
+    covariance = np.linalg.pinv(JtJ)
+    if not absolute_sigma and n_data > len(p):
+        covariance *= chi2 / (n_data - len(p))
+
+    errors = [_with_unit(np.sqrt(covariance[k, k]), p0[k]) for k in range(len(p))]
+    covariance_units = [[_unit(a) * _unit(b) if _unit(a) is not None and _unit(b) is not None else _unit(a) or _unit(b)
+                         for b in p0] for a in p0]
+    params = [_with_unit(p[k], p0[k]) for k in range(len(p))]
+    return FitResult(params, errors, covariance, covariance_units, chi2, n_data, n_iter, converged, message)
@@ -1,171 +1,104 @@
-import math
+import operator
 import numpy as np
 from .autodiff import *
 
 
-def add(x, y):
-    if isinstance(x, Node) and isinstance(y, Node):
-        return AddOp()(x, y)
-    elif isinstance(x, Node):
-        return AddByConstOp(y)(x)
-    elif isinstance(y, Node):
-        return AddByConstOp(x)(y)
-    else:
-        return x + y
-    
-
-def sub(x, y):
-    if isinstance(x, Node) and isinstance(y, Node):
-        return SubOp()(x, y)
-    elif isinstance(x, Node):
-        return SubByConstOp(y)(x)
-    elif isinstance(y, Node):
-        return SubByConstOp(x)(y)
-    else:
-        return x - y
-    
-
-def mul(x, y):
-    if isinstance(x, Node) and isinstance(y, Node):
-        return MulOp()(x, y)
-    elif isinstance(x, Node):
-        return MulByConstOp(y)(x)
-    elif isinstance(y, Node):
-        return MulByConstOp(x)(y)
-    else:
-        return x * y
-    
-
-def div(x, y):
-    if isinstance(x, Node) and isinstance(y, Node):
-        return DivOp()(x, y)
-    elif isinstance(x, Node):
-        return DivByConstOp(y)(x)
-    elif isinstance(y, Node):
-        return DivByConstOp(x)(y)
-    else:
-        return x / y
-    
-
-
-def pow(x, y):
-    if isinstance(x, Node) and isinstance(y, Node):
-        return PowOp()(x, y)
-    elif isinstance(x, Node):
-        return PowByConstOp(y)(x)
-    elif isinstance(y, Node):
-        return PowByConstOp(x)(y)
-    else:
-        return x ** y
-    
-
-def neg(x):
-    if isinstance(x, Node):
-        return NegOp()(x)
-    else:
-        return -x
-    
-
-def abs(x):
-    if isinstance(x, Node):
-        return AbsOp()(x)
-    else:
-        return math.abs(x)
-
-
-def exp(x):
-    if isinstance(x, Node):
-        return ExpOp()(x)
-    else:
-        return math.exp(x)
-    
-
-def log(x):
-    if isinstance(x, Node):
-        return LogOp()(x)
-    else:
-        return math.log(x)
-    
-    
-def sin(x):
-    if isinstance(x, Node):
-        return SinOp()(x)
-    else:
-        return math.sin(x)
-    
-def cos(x):
-    if isinstance(x, Node):
-        return CosOp()(x)
-    else:
-        return math.cos(x)
-    
-
-def tan(x):
-    if isinstance(x, Node):
-        return TanOp()(x)
-    else:
-        return math.tan(x)
-    
-
-def sinh(x):
-    if isinstance(x, Node):
-        return SinhOp()(x)
-    else:
-        return math.sinh(x)
-    
-
-def cosh(x):
-    if isinstance(x, Node):
-        return CoshOp()(x)
-    else:
-        return math.cosh(x)
-    
-
-def tanh(x):
-    if isinstance(x, Node):
-        return TanhOp()(x)
-    else:
-        return math.tanh(x)
-    
-
-def asin(x):
-    if isinstance(x, Node):
-        return AsinOp()(x)
-    else:
-        return np.arcsin(x)
-    
-
-def acos(x):
-    if isinstance(x, Node):
-        return AcosOp()(x)
-    else:
-        return np.arccos(x)
-    
-
-def atan(x):
-    if isinstance(x, Node):
-        return AtanOp()(x)
-    else:
-        return np.arctan(x)
-    
-
-def asinh(x):
-    if isinstance(x, Node):
-        return AsinhOp()(x)
-    else:
-        return np.arcsinh(x)
-    
-
-def acosh(x):
-    if isinstance(x, Node):
-        return AcoshOp()(x)
-    else:
-        return np.arccosh(x)
-    
-
-def atanh(x):
-    if isinstance(x, Node):
-        return AtanhOp()(x)
-    else:
-        return np.arctanh(x)
-    
+def _unary(name, ufunc):
+    """
+    Build the element-wise function `name`, dispatched on the type of its argument.
+
+    Nodes and quantities implement the function as a method (e.g. Node.__exp__
+    adds an ExpOp node to the graph, Quantity.__exp__ checks the unit), every
+    other value (ndarray, NumPy or Python scalar) goes to the NumPy ufunc.
+    The implementation is resolved once per type and cached.
+    """
+    method = f"__{name}__"
+    implementations = {}
+
+    def function(x):
+        implementation = implementations.get(type(x))
+        if implementation is None:
+            implementation = implementations[type(x)] = getattr(type(x), method, ufunc)
+        return implementation(x)
+
+    function.__name__ = name
+    function.__doc__ = f"Element-wise {name} of a Node, Quantity, ndarray or scalar."
+    return function
+
+
+def _binary(name, operator_function, reflected):
+    """
+    Build the element-wise function `name` from its operator.
+
+    The operators of Node use the shared op singletons, those of Quantity check
+    the units and ndarrays broadcast. A Node on the right-hand side of another
+    value is dispatched to its reflected operator.
+    """
+    def function(x, y):
+        if isinstance(y, Node) and not isinstance(x, Node):
+            return getattr(y, reflected)(x)
+        return operator_function(x, y)
+
+    function.__name__ = name
+    function.__doc__ = f"Element-wise {name} of Nodes, Quantities, ndarrays or scalars."
+    return function
+
+
+add = _binary("add", operator.add, "__radd__")
+sub = _binary("sub", operator.sub, "__rsub__")
+mul = _binary("mul", operator.mul, "__rmul__")
+div = _binary("div", operator.truediv, "__rtruediv__")
+pow = _binary("pow", operator.pow, "__rpow__")
+
+neg = _unary("neg", np.negative)
+abs = _unary("abs", np.abs)
+norm = _unary("norm", np.linalg.norm)
+
+exp = _unary("exp", np.exp)
+log = _unary("log", np.log)
+
+sin = _unary("sin", np.sin)
+cos = _unary("cos", np.cos)
+tan = _unary("tan", np.tan)
+
+sinh = _unary("sinh", np.sinh)
+cosh = _unary("cosh", np.cosh)
+tanh = _unary("tanh", np.tanh)
+
+asin = _unary("asin", np.arcsin)
+acos = _unary("acos", np.arccos)
+atan = _unary("atan", np.arctan)
+
+asinh = _unary("asinh", np.arcsinh)
+acosh = _unary("acosh", np.arccosh)
+atanh = _unary("atanh", np.arctanh)
+
+
+def dot(x, y):
+    """Dot product of Nodes, ndarrays or scalars."""
+    if isinstance(x, Node) or isinstance(y, Node):
+        return dot_op(as_node(x), as_node(y))
+    return np.dot(x, y)
+
+
+def where(cond, x, y):
+    """
+    Element-wise selection of x where cond is true, and of y elsewhere.
+
+    The gradient flows to each branch only through the selected elements.
+    Branches can be given lazily as functions without arguments: a branch
+    which is selected nowhere is then never built nor computed. The choice is
+    made on the current value of cond, so a tape records only the branches
+    that were built, and a replay whose mask selects an unbuilt branch raises
+    a ValueError instead of returning its placeholder.
+    """
+    mask = cond.value if isinstance(cond, Node) else cond
+    unbuilt = (callable(x) and not np.any(mask), callable(y) and bool(np.all(mask)))
+    if callable(x):
+        x = x() if not unbuilt[0] else 0.0
+    if callable(y):
+        y = y() if not unbuilt[1] else 0.0
+
+    if isinstance(cond, Node) or isinstance(x, Node) or isinstance(y, Node):
+        return where_op(as_node(cond), as_node(x), as_node(y), unbuilt if any(unbuilt) else None)
+    return where_op.compute(None, [cond, x, y])
@@ -1,48 +1,188 @@
 from .topology import find_topo_sort
-from .autodiff import Node, NodeDict
+from .autodiff import Node, NodeDict, sum_op
+from .scheduler import dependency_waves
+from .precision import use_policy
 
-def gradients(loss_node, nodes):
+def gradients(loss_node, nodes, scheduler=None):
     """Compute gradients of nodes with respect to the loss node using backpropagation.
 
-    Parameters  
+    Parameters
     ----------
     loss_node: Node
         The output node (scalar) representing the loss.
     nodes: List[Node]
         List of input nodes with respect to which the gradients are computed.
+    scheduler: ThreadScheduler, optional
+        Differentiate independent nodes concurrently. (Default is sequential)
 
     Returns
     -------
     gradients: Dict[Node, Value]
         Dictionary mapping input nodes to their corresponding gradients.
     """
-    # Initialize gradients dictionary with the loss_node's gradient
+    return multi_gradients([loss_node], nodes, scheduler=scheduler)[0]
 
-    if not isinstance(loss_node, Node):
-        raise ValueError("loss_node must be a Node object.")
-    
-    gradients = NodeDict()
-    gradients[loss_node] = 1.0
 
-    # Find the topological sort of nodes ending in the loss node
-    topo_order = find_topo_sort([loss_node])
+def multi_gradients(loss_nodes, nodes, seeds=None, scheduler=None):
+    """Compute the gradients of nodes with respect to several output nodes in a single backward sweep.
+
+    The union graph of all the output nodes is sorted once and traversed once.
+    When the same adjoint reaches a shared subexpression from several outputs
+    (e.g. the kinetic term of both a Lagrangian and a Hamiltonian), the node is
+    differentiated once and its contributions are reused for every output.
+
+    With a scheduler, a node is ready as soon as all the nodes consuming it have
+    been differentiated, and the ready nodes are differentiated concurrently.
+    The contributions to each gradient are always summed in the sequential order,
+    so the results do not depend on the scheduling.
+
+    Parameters
+    ----------
+    loss_nodes: List[Node]
+        The output nodes to differentiate.
+    nodes: List[Node]
+        List of input nodes with respect to which the gradients are computed.
+    seeds: List[Value], optional
+        The initial gradient of each output node. (Default is 1.0 for every output)
+    scheduler: ThreadScheduler, optional
+        Differentiate independent nodes concurrently. (Default is sequential)
+
+    Returns
+    -------
+    gradients: List[Dict[Node, Value]]
+        For each output node, a dictionary mapping input nodes to their corresponding gradients.
+    """
+    for loss_node in loss_nodes:
+        if not isinstance(loss_node, Node):
+            raise ValueError("loss_node must be a Node object.")
+
+    # The gradient nodes are built with the precision policy of the differentiated graph
+    with use_policy(loss_nodes[0].dtypes if loss_nodes else None):
+        return _sweep(loss_nodes, nodes, seeds, scheduler)
+
+
+def _sweep(loss_nodes, nodes, seeds, scheduler):
+    """Run the backward sweep of multi_gradients."""
+    if seeds is None:
+        # A single seed object lets shared subgraphs recognise identical adjoints.
+        seeds = [1.0] * len(loss_nodes)
+    elif len(seeds) != len(loss_nodes):
+        raise ValueError("seeds must have the same length as loss_nodes.")
+
+    # Find the nodes of the union graph the gradients flow through, in reverse topological order
+    n_outputs = len(loss_nodes)
+    backward_order = _backward_order(loss_nodes, nodes)
+    position = {id(node): i for i, node in enumerate(backward_order)}
+
+    # Gradient contributions received by each node, as (consumer position, input index, output, gradient)
+    received = {id(node): [] for node in backward_order}
+    for i, (loss_node, seed) in enumerate(zip(loss_nodes, seeds)):
+        if id(loss_node) in received:
+            received[id(loss_node)].append((-1, 0, i, seed))
+
+    requested = {id(node) for node in nodes}
+    adjoints = NodeDict()
+
+    def collect(node):
+        # Sum the contributions received by the node, in the sequential order
+        node_adjoints = _accumulate(received.pop(id(node)), n_outputs)
+        if id(node) in requested:
+            adjoints[node] = node_adjoints
+        return node_adjoints
+
+    def propagate(node, input_gradients):
+        # Send the gradient contributions of the node to its inputs
+        for i, output_gradients in enumerate(input_gradients):
+            if output_gradients is None:
+                continue
+            for k, (input_node, input_grad) in enumerate(zip(node.inputs, output_gradients)):
+                if input_grad is not None and id(input_node) in received:
+                    received[id(input_node)].append((position[id(node)], k, i, input_grad))
 
     # Perform reverse-mode automatic differentiation (backpropagation)
+    if scheduler is None:
+        for node in backward_order:
+            propagate(node, _differentiate(node, collect(node)))
+    else:
+        consumers = {id(node): [] for node in backward_order}
+        for node in backward_order:
+            for input_node in node.inputs:
+                if id(input_node) in consumers:
+                    consumers[id(input_node)].append(node)
+
+        for wave in dependency_waves(backward_order, lambda node: consumers[id(node)]):
+            wave_adjoints = [collect(node) for node in wave]
+            wave_gradients = scheduler.map(lambda job: _differentiate(*job), list(zip(wave, wave_adjoints)))
+            for node, input_gradients in zip(wave, wave_gradients):
+                propagate(node, input_gradients)
+
+    # Collect gradients for the specified input
+    return [
+        {node: adjoints[node][i] if node in adjoints and adjoints[node][i] is not None else 0.0 for node in nodes}
+        for i in range(n_outputs)
+    ]
+
+
+def _backward_order(loss_nodes, nodes):
+    """Return the nodes between the outputs and the requested nodes, in reverse topological order.
+
+    Gradients do not flow through non-differentiable ops (constants, stop_gradient),
+    and nodes that lead to none of the requested nodes are pruned, so that whole
+    subgraphs are dropped from the backward sweep.
+    """
+    topo_order = find_topo_sort(loss_nodes)
+    # Constant leaves are skipped entirely, even when requested.
+    requested = {id(node) for node in nodes if node.inputs or node.op.differentiable}
+
+    # Nodes reached from the outputs through differentiable ops
+    reached = {id(node) for node in loss_nodes}
     for node in reversed(topo_order):
-        # Get the gradient of the current node with respect to its output
-        node_grad = gradients[node]
+        if id(node) in reached and node.op.differentiable:
+            reached.update(id(input_node) for input_node in node.inputs)
 
-        # Get the gradients of the node with respect to its inputs
-        input_gradients = node.op.gradient(node, node_grad)
+    # Nodes leading to a requested node through differentiable ops
+    leading = set()
+    for node in topo_order:
+        if id(node) in requested or (node.op.differentiable and any(id(input_node) in leading for input_node in node.inputs)):
+            leading.add(id(node))
 
-        # Update gradients for input nodes of the current node
-        for i, input_node in enumerate(node.inputs):
-            if input_node not in gradients:
-                gradients[input_node] = input_gradients[i]
-            else:
-                gradients[input_node] += input_gradients[i]
+    return [node for node in reversed(topo_order) if id(node) in reached and id(node) in leading]
 
-    # Collect gradients for the specified input
-    input_gradients = {node: gradients.get(node, 0.0) for node in nodes}
 
-    return input_gradients
\ No newline at end of file
+def _accumulate(contributions, n_outputs):
+    """Sum the gradient contributions of a node for every output, ordered by consumer and input index."""
+    terms = [[] for _ in range(n_outputs)]
+    for _, _, i, grad in sorted(contributions, key=lambda contribution: contribution[:2]):
+        terms[i].append(grad)
+
+    node_adjoints = []
+    for grads in terms:
+        if len(grads) <= 1:
+            node_adjoints.append(grads[0] if grads else None)
+        elif all(isinstance(grad, Node) for grad in grads):
+            # A single sum node accumulates in the dtype of the precision policy.
+            node_adjoints.append(sum_op(*grads))
+        else:
+            total = grads[0]
+            for grad in grads[1:]:
+                total = total + grad
+            node_adjoints.append(total)
+    return node_adjoints
+
+
+def _differentiate(node, node_adjoints):
+    """Return, for every output, the gradient contributions of the node to each of its inputs."""
+    if not node.inputs:
+        return [None] * len(node_adjoints)
+
+    # Gradient contributions of this node, keyed by the identity of the adjoint
+    contributions = {}
+    input_gradients = []
+    for node_grad in node_adjoints:
+        if node_grad is None:
+            input_gradients.append(None)
+            continue
+        if id(node_grad) not in contributions:
+            contributions[id(node_grad)] = node.op.gradient(node, node_grad)
+        input_gradients.append(contributions[id(node_grad)])
+    return input_gradients
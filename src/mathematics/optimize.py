@@ -0,0 +1,359 @@
+"""
+Minimization on top of the gradient engine.
+
+The solvers work on packed parameter vectors: an objective is a callable
+x -> (f, g) returning the value and the gradient at the packed point x, and
+Newton-CG also takes a Hessian-vector product (x, v) -> H v. Objective builds
+both from a graph: the forward and backward passes are recorded once on a
+tape and replayed at every evaluation, and H v is computed by differentiating
+the symbolic gradient graph a second time.
+"""
+
+import numpy as np
+
+from .autodiff import Node, Variable, dot_op, sum_op
+from .gradients import gradients
+from .packing import ParameterVector, _magnitude
+from .tape import Tape
+
+
+class OptimizeResult(object):
+    # Outcome of a minimization.
+
+    def __init__(self, x, fun, grad, n_iter, n_eval, converged, message):
+        """
+        Parameters
+        ----------
+        x: ndarray
+            The packed solution.
+        fun: float
+            The value of the objective at x.
+        grad: ndarray
+            The gradient of the objective at x.
+        n_iter: int
+            The number of iterations.
+        n_eval: int
+            The number of evaluations of the objective.
+        converged: bool
+            Whether the gradient norm reached the tolerance.
+        message: str
+            The reason of termination.
+        """
+        self.x = x
+        self.fun = fun
+        self.grad = grad
+        self.n_iter = n_iter
+        self.n_eval = n_eval
+        self.converged = converged
+        self.message = message
+
+    def __repr__(self):
+        return f"OptimizeResult(fun={self.fun}, n_iter={self.n_iter}, converged={self.converged}, message='{self.message}')"
+
+
+class Objective(object):
+    # Compiled value, gradient and Hessian-vector product of a scalar loss node.
+
+    def __init__(self, loss_node, variables, scheduler=None):
+        """
+        Parameters
+        ----------
+        loss_node: Node
+            The scalar node to minimize.
+        variables: List[Node]
+            The variables to optimize, packed into a ParameterVector in this order.
+        scheduler: ThreadScheduler, optional
+            Replay independent nodes concurrently. (Default is sequential)
+        """
+        self.params = ParameterVector(variables)
+        self.scheduler = scheduler
+        self.n_eval = 0
+
+        grads = gradients(loss_node, self.params.variables)
+        self.gradients = [grads[variable] for variable in self.params.variables]
+        self.tape = Tape([loss_node] + self.gradients)
+        self.hvp_tape = self._compile_hvp()
+
+
+    def _compile_hvp(self):
+        # Differentiate g . v a second time; only when every gradient has the shape of its
+        # variable and no units are involved, otherwise H v falls back to finite differences.
+        if any(unit is not None for unit in self.params.units):
+            return None
+        terms = []
+        self.directions = []
+        for variable, grad, shape in zip(self.params.variables, self.gradients, self.params.shapes):
+            if not isinstance(grad, Node):
+                continue
+            if len(shape) > 1 or np.shape(grad.value) != shape:
+                return None
+            direction = Variable(f"v_{variable.name}", np.zeros(shape))
+            self.directions.append((variable, direction))
+            terms.append(dot_op(grad, direction))
+        if not terms:
+            return None
+
+        second = gradients(terms[0] if len(terms) == 1 else sum_op(*terms), self.params.variables)
+        return Tape([second[variable] for variable in self.params.variables])
+
+
+    def __call__(self, x):
+        """Return the value and the packed gradient of the loss at the packed point x."""
+        self.params.set(x)
+        values = self.tape.replay(scheduler=self.scheduler)
+        self.n_eval += 1
+        return np.asarray(_magnitude(values[0])).item(), self.params.pack(values[1:])
+
+
+    def hessp(self, x, v):
+        """Return the Hessian-vector product H(x) v."""
+        if self.hvp_tape is None:
+            return finite_difference_hessp(self, x, v)
+        self.params.set(x)
+        # The forward pass feeds the gradient graph, which feeds the second backward pass.
+        self.tape.replay(scheduler=self.scheduler)
+        feed_dict = {direction: v[self.params.slice(variable)].reshape(np.shape(direction.value))
+                     for variable, direction in self.directions}
+        return self.params.pack(self.hvp_tape.replay(feed_dict, scheduler=self.scheduler))
+
+
+def finite_difference_hessp(fun, x, v):
+    """Hessian-vector product H(x) v from central differences of the gradient."""
+    norm = np.linalg.norm(v)
+    if norm == 0:
+        return np.zeros_like(x)
+    epsilon = np.sqrt(np.finfo(float).eps) * (1.0 + np.linalg.norm(x)) / norm
+    _, g_plus = fun(x + epsilon * v)
+    _, g_minus = fun(x - epsilon * v)
+    return (g_plus - g_minus) / (2.0 * epsilon)
+
+
+class _Counted(object):
+    # Objective wrapper counting its evaluations.
+
+    def __init__(self, fun):
+        self.fun = fun
+        self.n_eval = 0
+
+    def __call__(self, x):
+        self.n_eval += 1
+        return self.fun(x)
+
+
+def backtracking_line_search(fun, x, f, g, direction, step=1.0, c1=1e-4, shrink=0.5, max_iter=50):
+    """
+    Backtracking line search with the Armijo sufficient decrease condition.
+
+    Returns
+    -------
+    step, x_new, f_new, g_new: the accepted step and the objective at x + step * direction,
+    or a step of 0.0 (and the current point) if no decrease was found.
+    """
+    slope = np.dot(g, direction)
+    for _ in range(max_iter):
+        x_new = x + step * direction
+        f_new, g_new = fun(x_new)
+        if f_new <= f + c1 * step * slope:
+            return step, x_new, f_new, g_new
+        step *= shrink
+    return 0.0, x, f, g
+
+
+def gradient_descent(fun, x0, tol=1e-6, max_iter=1000, step=1.0):
+    """
+    Steepest descent with a backtracking line search.
+
+    Parameters
+    ----------
+    fun: Callable[[ndarray], Tuple[float, ndarray]]
+        The objective, returning its value and gradient.
+    x0: ndarray
+        The packed starting point.
+    tol: float
+        The tolerance on the gradient norm.
+    max_iter: int
+        The maximum number of iterations.
+    step: float
+        The initial step of the line search.
+    """
+    fun = _Counted(fun)
+    x = np.array(x0, dtype=float)
+    f, g = fun(x)
+
+    for n_iter in range(max_iter):
+        if np.linalg.norm(g) <= tol:
+            return OptimizeResult(x, f, g, n_iter, fun.n_eval, True, "gradient norm below tolerance")
+        accepted, x, f, g = backtracking_line_search(fun, x, f, g, -g, step)
+        if accepted == 0.0:
+            return OptimizeResult(x, f, g, n_iter, fun.n_eval, False, "line search failed")
+        # Start the next line search from a slightly longer step.
+        step = accepted * 2.0
+
+    return OptimizeResult(x, f, g, max_iter, fun.n_eval, np.linalg.norm(g) <= tol, "maximum number of iterations")
+
+
+def lbfgs(fun, x0, tol=1e-6, max_iter=1000, history=10):
+    """
+    Limited-memory BFGS with a backtracking line search.
+
+    The last `history` position and gradient differences are kept in two
+    preallocated ring buffers, and the inverse Hessian is applied with the
+    two-loop recursion.
+
+    Parameters
+    ----------
+    fun: Callable[[ndarray], Tuple[float, ndarray]]
+        The objective, returning its value and gradient.
+    x0: ndarray
+        The packed starting point.
+    tol: float
+        The tolerance on the gradient norm.
+    max_iter: int
+        The maximum number of iterations.
+    history: int
+        The number of correction pairs kept.
+    """
+    fun = _Counted(fun)
+    x = np.array(x0, dtype=float)
+    f, g = fun(x)
+
+    s_buffer = np.zeros((history, x.size))
+    y_buffer = np.zeros((history, x.size))
+    rho = np.zeros(history)
+    alpha = np.zeros(history)
+    n_pairs, newest = 0, -1
+
+    for n_iter in range(max_iter):
+        if np.linalg.norm(g) <= tol:
+            return OptimizeResult(x, f, g, n_iter, fun.n_eval, True, "gradient norm below tolerance")
+
+        # Two-loop recursion, from the newest pair to the oldest and back
+        q = g.copy()
+        order = [(newest - k) % history for k in range(n_pairs)]
+        for i in order:
+            alpha[i] = rho[i] * np.dot(s_buffer[i], q)
+            q -= alpha[i] * y_buffer[i]
+        if n_pairs:
+            q *= np.dot(s_buffer[newest], y_buffer[newest]) / np.dot(y_buffer[newest], y_buffer[newest])
+        for i in reversed(order):
+            beta = rho[i] * np.dot(y_buffer[i], q)
+            q += (alpha[i] - beta) * s_buffer[i]
+        direction = -q
+
+        if np.dot(direction, g) >= 0:
+            # Not a descent direction: restart from steepest descent.
+            direction, n_pairs = -g, 0
+
+        step = 1.0 if n_pairs else min(1.0, 1.0 / np.linalg.norm(g))
+        accepted, x_new, f_new, g_new = backtracking_line_search(fun, x, f, g, direction, step)
+        if accepted == 0.0:
+            return OptimizeResult(x, f, g, n_iter, fun.n_eval, False, "line search failed")
+
+        s, y = x_new - x, g_new - g
+        curvature = np.dot(s, y)
+        if curvature > 1e-10 * np.linalg.norm(s) * np.linalg.norm(y):
+            newest = (newest + 1) % history
+            s_buffer[newest], y_buffer[newest], rho[newest] = s, y, 1.0 / curvature
+            n_pairs = min(n_pairs + 1, history)
+        x, f, g = x_new, f_new, g_new
+
+    return OptimizeResult(x, f, g, max_iter, fun.n_eval, np.linalg.norm(g) <= tol, "maximum number of iterations")
+
+
+def newton_cg(fun, hessp, x0, tol=1e-6, max_iter=200, cg_max_iter=None):
+    """
+    Truncated Newton method: the Newton step is found by conjugate gradients
+    on H p = -g using only Hessian-vector products, then safeguarded by a
+    backtracking line search.
+
+    Parameters
+    ----------
+    fun: Callable[[ndarray], Tuple[float, ndarray]]
+        The objective, returning its value and gradient.
+    hessp: Callable[[ndarray, ndarray], ndarray]
+        The Hessian-vector product (x, v) -> H(x) v.
+    x0: ndarray
+        The packed starting point.
+    tol: float
+        The tolerance on the gradient norm.
+    max_iter: int
+        The maximum number of Newton iterations.
+    cg_max_iter: int, optional
+        The maximum number of conjugate gradient iterations. (Default is the problem size)
+    """
+    fun = _Counted(fun)
+    x = np.array(x0, dtype=float)
+    f, g = fun(x)
+    cg_max_iter = cg_max_iter or x.size
+
+    for n_iter in range(max_iter):
+        g_norm = np.linalg.norm(g)
+        if g_norm <= tol:
+            return OptimizeResult(x, f, g, n_iter, fun.n_eval, True, "gradient norm below tolerance")
+
+        # Conjugate gradients, stopped at negative curvature or at a forcing tolerance
+        p = np.zeros_like(x)
+        r = -g
+        d = r.copy()
+        forcing = min(0.5, np.sqrt(g_norm)) * g_norm
+        for _ in range(cg_max_iter):
+            Hd = hessp(x, d)
+            curvature = np.dot(d, Hd)
+            if curvature <= 0:
+                if not p.any():
+                    p = -g
+                break
+            step = np.dot(r, r) / curvature
+            p += step * d
+            r_new = r - step * Hd
+            if np.linalg.norm(r_new) <= forcing:
+                break
+            d = r_new + (np.dot(r_new, r_new) / np.dot(r, r)) * d
+            r = r_new
+
+        accepted, x, f, g = backtracking_line_search(fun, x, f, g, p)
+        if accepted == 0.0:
+            return OptimizeResult(x, f, g, n_iter, fun.n_eval, False, "line search failed")
+
+    return OptimizeResult(x, f, g, max_iter, fun.n_eval, np.linalg.norm(g) <= tol, "maximum number of iterations")
+
+
+def minimize(loss_node, variables, method="lbfgs", scheduler=None, **options):
+    """
+    Minimize a scalar loss node with respect to its variables.
+
+    The variables are packed, the forward and backward passes are compiled on
+    a tape, and the variables are left at the solution.
+
+    Parameters
+    ----------
+    loss_node: Node
+        The scalar node to minimize.
+    variables: List[Node]
+        The variables to optimize.
+    method: str
+        One of "gradient_descent", "lbfgs" and "newton_cg". (Default is "lbfgs")
+    scheduler: ThreadScheduler, optional
+        Replay independent nodes concurrently. (Default is sequential)
+    options:
+        Passed to the solver (e.g. tol, max_iter).
+
+    Returns
+    -------
+    result: OptimizeResult
+    """
+    objective = Objective(loss_node, variables, scheduler=scheduler)
+    x0 = objective.params.buffer.copy()
+
+    if method == "gradient_descent":
+        result = gradient_descent(objective, x0, **options)
+    elif method == "lbfgs":
+        result = lbfgs(objective, x0, **options)
+    elif method == "newton_cg":
+        result = newton_cg(objective, objective.hessp, x0, **options)
+    else:
+        raise ValueError(f"Unknown method '{method}'.")
+
+    objective(result.x)
+    result.n_eval = objective.n_eval
+    return result
@@ -0,0 +1,104 @@
+import numpy as np
+
+from .gradients import gradients
+
+
+def _magnitude(value):
+    # Plain numerical value of a value or of a Quantity.
+    value = getattr(value, "value", value)
+    return getattr(value, "value", value)
+
+
+def _reduce_to(value, shape):
+    # Sum a value over the axes along which a value of the given shape was broadcast.
+    value = np.asarray(value)
+    if value.ndim > len(shape):
+        value = value.sum(axis=tuple(range(value.ndim - len(shape))))
+    axes = tuple(i for i, n in enumerate(shape) if n == 1 and value.ndim == len(shape) and value.shape[i] != 1)
+    if axes:
+        value = value.sum(axis=axes, keepdims=True)
+    return np.broadcast_to(value, shape)
+
+
+class ParameterVector(object):
+    # Variables packed into one contiguous buffer with a stable layout.
+
+    def __init__(self, variables, dtype=np.float64):
+        """
+        Pack the values of the variables into one contiguous buffer.
+
+        The value of every variable is replaced by a view into the buffer (wrapped
+        in a Quantity of the same unit for Quantity-valued variables), so that
+        updating the buffer updates all the variables at once. The variables are
+        laid out in the given order, each one flattened in C order.
+
+        Parameters
+        ----------
+        variables: List[Node]
+            The variables to pack.
+        dtype: dtype, optional
+            The dtype of the buffer. (Default is float64)
+        """
+        self.variables = list(variables)
+        self.shapes = [np.shape(_magnitude(variable)) for variable in self.variables]
+        self.units = [getattr(variable.value, "unit", None) for variable in self.variables]
+        self.types = [type(variable.value) for variable in self.variables]
+
+        sizes = [int(np.prod(shape, dtype=np.int64)) for shape in self.shapes]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+        self.buffer = np.empty(self.offsets[-1], dtype=dtype)
+
+        for i, variable in enumerate(self.variables):
+            self.buffer[self.offsets[i]:self.offsets[i + 1]] = np.ravel(_magnitude(variable))
+        for variable, view in zip(self.variables, self.unpack(self.buffer)):
+            variable.value = view
+
+
+    def __len__(self):
+        return len(self.buffer)
+
+
+    def slice(self, variable):
+        """Return the slice of a variable in the packed layout."""
+        for i, other in enumerate(self.variables):
+            if other is variable:
+                return slice(self.offsets[i], self.offsets[i + 1])
+        raise KeyError(variable.name)
+
+
+    def set(self, vector):
+        """Copy a packed vector into the buffer, i.e. into all the variables."""
+        self.buffer[...] = vector
+
+
+    def unpack(self, vector):
+        """Split a packed vector into views shaped (and united) as the variables."""
+        values = []
+        for i, (shape, unit) in enumerate(zip(self.shapes, self.units)):
+            view = vector[self.offsets[i]:self.offsets[i + 1]].reshape(shape)
+            values.append(view if unit is None else self.types[i](view, unit))
+        return values
+
+
+    def pack(self, values, out=None):
+        """
+        Pack one value per variable (e.g. gradients replayed by a Tape) into a vector.
+
+        Nodes and quantities are reduced to their numerical values, and scalars
+        (e.g. the 0.0 gradient of an unreached variable) are broadcast to the
+        shape of their variable. Values with more elements than their variable,
+        i.e. gradients of a variable broadcast in the graph, are summed over the
+        broadcast axes.
+        """
+        if out is None:
+            out = np.empty_like(self.buffer)
+        for i, value in enumerate(values):
+            out[self.offsets[i]:self.offsets[i + 1]] = np.ravel(_reduce_to(_magnitude(value), self.shapes[i]))
+        return out
+
+
+    def gradients(self, loss_node, scheduler=None, out=None):
+        """Compute the gradients of the loss with respect to the variables, in the packed layout."""
+        grads = gradients(loss_node, self.variables, scheduler=scheduler)
+        return self.pack([grads[variable] for variable in self.variables], out=out)
+
@@ -0,0 +1,115 @@
+"""
+Floating point precision policy of the computation graphs.
+
+The compute dtype is the dtype of the floating point node values: variables,
+the outputs of all the ops and the gradient nodes built by gradients(). The
+accumulate dtype, if any, is used inside reductions (norms, dot products) and
+to sum gradient contributions, the result being stored back in the compute
+dtype. Integer and boolean values (e.g. indices and masks) are left unchanged.
+
+The policy is recorded on every node when it is built, so a graph keeps its
+dtypes in tape replays and in gradients() after the policy has changed, and
+the policy set in a thread (or an asyncio task) does not affect the others.
+By default no dtype is enforced and NumPy picks it, as before.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+
+
+# Policy of the graphs built in the current context: None, or the (compute,
+# accumulate) dtype names, each None when not enforced, as recorded on the nodes.
+_policy = ContextVar("precision", default=None)
+
+
+def _make_policy(compute=None, accumulate=None):
+    if compute is None and accumulate is None:
+        return None
+    return (None if compute is None else np.dtype(compute).name,
+            None if accumulate is None else np.dtype(accumulate).name)
+
+
+def set_precision(compute=None, accumulate=None):
+    """
+    Set the dtype policy of the graphs built from now on in the current thread or task.
+
+    Parameters
+    ----------
+    compute: dtype, optional
+        The dtype of the floating point node values, e.g. np.float32. (Default is none enforced)
+    accumulate: dtype, optional
+        The dtype of reductions and gradient sums, e.g. np.float64. (Default is the compute dtype)
+    """
+    _policy.set(_make_policy(compute, accumulate))
+
+
+def get_precision():
+    """Return the (compute, accumulate) dtypes of the current policy."""
+    policy = _policy.get()
+    if policy is None:
+        return None, None
+    return tuple(None if name is None else np.dtype(name) for name in policy)
+
+
+def current_policy():
+    """Return the policy recorded on the nodes built now."""
+    return _policy.get()
+
+
+@contextmanager
+def use_precision(compute=None, accumulate=None):
+    """Temporarily set the dtype policy, see set_precision."""
+    token = _policy.set(_make_policy(compute, accumulate))
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+@contextmanager
+def use_policy(policy):
+    """Temporarily build nodes with a recorded policy, e.g. the one of a graph being differentiated."""
+    token = _policy.set(policy)
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+def cast(value, dtype):
+    """
+    Cast a floating point value to a dtype, None leaving it unchanged.
+
+    Arrays, NumPy and Python floats are cast, the magnitude of quantities too;
+    integers, booleans (e.g. indices and comparison masks) and other values are
+    returned unchanged.
+    """
+    if dtype is None:
+        return value
+    dtype = np.dtype(dtype)
+
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f" and value.dtype != dtype:
+            return value.astype(dtype)
+        return value
+    if isinstance(value, (float, np.floating)):
+        return dtype.type(value)
+    if hasattr(value, "value") and hasattr(value, "unit"):
+        magnitude = cast(value.value, dtype)
+        if magnitude is not value.value:
+            return type(value)(magnitude, value.unit, getattr(value, "variance", None))
+    return value
+
+
+def compute_dtype(policy):
+    """Return the compute dtype of a recorded policy, or None."""
+    return None if policy is None else policy[0]
+
+
+def accumulate(value, policy):
+    """Cast a value to the accumulate dtype of a recorded policy, if any."""
+    if policy is None or policy[1] is None:
+        return value
+    return cast(value, policy[1])
@@ -0,0 +1,144 @@
+"""
+Batched root-finding for many independent small nonlinear systems.
+
+The systems are stacked along the leading axis: every node of the residual
+graph holds the values of all the systems at once. The residual graph is
+built once, together with its symbolic derivatives, and recorded on a tape;
+each iteration replays it on the systems that have not converged yet.
+"""
+
+import numpy as np
+
+from .autodiff import Node, Variable
+from .gradients import gradients, multi_gradients
+from .tape import Tape
+
+
+class RootResult(object):
+    # Outcome of a batched root search.
+
+    def __init__(self, x, fun, converged, n_iter):
+        """
+        Parameters
+        ----------
+        x: ndarray
+            The roots, (n,) for scalar equations or (n, m) for systems.
+        fun: ndarray
+            The residuals at the last evaluation of each system.
+        converged: ndarray
+            Boolean mask of the systems whose residuals are within the tolerance.
+        n_iter: ndarray
+            The number of iterations of each system.
+        """
+        self.x = x
+        self.fun = fun
+        self.converged = converged
+        self.n_iter = n_iter
+
+    def __repr__(self):
+        return f"RootResult(converged={int(self.converged.sum())}/{self.converged.size}, max_iter={self.n_iter.max(initial=0)})"
+
+
+def _values(values, n):
+    # Broadcast the replayed values (e.g. constant 0.0 derivatives) to the active systems.
+    return [np.broadcast_to(getattr(value, "value", value), (n,)) for value in values]
+
+
+def newton(f, x0, args=(), tol=1e-10, max_iter=50, method="newton"):
+    """
+    Solve f(x, *args) = 0 for every system stacked along the leading axis.
+
+    Parameters
+    ----------
+    f: Callable
+        Builds the residuals from nodes. For scalar equations (x0 of shape (n,))
+        it takes a node of shape (n,) and returns a node; for systems of m
+        equations (x0 of shape (n, m)) it takes a list of m nodes of shape (n,)
+        and returns a list of m nodes. f must only use element-wise ops, so
+        that the systems do not mix.
+    x0: ndarray
+        The initial guesses.
+    args: Tuple[ndarray]
+        Per-system parameters stacked along the leading axis, passed to f as
+        nodes. Per-system data must be passed here rather than captured by f,
+        so that converged systems can be dropped from the replays.
+    tol: float
+        The tolerance on the residuals. Systems whose steps stall below it
+        without reaching a root stop early and are not marked as converged.
+    max_iter: int
+        The maximum number of iterations.
+    method: str
+        "newton", or "halley" for scalar equations (cubic convergence).
+
+    Returns
+    -------
+    result: RootResult
+    """
+    x = np.array(x0, dtype=float)
+    scalar = x.ndim == 1
+    if scalar:
+        x = x[:, None]
+    n, m = x.shape
+    if method not in ("newton", "halley"):
+        raise ValueError(f"Unknown method '{method}'.")
+    if method == "halley" and not scalar:
+        raise ValueError("Halley's method is only available for scalar equations.")
+
+    # Build the residuals and their derivatives once, for all the systems
+    variables = [Variable(f"x{j}", x[:, j].copy()) for j in range(m)]
+    parameters = [Variable(f"arg{k}", np.asarray(arg)) for k, arg in enumerate(args)]
+    residuals = f(variables[0] if scalar else variables, *parameters)
+    residuals = [residuals] if scalar else list(residuals)
+    if len(residuals) != m:
+        raise ValueError("f must return as many residuals as unknowns.")
+
+    # The systems are independent, so a unit seed yields the per-system derivatives
+    # d residual_i / d x_j of all the systems in a single backward sweep.
+    jacobian = multi_gradients(residuals, variables)
+    outputs = residuals + [jacobian[i][variable] for i in range(m) for variable in variables]
+    if method == "halley":
+        derivative = outputs[1]
+        second = gradients(derivative, variables)[variables[0]] if isinstance(derivative, Node) else 0.0
+        outputs.append(second)
+    tape = Tape(outputs)
+
+    fun = np.zeros((n, m))
+    converged = np.zeros(n, dtype=bool)
+    stalled = np.zeros(n, dtype=bool)
+    n_iter = np.zeros(n, dtype=int)
+    active = np.arange(n)
+
+    for _ in range(max_iter):
+        feed_dict = {variable: x[active, j] for j, variable in enumerate(variables)}
+        feed_dict.update({parameter: np.asarray(arg)[active] for parameter, arg in zip(parameters, args)})
+        values = _values(tape.replay(feed_dict), active.size)
+
+        F = np.stack(values[:m], axis=-1)
+        J = np.stack(values[m:m + m * m], axis=-1).reshape(active.size, m, m)
+        fun[active] = F
+
+        # Systems already at a root are not stepped
+        done = np.max(np.abs(F), axis=-1) <= tol
+        if method == "halley":
+            dF, d2F = J[:, 0, 0], values[-1]
+            step = (-2.0 * F[:, 0] * dF / (2.0 * dF * dF - F[:, 0] * d2F))[:, None]
+        else:
+            try:
+                step = np.linalg.solve(J, -F[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                step = -(np.linalg.pinv(J) @ F[..., None])[..., 0]
+        step[done] = 0.0
+
+        x[active] += step
+        n_iter[active] += 1
+        # A tiny step only ends the search: the residual is checked once more at
+        # the new point, and a second tiny step without a root leaves it unconverged.
+        tiny = np.max(np.abs(step), axis=-1) <= tol * (1.0 + np.max(np.abs(x[active]), axis=-1))
+        stop = done | (tiny & stalled[active])
+        stalled[active] = tiny
+        converged[active[done]] = True
+        active = active[~stop]
+        if not active.size:
+            break
+
+    return RootResult(x[:, 0] if scalar else x, fun[:, 0] if scalar else fun, converged, n_iter)
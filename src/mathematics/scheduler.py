@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+
+class ThreadScheduler(object):
+    # Run independent graph nodes concurrently on a thread pool.
+
+    def __init__(self, max_workers=None):
+        """
+        Parameters
+        ----------
+        max_workers: int, optional
+            The number of worker threads. (Default is the ThreadPoolExecutor default)
+
+        Only the numerical kernels of the ops run concurrently: NumPy releases the GIL
+        on large arrays, so wide graphs (e.g. the independent terms of a multi-body
+        Hamiltonian) gain from it while small scalar graphs are better run sequentially.
+        """
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+
+    def map(self, function, nodes):
+        """Apply the function to every node, returning the results in the order of the nodes."""
+        if len(nodes) == 1:
+            return [function(nodes[0])]
+        # The workers run in copies of the caller's context, e.g. its precision policy
+        contexts = [copy_context() for _ in nodes]
+        return list(self.executor.map(lambda context, node: context.run(function, node), contexts, nodes))
+
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def dependency_waves(nodes, dependencies):
+    """
+    Split nodes into successive waves of mutually independent nodes.
+
+    A node becomes ready once all of its dependencies have been yielded, which
+    is tracked with a dependency count per node. Each wave is sorted by the
+    position of its nodes in the given list, so that the schedule is deterministic.
+    The next wave is computed only when the caller resumes the generator, i.e.
+    after it has processed the current wave.
+
+    Parameters
+    ----------
+    nodes: List[Node]
+        The nodes to schedule, in a valid sequential order.
+    dependencies: Callable[[Node], Iterable[Node]]
+        The nodes a node depends on; the ones not in nodes are ignored.
+
+    Yields
+    ------
+    wave: List[Node]
+        The nodes whose dependencies have all been processed.
+    """
+    position = {id(node): i for i, node in enumerate(nodes)}
+    pending = {}
+    dependents = {id(node): [] for node in nodes}
+
+    for node in nodes:
+        required = {id(dependency): dependency for dependency in dependencies(node) if id(dependency) in position}
+        pending[id(node)] = len(required)
+        for key in required:
+            dependents[key].append(node)
+
+    wave = [node for node in nodes if pending[id(node)] == 0]
+    while wave:
+        yield wave
+        ready = []
+        for node in wave:
+            for dependent in dependents[id(node)]:
+                pending[id(dependent)] -= 1
+                if pending[id(dependent)] == 0:
+                    ready.append(dependent)
+        wave = sorted(ready, key=lambda node: position[id(node)])
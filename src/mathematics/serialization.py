@@ -0,0 +1,326 @@
+"""
+Binary serialization of computation graphs and an on-disk graph cache.
+
+A serialized graph holds, in topological order, the op code of every node
+(the name of its op class, plus the op state when it differs from the
+module-level singleton, e.g. the axis of a NormOp), the indices of its inputs,
+its constants and attributes, and the values of its leaves. Quantities are
+stored as their value followed by the unit metadata: the seven SI exponents,
+the prefix factor and the symbol.
+
+Loading creates the nodes directly and computes their values with Op.compute,
+without tracing the Python code that built the graph.
+"""
+
+import hashlib
+import io
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from . import autodiff
+from .autodiff import Node, Op, PlaceholderOp
+from .tape import Tape
+from .topology import find_topo_sort
+
+
+MAGIC = b"SCPG"
+VERSION = 1
+
+# Node fields written explicitly, every other attribute is stored by name.
+_NODE_FIELDS = ("name", "_value", "inputs", "op")
+
+# Op singletons of the autodiff module, by class name.
+_OPS = {type(op).__name__: op for op in vars(autodiff).values() if isinstance(op, Op)}
+
+
+def _write_str(stream, string):
+    data = string.encode("utf-8")
+    stream.write(struct.pack("<I", len(data)))
+    stream.write(data)
+
+def _read_str(stream):
+    size, = struct.unpack("<I", stream.read(4))
+    return stream.read(size).decode("utf-8")
+
+
+def _write_unit(stream, unit):
+    stream.write(struct.pack("<7dd", *unit.base.dimensions, unit.prefix.factor))
+    _write_value(stream, unit.symbol)
+
+def _read_unit(stream):
+    from physics import BaseQuantity, Prefix, Unit
+    *exponents, factor = struct.unpack("<7dd", stream.read(64))
+    exponents = [int(e) if float(e).is_integer() else e for e in exponents]
+    return Unit(BaseQuantity(*exponents), Prefix(factor), _read_value(stream))
+
+
+def _write_value(stream, value):
+    """Write a tagged value: constants, arrays, containers and quantities."""
+    if value is None:
+        stream.write(b"N")
+    elif isinstance(value, (bool, np.bool_)):
+        stream.write(b"b" + struct.pack("<?", bool(value)))
+    elif isinstance(value, (int, np.integer)):
+        stream.write(b"i" + struct.pack("<q", int(value)))
+    elif isinstance(value, (float, np.floating)):
+        stream.write(b"f" + struct.pack("<d", float(value)))
+    elif isinstance(value, (complex, np.complexfloating)):
+        stream.write(b"c" + struct.pack("<dd", value.real, value.imag))
+    elif isinstance(value, str):
+        stream.write(b"s")
+        _write_str(stream, value)
+    elif isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise ValueError("Arrays of Python objects cannot be serialized.")
+        stream.write(b"a")
+        _write_str(stream, value.dtype.str)
+        stream.write(struct.pack(f"<I{value.ndim}q", value.ndim, *value.shape))
+        stream.write(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        stream.write(b"l" if isinstance(value, list) else b"t")
+        stream.write(struct.pack("<I", len(value)))
+        for item in value:
+            _write_value(stream, item)
+    elif isinstance(value, dict):
+        stream.write(b"d")
+        stream.write(struct.pack("<I", len(value)))
+        for key, item in value.items():
+            _write_str(stream, key)
+            _write_value(stream, item)
+    elif hasattr(value, "base") and hasattr(value, "prefix"):
+        stream.write(b"u")
+        _write_unit(stream, value)
+    elif hasattr(value, "value") and hasattr(value, "unit"):
+        stream.write(b"q")
+        _write_value(stream, value.value)
+        _write_unit(stream, value.unit)
+    else:
+        raise ValueError(f"Cannot serialize a value of type '{type(value).__name__}'.")
+
+def _read_value(stream):
+    tag = stream.read(1)
+    if tag == b"N":
+        return None
+    if tag == b"b":
+        return struct.unpack("<?", stream.read(1))[0]
+    if tag == b"i":
+        return struct.unpack("<q", stream.read(8))[0]
+    if tag == b"f":
+        return struct.unpack("<d", stream.read(8))[0]
+    if tag == b"c":
+        return complex(*struct.unpack("<dd", stream.read(16)))
+    if tag == b"s":
+        return _read_str(stream)
+    if tag == b"a":
+        dtype = np.dtype(_read_str(stream))
+        ndim, = struct.unpack("<I", stream.read(4))
+        shape = struct.unpack(f"<{ndim}q", stream.read(8 * ndim))
+        size = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        return np.frombuffer(stream.read(size), dtype=dtype).reshape(shape).copy()
+    if tag in (b"l", b"t"):
+        size, = struct.unpack("<I", stream.read(4))
+        items = [_read_value(stream) for _ in range(size)]
+        return items if tag == b"l" else tuple(items)
+    if tag == b"d":
+        size, = struct.unpack("<I", stream.read(4))
+        return {_read_str(stream): _read_value(stream) for _ in range(size)}
+    if tag == b"u":
+        return _read_unit(stream)
+    if tag == b"q":
+        from physics import Quantity
+        value = _read_value(stream)
+        return Quantity(value, _read_unit(stream))
+    raise ValueError(f"Unknown value tag {tag!r}.")
+
+
+def _op_state(op):
+    # The op state is stored only when it differs from the singleton of its class.
+    singleton = _OPS.get(type(op).__name__)
+    if singleton is None:
+        raise ValueError(f"Cannot serialize the op '{type(op).__name__}'.")
+    return None if singleton is op or vars(op) == vars(singleton) else dict(vars(op))
+
+def _load_op(name, state):
+    if name not in _OPS:
+        raise ValueError(f"Unknown op '{name}'.")
+    if state is None:
+        return _OPS[name]
+    op = object.__new__(type(_OPS[name]))
+    vars(op).update(state)
+    return op
+
+
+def _write_graph(stream, outputs, values=True):
+    nodes = find_topo_sort([output for output in outputs if isinstance(output, Node)])
+    index = {id(node): i for i, node in enumerate(nodes)}
+
+    stream.write(struct.pack("<I", len(nodes)))
+    for node in nodes:
+        _write_str(stream, type(node.op).__name__)
+        _write_value(stream, _op_state(node.op))
+        _write_value(stream, node.name)
+        stream.write(struct.pack(f"<I{len(node.inputs)}I", len(node.inputs), *[index[id(i)] for i in node.inputs]))
+        _write_value(stream, {key: item for key, item in vars(node).items() if key not in _NODE_FIELDS})
+        if not node.inputs:
+            # The values of the variables are left out of structural hashes.
+            _write_value(stream, node.value if values or not isinstance(node.op, PlaceholderOp) else None)
+
+    # Outputs are node indices, or constants (e.g. the 0.0 gradient of an unreached variable)
+    stream.write(struct.pack("<I", len(outputs)))
+    for output in outputs:
+        if isinstance(output, Node):
+            stream.write(b"n" + struct.pack("<I", index[id(output)]))
+        else:
+            stream.write(b"v")
+            _write_value(stream, output)
+
+
+def _read_graph(stream):
+    nodes = []
+    size, = struct.unpack("<I", stream.read(4))
+    for _ in range(size):
+        node = Node()
+        op_name = _read_str(stream)
+        node.op = _load_op(op_name, _read_value(stream))
+        node.name = _read_value(stream)
+        n_inputs, = struct.unpack("<I", stream.read(4))
+        node.inputs = [nodes[i] for i in struct.unpack(f"<{n_inputs}I", stream.read(4 * n_inputs))]
+        for key, item in _read_value(stream).items():
+            setattr(node, key, item)
+        if node.inputs:
+            node.value = node.op.compute(node, [input_node.value for input_node in node.inputs])
+        else:
+            node.value = _read_value(stream)
+        nodes.append(node)
+
+    outputs = []
+    size, = struct.unpack("<I", stream.read(4))
+    for _ in range(size):
+        if stream.read(1) == b"n":
+            outputs.append(nodes[struct.unpack("<I", stream.read(4))[0]])
+        else:
+            outputs.append(_read_value(stream))
+    return outputs
+
+
+def dumps(graph):
+    """
+    Serialize a graph to bytes.
+
+    Parameters
+    ----------
+    graph: Tape or List[Node]
+        The output nodes of the graph, or a recorded tape.
+
+    Returns
+    -------
+    data: bytes
+    """
+    stream = io.BytesIO()
+    stream.write(MAGIC + struct.pack("<H?", VERSION, isinstance(graph, Tape)))
+    _write_graph(stream, graph.outputs if isinstance(graph, Tape) else list(graph))
+    return stream.getvalue()
+
+
+def loads(data):
+    """
+    Rebuild a graph serialized with dumps.
+
+    Returns
+    -------
+    graph: Tape or List[Node]
+        A tape if a tape was serialized, otherwise the list of output nodes.
+        The variables of the graph are the inputs of Tape(outputs).
+
+    Raises
+    ------
+    ValueError
+        If the data is not a serialized graph, is truncated or corrupted, or has another format VERSION.
+    """
+    stream = io.BytesIO(data)
+    if stream.read(4) != MAGIC:
+        raise ValueError("Not a serialized graph.")
+    try:
+        version, is_tape = struct.unpack("<H?", stream.read(3))
+        if version != VERSION:
+            raise ValueError(f"Unsupported graph format version {version}.")
+        outputs = _read_graph(stream)
+    except (struct.error, IndexError, KeyError, TypeError, AttributeError, OverflowError) as error:
+        # Truncated or corrupted data fails anywhere in the reader
+        raise ValueError("Corrupted serialized graph.") from error
+    return Tape(outputs) if is_tape else outputs
+
+
+def save(graph, path):
+    """Serialize a graph to a file, see dumps."""
+    with open(path, "wb") as file:
+        file.write(dumps(graph))
+
+
+def load(path):
+    """Rebuild a graph from a file, see loads."""
+    with open(path, "rb") as file:
+        return loads(file.read())
+
+
+def structural_hash(graph):
+    """
+    Hash the structure of a graph: its ops, topology, names and constants.
+
+    The values of the variables are ignored, so that the same model built at
+    different points has the same hash.
+    """
+    stream = io.BytesIO()
+    _write_graph(stream, graph.outputs if isinstance(graph, Tape) else list(graph), values=False)
+    return hashlib.sha256(stream.getvalue()).hexdigest()
+
+
+class GraphCache(object):
+    # Directory of serialized graphs shared by processes and restarts.
+
+    def __init__(self, directory):
+        """
+        Parameters
+        ----------
+        directory: str
+            The cache directory, created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+
+    def path(self, key):
+        """Return the file of a key, e.g. a structural hash or a description of the model."""
+        return os.path.join(self.directory, hashlib.sha256(str(key).encode("utf-8")).hexdigest() + ".graph")
+
+
+    def get(self, key):
+        """Return the cached graph of a key, or None if it is missing or unreadable (e.g. truncated or of an older VERSION)."""
+        try:
+            return load(self.path(key))
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+    def put(self, key, graph):
+        """Store a graph, replacing the file atomically so that concurrent readers never see a partial graph."""
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(dumps(graph))
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+    def get_or_build(self, key, builder):
+        """Return the cached graph of a key, building and storing it with builder() on a miss."""
+        graph = self.get(key)
+        if graph is None:
+            graph = builder()
+            self.put(key, graph)
+        return graph
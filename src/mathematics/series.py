@@ -0,0 +1,134 @@
+"""
+Arithmetic on truncated univariate Taylor series.
+
+A series of order k is a list [c_0, c_1, ..., c_k] of normalized Taylor
+coefficients, so that f(t0 + h) = sum_j c_j h^j + O(h^(k+1)).
+Coefficients may be scalars, numpy arrays or Quantity objects; every routine
+below only uses +, -, * and / on them, so units are carried along for free.
+All recurrences cost O(k^2) coefficient operations.
+"""
+
+
+def _sum(terms):
+    """Sum a non-empty iterable of coefficients without seeding it with 0."""
+    total = None
+    for term in terms:
+        total = term if total is None else total + term
+    return total
+
+
+def constant(value, order):
+    """Series of a value that does not depend on the expansion variable."""
+    return [value] + [0.0] * order
+
+
+def add(a, b):
+    """Series of a + b."""
+    return [a_k + b_k for a_k, b_k in zip(a, b)]
+
+
+def neg(a):
+    """Series of -a."""
+    return [-a_k for a_k in a]
+
+
+def scale(a, factor):
+    """Series of a * factor, with factor constant."""
+    return [a_k * factor for a_k in a]
+
+
+def shift(a, offset):
+    """Series of a + offset, with offset constant."""
+    return [a[0] + offset] + a[1:]
+
+
+def mul(a, b, op=None):
+    """
+    Series of the product a * b (Cauchy product).
+
+    Parameters
+    ----------
+    op: optional bilinear function used in place of `*` (e.g. np.dot).
+    """
+    if op is None:
+        return [_sum(a[j] * b[k - j] for j in range(k + 1)) for k in range(len(a))]
+    return [_sum(op(a[j], b[k - j]) for j in range(k + 1)) for k in range(len(a))]
+
+
+def div(a, b, c0):
+    """Series of a / b, given the already computed value c0 = a_0 / b_0."""
+    c = [c0]
+    for k in range(1, len(a)):
+        c.append((a[k] - _sum(c[j] * b[k - j] for j in range(k))) / b[0])
+    return c
+
+
+def integrate(x, u, y0):
+    """
+    Series of y defined by y' = u x' and y(t0) = y0.
+
+    This is the building block for every function whose derivative is known
+    as a series u = f'(x): y_k = 1/k sum_{j=1}^{k} j x_j u_{k-j}.
+    """
+    y = [y0]
+    for k in range(1, len(x)):
+        y.append(_sum(x[j] * u[k - j] * j for j in range(1, k + 1)) / k)
+    return y
+
+
+def exp(x, y0):
+    """Series of exp(x), given y0 = exp(x_0)."""
+    y = [y0]
+    for k in range(1, len(x)):
+        y.append(_sum(x[j] * y[k - j] * j for j in range(1, k + 1)) / k)
+    return y
+
+
+def log(x, y0):
+    """Series of log(x), given y0 = log(x_0)."""
+    y = [y0]
+    for k in range(1, len(x)):
+        if k == 1:
+            y.append(x[1] / x[0])
+        else:
+            y.append((x[k] - _sum(y[j] * x[k - j] * j for j in range(1, k)) / k) / x[0])
+    return y
+
+
+def pow_const(x, a, y0):
+    """Series of x ** a with constant exponent a, given y0 = x_0 ** a."""
+    y = [y0]
+    for k in range(1, len(x)):
+        y.append(_sum(x[k - j] * y[j] * (a * (k - j) - j) for j in range(k)) / (x[0] * k))
+    return y
+
+
+def sin_cos(x, s0, c0, sign=-1):
+    """
+    Series of the pair (sin(x), cos(x)), given s0 = sin(x_0) and c0 = cos(x_0).
+
+    With sign=+1 the same recurrence yields the pair (sinh(x), cosh(x)).
+    """
+    s, c = [s0], [c0]
+    for k in range(1, len(x)):
+        s.append(_sum(x[j] * c[k - j] * j for j in range(1, k + 1)) / k)
+        c.append(_sum(x[j] * s[k - j] * j for j in range(1, k + 1)) * sign / k)
+    return s, c
+
+
+def tan(x, y0, sign=1):
+    """
+    Series of tan(x), given y0 = tan(x_0), from y' = (1 + y^2) x'.
+
+    With sign=-1 the same recurrence yields tanh(x) from y' = (1 - y^2) x'.
+    """
+    y, w = [y0], [y0 * y0 * sign + 1]
+    for k in range(1, len(x)):
+        y.append(_sum(x[j] * w[k - j] * j for j in range(1, k + 1)) / k)
+        w.append(_sum(y[j] * y[k - j] for j in range(k + 1)) * sign)
+    return y
+
+
+def one_minus_square(x, sign=-1):
+    """Series of 1 - x^2 (or of x^2 + 1 with sign=+1)."""
+    return shift(scale(mul(x, x), sign), 1)
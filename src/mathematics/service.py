@@ -0,0 +1,217 @@
+"""
+Micro-batching evaluation service for many small value-and-gradient requests.
+
+A compiled expression is traced once, together with its gradients, on a
+unit-free tape. Concurrent requests for the same expression are collected
+over a short time window, their inputs are stacked along a new leading axis
+and a single replay evaluates the value and the gradients of all of them.
+As in the batched root-finding, the expression must be element-wise along the
+stacked axis, so that the unit seed of the backward pass yields the gradient
+of every request at once. The replays run in an executor, so that the event
+loop keeps collecting requests while a batch is being evaluated.
+"""
+
+import asyncio
+import functools
+import threading
+
+import numpy as np
+
+from .autodiff import Variable
+from .gradients import gradients
+from .tape import Tape
+
+
+class CompiledExpression(object):
+    # A graph and its gradients recorded once, replayed on stacked inputs.
+
+    def __init__(self, build, inputs, wrt=None):
+        """
+        Parameters
+        ----------
+        build: Callable[..., Node]
+            Builds the output node (e.g. an energy) from one variable per input,
+            passed as keyword arguments. It must only use element-wise ops.
+        inputs: Dict[str, Value]
+            An example value of every input for a single request, floats, arrays
+            or Quantities. Requests must give inputs of the same shapes and bases.
+        wrt: List[str], optional
+            The inputs to differentiate with respect to. (Default is all the inputs)
+        """
+        self.names = list(inputs)
+        self.wrt = self.names if wrt is None else list(wrt)
+        self.variables = {name: Variable(name, value) for name, value in inputs.items()}
+        self.shapes = {name: np.shape(getattr(value, "value", value)) for name, value in inputs.items()}
+
+        self.output = build(**self.variables)
+        grads = gradients(self.output, [self.variables[name] for name in self.wrt])
+        self.tape = Tape([self.output] + [grads[self.variables[name]] for name in self.wrt], strip_units=True)
+        # The tape holds the values of its last replay, so batches take turns on it
+        self.lock = threading.Lock()
+        self.types = [type(self.output.value)] + [type(getattr(grads[self.variables[name]], "value", grads[self.variables[name]])) for name in self.wrt]
+
+
+    def check(self, inputs):
+        """Raise if the inputs of a request cannot be stacked with the ones of the trace."""
+        if set(inputs) != set(self.names):
+            raise ValueError(f"Expected the inputs {self.names}, got {sorted(inputs)}.")
+        for name, value in inputs.items():
+            if np.shape(getattr(value, "value", value)) != self.shapes[name]:
+                raise ValueError(f"Input {name} of shape {np.shape(getattr(value, 'value', value))} instead of {self.shapes[name]}.")
+
+
+    def _magnitude(self, name, value):
+        # Magnitude of an input in its recorded unit.
+        unit = self.tape.units[id(self.variables[name])]
+        if not hasattr(value, "unit"):
+            return value
+        if unit is None or not value.unit.base == unit.base:
+            raise TypeError(f"Unsupported unit '{value.unit}' for the input {name} of unit '{unit}'")
+        return value.value * value.unit.prefix.factor / unit.prefix.factor
+
+
+    def __call__(self, batch, scheduler=None):
+        """
+        Evaluate the output and the gradients of a batch of requests in one replay.
+
+        Parameters
+        ----------
+        batch: List[Dict[str, Value]]
+            The inputs of every request.
+        scheduler: ThreadScheduler, optional
+            Passed on to the tape replay.
+
+        Returns
+        -------
+        results: List[Tuple[Value, Dict[str, Value]]]
+            The value and the gradients of every request, as Quantities for outputs with a unit.
+        """
+        n = len(batch)
+        feed_dict = {self.variables[name]: np.stack([self._magnitude(name, inputs[name]) for inputs in batch])
+                     for name in self.names}
+        with self.lock:
+            values = self.tape.replay(feed_dict, scheduler=scheduler)
+
+        # Gradients that do not depend on the inputs are replayed as scalars
+        columns = []
+        for k, (value, unit) in enumerate(zip(values, self.tape.output_units)):
+            shape = self.shapes[self.wrt[k - 1]] if k else np.shape(value)[1:]
+            value = np.broadcast_to(value, (n,) + shape)
+            columns.append([value[i] if unit is None else self.types[k](value[i], unit) for i in range(n)])
+
+        return [(columns[0][i], {name: columns[k + 1][i] for k, name in enumerate(self.wrt)}) for i in range(n)]
+
+
+class EvaluationService(object):
+    # Collect concurrent requests per expression and evaluate them in batches.
+
+    def __init__(self, max_batch_size=256, max_delay=0.002, scheduler=None, executor=None):
+        """
+        Parameters
+        ----------
+        max_batch_size: int, optional
+            A batch is evaluated as soon as it holds this many requests. (Default is 256)
+        max_delay: float, optional
+            The longest time, in seconds, a request waits for others to join its
+            batch, which bounds the latency added by the batching. (Default is 2 ms)
+        scheduler: ThreadScheduler, optional
+            Passed on to the tape replays.
+        executor: concurrent.futures.Executor, optional
+            Runs the batched replays off the event loop. (Default is the loop's default executor)
+        """
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.scheduler = scheduler
+        self.executor = executor
+        self.expressions = {}
+        self.pending = {}
+        self.timers = {}
+        self.n_requests = 0
+        self.n_batches = 0
+
+
+    def register(self, name, expression):
+        """Register a compiled expression under a name."""
+        self.expressions[name] = expression
+        self.pending[name] = []
+
+
+    async def evaluate(self, name, **inputs):
+        """
+        Evaluate a registered expression and its gradients at the given inputs.
+
+        Returns
+        -------
+        value: Value
+            The value of the expression.
+        grads: Dict[str, Value]
+            The gradients with respect to the inputs, keyed by name.
+        """
+        if name not in self.expressions:
+            raise KeyError(name)
+        self.expressions[name].check(inputs)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[name].append((inputs, future))
+        self.n_requests += 1
+
+        if len(self.pending[name]) >= self.max_batch_size:
+            self.flush(name)
+        elif name not in self.timers:
+            self.timers[name] = loop.call_later(self.max_delay, self.flush, name)
+        return await future
+
+
+    def flush(self, name):
+        """Start evaluating the pending requests of an expression in the executor."""
+        timer = self.timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+        batch, self.pending[name] = self.pending[name], []
+        batch = [(inputs, future) for inputs, future in batch if not future.cancelled()]
+        if not batch:
+            return
+
+        self.n_batches += 1
+        loop = asyncio.get_running_loop()
+        evaluation = loop.run_in_executor(self.executor, functools.partial(
+            self.expressions[name], [inputs for inputs, _ in batch], scheduler=self.scheduler))
+        evaluation.add_done_callback(functools.partial(self._resolve, batch))
+
+
+    @staticmethod
+    def _resolve(batch, evaluation):
+        # Hand the results of a batch, or its error, to the requests still waiting.
+        futures = [future for _, future in batch]
+        error = evaluation.exception() if not evaluation.cancelled() else asyncio.CancelledError()
+        results = [None] * len(futures) if error is not None else evaluation.result()
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+    @property
+    def mean_batch_size(self):
+        """The average number of requests per evaluated batch."""
+        return self.n_requests / self.n_batches if self.n_batches else 0.0
+
+
+class InProcessClient(object):
+    # Client of an evaluation service running in the same event loop.
+
+    def __init__(self, service):
+        self.service = service
+
+
+    async def evaluate(self, name, **inputs):
+        return await self.service.evaluate(name, **inputs)
+
+
+    async def evaluate_many(self, name, requests):
+        """Send many requests concurrently, returning their results in order."""
+        return await asyncio.gather(*[self.service.evaluate(name, **inputs) for inputs in requests])
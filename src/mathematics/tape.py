@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+from .autodiff import Node, PlaceholderOp
+from .precision import cast, compute_dtype
+from .topology import find_topo_sort
+from .scheduler import dependency_waves
+
+
+def _si_magnitude(value):
+    # Magnitude of a quantity in SI units (i.e. without prefix), other values are returned unchanged.
+    if not hasattr(value, "unit"):
+        return value
+    factor = value.unit.prefix.factor
+    return value.value * factor if factor != 1 else value.value
+
+
+def _stripped(node):
+    # Stand-in for a node in unit-free replays: its attributes (e.g. const_attr) as SI magnitudes.
+    return SimpleNamespace(**{key: _si_magnitude(item) for key, item in vars(node).items() if key not in ("_value", "inputs", "op")})
+
+
+class Tape(object):
+    # Recorded evaluation order of a graph, replayed on new values of its variables.
+
+    def __init__(self, outputs, strip_units=False):
+        """
+        Parameters
+        ----------
+        outputs: List[Node]
+            The nodes to record, together with everything they depend on.
+            The gradient nodes returned by gradients() can be recorded as well,
+            so that replaying the tape also replays the backward pass.
+            Values that are not nodes (e.g. the 0.0 gradient of an unreached
+            variable) are kept as constants.
+        strip_units: bool, optional
+            Replay on plain magnitudes, without unit objects. (Default is False)
+            The dimensional analysis is done once, when the graph is traced, and
+            the unit of every node (gradients included) is recorded in self.units.
+            The tape then keeps its own buffers of SI magnitudes and the nodes are
+            left untouched by replays.
+        """
+        self.outputs = list(outputs)
+        self.nodes = find_topo_sort([output for output in self.outputs if isinstance(output, Node)])
+        self.inputs = [node for node in self.nodes if isinstance(node.op, PlaceholderOp)]
+
+        # Subgraphs without variables are folded: their values are kept, not recomputed.
+        varying = {id(node) for node in self.inputs}
+        self.operations = []
+        for node in self.nodes:
+            if any(id(input_node) in varying for input_node in node.inputs):
+                varying.add(id(node))
+                self.operations.append(node)
+
+        self.strip_units = strip_units
+        if strip_units:
+            self.units = {id(node): getattr(node.value, "unit", None) for node in self.nodes}
+            self.values = {id(node): _si_magnitude(node.value) for node in self.nodes}
+            self.stripped = {id(node): _stripped(node) for node in self.operations}
+
+
+    @property
+    def output_units(self):
+        """The recorded units of the outputs, None for plain values (only with strip_units)."""
+        return [self.units[id(output)] if isinstance(output, Node) else getattr(output, "unit", None) for output in self.outputs]
+
+
+    def replay(self, feed_dict=None, scheduler=None):
+        """
+        Evaluate the recorded graph again, without rebuilding it.
+
+        Parameters
+        ----------
+        feed_dict: Dict[Node, Value], optional
+            New values of the input nodes; the other inputs keep their current value.
+            With strip_units, a value is either a Quantity or a plain magnitude
+            expressed in the recorded unit of the input.
+        scheduler: ThreadScheduler, optional
+            Compute independent nodes concurrently. (Default is sequential)
+
+        Returns
+        -------
+        values: List[Value]
+            The new values of the output nodes. With strip_units, plain magnitudes
+            expressed in the recorded units of the outputs (see output_units).
+        """
+        if feed_dict:
+            inputs = {id(node) for node in self.inputs}
+            for node, value in feed_dict.items():
+                if id(node) not in inputs:
+                    raise ValueError(f"{node.name} is not an input of the tape.")
+                self._feed(node, value)
+
+        if scheduler is None:
+            for node in self.operations:
+                self._store(node, self._compute(node))
+        else:
+            for wave in dependency_waves(self.operations, lambda node: node.inputs):
+                values = scheduler.map(self._compute, wave)
+                for node, value in zip(wave, values):
+                    self._store(node, value)
+
+        return [self._output(output) for output in self.outputs]
+
+
+    def _compute(self, node):
+        if self.strip_units:
+            return node.op.compute(self.stripped[id(node)], [self.values[id(input_node)] for input_node in node.inputs])
+        return node.op.compute(node, [input_node.value for input_node in node.inputs])
+
+
+    def _store(self, node, value):
+        if self.strip_units:
+            # As node values, the magnitudes keep the precision policy the graph was built with
+            self.values[id(node)] = cast(value, compute_dtype(node.dtypes))
+        else:
+            node.value = value
+
+
+    def _feed(self, node, value):
+        if not self.strip_units:
+            node.value = value
+            return
+
+        unit = self.units[id(node)]
+        if hasattr(value, "unit"):
+            if unit is None or not value.unit.base == unit.base:
+                raise TypeError(f"Unsupported unit '{value.unit}' for the input {node.name} of unit '{unit}'")
+            value = _si_magnitude(value)
+        elif unit is not None and unit.prefix.factor != 1:
+            value = value * unit.prefix.factor
+        self.values[id(node)] = cast(value, compute_dtype(node.dtypes))
+
+
+    def _output(self, output):
+        if not isinstance(output, Node):
+            return output.value if self.strip_units and hasattr(output, "unit") else output
+        if not self.strip_units:
+            return output.value
+
+        value, unit = self.values[id(output)], self.units[id(output)]
+        if unit is not None and unit.prefix.factor != 1:
+            return value / unit.prefix.factor
+        return value
@@ -0,0 +1,74 @@
+from math import factorial
+
+from .topology import find_topo_sort
+from .autodiff import Node, NodeDict
+from . import series
+
+
+def taylor_series(output_node, variable, order, direction=1.0):
+    """Compute the Taylor series of the output node along a single input variable.
+
+    Univariate Taylor-mode differentiation: the series t -> variable.value + direction * t
+    is propagated forward through every op of the graph, so that k coefficients cost
+    O(k^2) work per op instead of the exponential cost of nesting reverse mode k times.
+
+    Parameters
+    ----------
+    output_node: Node
+        The node to expand.
+    variable: Node
+        The input node along which the expansion is performed.
+    order: int
+        The highest order of the expansion.
+    direction: Value
+        The first order coefficient of the variable. (Default is 1.0)
+
+    Returns
+    -------
+    coefficients: List[Value]
+        The normalized Taylor coefficients [c_0, ..., c_order] of the output node,
+        that is c_k = (d^k output / dt^k) / k!.
+    """
+    if not isinstance(output_node, Node):
+        raise ValueError("output_node must be a Node object.")
+    if order < 0:
+        raise ValueError("order must be a non-negative integer.")
+
+    coefficients = NodeDict()
+    # Nodes that depend on the variable, all the others have a constant expansion.
+    dependent = set()
+
+    for node in find_topo_sort([output_node]):
+        if node is variable:
+            coefficients[node] = [node.value, direction][:order + 1] + [0.0] * (order - 1)
+            dependent.add(node)
+        elif any(input_node in dependent for input_node in node.inputs):
+            coefficients[node] = node.op.taylor(node, [coefficients[input_node] for input_node in node.inputs])
+            dependent.add(node)
+        else:
+            coefficients[node] = series.constant(node.value, order)
+
+    return coefficients[output_node]
+
+
+def taylor_derivatives(output_node, variable, order, direction=1.0):
+    """Compute the derivatives [y, y', ..., y^(order)] of the output node with respect to a variable.
+
+    Parameters
+    ----------
+    output_node: Node
+        The node to differentiate.
+    variable: Node
+        The input node with respect to which the derivatives are computed.
+    order: int
+        The highest order of the derivatives.
+    direction: Value
+        The first order coefficient of the variable. (Default is 1.0)
+
+    Returns
+    -------
+    derivatives: List[Value]
+        The derivatives of the output node, from order 0 to order.
+    """
+    coefficients = taylor_series(output_node, variable, order, direction)
+    return [c_k * factorial(k) for k, c_k in enumerate(coefficients)]
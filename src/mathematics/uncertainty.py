@@ -0,0 +1,64 @@
+import numpy as np
+
+from .gradients import gradients
+
+
+def _in_unit(value, unit):
+    # Magnitude of a value expressed in a unit with the same base, plain values are returned unchanged.
+    if not hasattr(value, "unit"):
+        return value
+    if unit is None or value.unit.prefix == unit.prefix:
+        return value.value
+    return value.value * value.unit.prefix.factor / unit.prefix.factor
+
+
+def propagate_uncertainty(output, variables, covariance=None):
+    """
+    Propagate the uncertainty of the variables to an output node by first-order linearization.
+
+    With J the derivatives of the output with respect to the variables, the
+    variance of the output is J C J^T. The derivatives come from a single
+    backward sweep with a unit seed: for an output computed element-wise from
+    its variables (e.g. a measurement model applied to arrays of measurements),
+    this yields the derivatives of every element at once, and for a scalar
+    output the full gradient.
+
+    Parameters
+    ----------
+    output: Node
+        The node whose uncertainty is computed.
+    variables: List[Node]
+        The uncertain inputs.
+    covariance: ndarray, optional
+        The covariance of the variables, of shape (K, K) for K variables, or
+        (..., K, K) with one matrix per element. Entry (j, k) is expressed in the
+        unit of variable j times the unit of variable k.
+        (Default is independent variables, with the variance of their Quantity values)
+
+    Returns
+    -------
+    variance: ndarray
+        The variance of the output, in the unit of the output squared.
+    """
+    unit = getattr(output.value, "unit", None)
+    grads = gradients(output, variables)
+
+    # Derivatives per unit of each variable, expressed in the unit of the output
+    jacobian = []
+    for variable in variables:
+        derivative = getattr(grads[variable], "value", grads[variable])
+        variable_unit = getattr(variable.value, "unit", None)
+        if variable_unit is not None:
+            derivative = derivative * type(variable.value)(1.0, variable_unit)
+        jacobian.append(_in_unit(derivative, unit))
+    shape = np.broadcast_shapes(*[np.shape(derivative) for derivative in jacobian], np.shape(getattr(output.value, "value", output.value)))
+    J = np.stack([np.broadcast_to(derivative, shape) for derivative in jacobian], axis=-1)
+
+    if covariance is None:
+        variances = []
+        for variable in variables:
+            variance = getattr(variable.value, "variance", None)
+            variances.append(np.broadcast_to(0.0 if variance is None else variance, shape))
+        return np.sum(J * J * np.stack(variances, axis=-1), axis=-1)
+
+    return np.einsum("...j,...jk,...k->...", J, np.asarray(covariance, dtype=float), J)
@@ -1,9 +1,13 @@
 from .base_quantity import BaseQuantity
 from .prefix import Prefix
-from .unit import Unit
+from .unit import Unit, conversion_factor, unit_cache_info, clear_unit_cache
 from .quantity import Quantity
+from .quantity_array import QuantityArray
+from . import array_functions
+from .conversion import convert, convert_many, convert_columns, iter_converted, convert_chunked
 from .basis import definitions
 from .units import definitions
+from .unit_parser import parse_unit
 
 from .potential_energy import PotentialEnergy
 from .potentials import *
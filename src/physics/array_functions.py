@@ -0,0 +1,348 @@
+# file    scipp/physics/array_functions.py
+# @author  Lorenzo Liuzzo (lorenzoliuzzo@outlook.com)
+# @brief   This file contains the NumPy ufunc rules and function implementations for Quantity objects.
+# @date    2023-07-22
+# @copyright Copyright (c) 2023
+
+from .unit import Unit, conversion_factor
+from .basis import scalar
+from .units import dimensionless, rad
+from .quantity import Quantity, _UFUNCS, _FUNCTIONS
+from .quantity_array import QuantityArray
+
+import numpy as np
+
+
+# Every ufunc and function runs once on the plain values: the operands are
+# converted to a common unit when the operation requires it, and the unit of
+# the result is attached afterwards.
+
+
+def _unit(x):
+    return x.unit if isinstance(x, Quantity) else None
+
+
+def _value(x):
+    return x.value if isinstance(x, Quantity) else x
+
+
+def _wrap(value, unit):
+    # A Quantity for scalar results, a QuantityArray for arrays, plain values without unit.
+    if unit is None:
+        return value
+    if np.ndim(value) == 0:
+        return Quantity(value, unit)
+    return QuantityArray._wrap(value, unit)
+
+
+def _first_unit(items):
+    for item in items:
+        if isinstance(item, Quantity):
+            return item.unit
+    return None
+
+
+def _in_unit(x, unit, name):
+    """
+    Return the value of an operand expressed in a unit.
+
+    :param x: A Quantity or a plain value, the latter allowed only for dimensionless units.
+    :param unit: The target Unit, or None for plain values.
+    :param name: The name of the operation, for the error messages.
+    :raises TypeError: If the operand has an incompatible base.
+    """
+    if unit is None:
+        return _value(x)
+    if isinstance(x, Quantity):
+        if x.unit.base != unit.base:
+            raise TypeError(f"Unsupported operands for {name}: 'Quantity' of base '{unit.base}' and '{x.unit.base}'")
+        factor = conversion_factor(x.unit, unit)
+        return x.value if factor == 1 else x.value * factor
+    if unit.base != scalar:
+        raise TypeError(f"Unsupported operands for {name}: 'Quantity' of base '{unit.base}' and '{type(x).__name__}'")
+    return x if unit.prefix.factor == 1 else np.asarray(x) / unit.prefix.factor
+
+
+def _si(x, name):
+    # Plain value of a dimensionless operand, without prefix.
+    if isinstance(x, Quantity):
+        if x.unit.base != scalar:
+            raise TypeError(f"Unsupported operand for {name}: 'Quantity' of base '{x.unit.base}'")
+        return x.value if x.unit.prefix.factor == 1 else x.value * x.unit.prefix.factor
+    return x
+
+
+def _store(out, unit, where=None):
+    """
+    Prepare the output buffers of an operation.
+
+    Quantity outputs receive the unit of the result. With a where mask, the
+    elements that are not computed keep their value, so an output of the same
+    base is converted in place to the unit of the result first.
+
+    :return: The tuple of ndarray buffers.
+    :raises TypeError: If a plain ndarray output would drop the unit of the result.
+    """
+    buffers = []
+    for item in out:
+        if isinstance(item, Quantity):
+            if where is not None and unit is not None and item.unit != unit:
+                if item.unit.base != unit.base:
+                    raise TypeError(f"Unsupported output for where: 'Quantity' of base '{item.unit.base}' and '{unit.base}'")
+                item.value *= conversion_factor(item.unit, unit)
+            item.unit = unit if unit is not None else dimensionless
+            buffers.append(item.value)
+        elif unit is not None and unit != dimensionless:
+            raise TypeError(f"Unsupported output: a plain ndarray for a result in '{unit}'")
+        else:
+            buffers.append(item)
+    return tuple(buffers)
+
+
+def _apply(ufunc, values, unit, out=None, **kwargs):
+    # Run the ufunc on the plain values, into the output buffers if any.
+    if out is None:
+        return _wrap(ufunc(*values, **kwargs), unit)
+    out = out if isinstance(out, tuple) else (out,)
+    ufunc(*values, out=_store(out, unit, kwargs.get("where")), **kwargs)
+    return out[0] if len(out) == 1 else out
+
+
+def implements_ufunc(*ufuncs):
+    # Register the unit rule of ufuncs: a function of the operands returning (values, unit).
+    def decorator(rule):
+        for ufunc in ufuncs:
+            _UFUNCS[ufunc] = lambda ufunc, *inputs, out=None, **kwargs: _apply(ufunc, *rule(ufunc, *inputs), out=out, **kwargs)
+        return rule
+    return decorator
+
+
+def implements(*functions):
+    # Register the Quantity implementation of NumPy functions.
+    def decorator(implementation):
+        for function in functions:
+            _FUNCTIONS[function] = implementation
+        return implementation
+    return decorator
+
+
+# The following rules define the unit of the result of every supported ufunc.
+
+@implements_ufunc(np.add, np.subtract, np.maximum, np.minimum, np.fmax, np.fmin, np.hypot,
+                  np.remainder, np.fmod)
+def _same_unit(ufunc, *inputs):
+    unit = _first_unit(inputs)
+    return [_in_unit(x, unit, ufunc.__name__) for x in inputs], unit
+
+
+@implements_ufunc(np.equal, np.not_equal, np.less, np.less_equal, np.greater, np.greater_equal)
+def _comparison(ufunc, *inputs):
+    unit = _first_unit(inputs)
+    return [_in_unit(x, unit, ufunc.__name__) for x in inputs], None
+
+
+@implements_ufunc(np.arctan2)
+def _angle_of(ufunc, y, x):
+    unit = _first_unit((y, x))
+    return [_in_unit(y, unit, "arctan2"), _in_unit(x, unit, "arctan2")], rad
+
+
+@implements_ufunc(np.multiply, np.matmul)
+def _product(ufunc, a, b):
+    unit_a, unit_b = _unit(a), _unit(b)
+    if unit_a is None or unit_b is None:
+        return [_value(a), _value(b)], unit_a or unit_b
+    return [a.value, b.value], unit_a * unit_b
+
+
+@implements_ufunc(np.true_divide)
+def _quotient(ufunc, a, b):
+    unit_a, unit_b = _unit(a), _unit(b)
+    if unit_b is None:
+        return [_value(a), b], unit_a
+    return [_value(a), b.value], (unit_a or dimensionless) / unit_b
+
+
+@implements_ufunc(np.floor_divide)
+def _floor_quotient(ufunc, a, b):
+    # The floor depends on the prefixes, so the operands are first converted:
+    # to the finer of their units for the same base (a pure number), else without prefix.
+    unit_a, unit_b = _unit(a), _unit(b)
+    if unit_a is None or unit_b is None:
+        return _quotient(ufunc, a, b)
+    if unit_a.base == unit_b.base:
+        unit = unit_a if unit_a.prefix.factor <= unit_b.prefix.factor else unit_b
+        return [_in_unit(a, unit, "//"), _in_unit(b, unit, "//")], dimensionless
+    return [a.value * unit_a.prefix.factor, b.value * unit_b.prefix.factor], Unit(unit_a.base / unit_b.base)
+
+
+@implements_ufunc(np.power)
+def _power(ufunc, a, b):
+    exponent = _si(b, "**")
+    if isinstance(a, Quantity) and a.unit.base != scalar:
+        if np.ndim(exponent) != 0:
+            raise TypeError("Unsupported operands for **: 'Quantity' and an array of exponents")
+        return [a.value, exponent], a.unit ** float(exponent)
+    return [_si(a, "**"), exponent], dimensionless if isinstance(a, Quantity) else None
+
+
+@implements_ufunc(np.negative, np.positive, np.absolute, np.fabs, np.rint, np.floor, np.ceil, np.trunc, np.conjugate)
+def _unit_preserving(ufunc, x):
+    return [x.value], x.unit
+
+
+def _power_rule(power):
+    return lambda ufunc, x: ([x.value], x.unit ** power)
+
+implements_ufunc(np.sqrt)(_power_rule(0.5))
+implements_ufunc(np.cbrt)(_power_rule(1 / 3))
+implements_ufunc(np.square)(_power_rule(2))
+implements_ufunc(np.reciprocal)(_power_rule(-1))
+
+
+@implements_ufunc(np.exp, np.expm1, np.exp2, np.log, np.log2, np.log10, np.log1p,
+                  np.sin, np.cos, np.tan, np.sinh, np.cosh, np.tanh)
+def _dimensionless(ufunc, x):
+    return [_si(x, ufunc.__name__)], dimensionless
+
+
+@implements_ufunc(np.arcsin, np.arccos, np.arctan, np.arcsinh, np.arccosh, np.arctanh)
+def _inverse_trigonometric(ufunc, x):
+    return [_si(x, ufunc.__name__)], rad
+
+
+@implements_ufunc(np.isnan, np.isinf, np.isfinite, np.signbit, np.sign)
+def _unitless(ufunc, x):
+    return [x.value], None
+
+
+# The following functions implement the NumPy functions for Quantity objects.
+
+def _call(function, values, unit, out, *args, **kwargs):
+    # Call a NumPy function on plain values, into the buffer of an output Quantity if any.
+    if out is None:
+        return _wrap(function(*values, *args, **kwargs), unit)
+    function(*values, *args, out=_store((out,), unit)[0], **kwargs)
+    return out
+
+
+def _same_unit_function(function):
+    # Reductions and shape manipulations, whose result is in the unit of the input.
+    def implementation(a, *args, out=None, **kwargs):
+        return _call(function, [_value(a)], _unit(a), out, *args, **kwargs)
+    return implementation
+
+
+def _squared_unit_function(function):
+    def implementation(a, *args, out=None, **kwargs):
+        return _call(function, [_value(a)], a.unit ** 2, out, *args, **kwargs)
+    return implementation
+
+
+def _plain_function(function):
+    # Functions returning indices, shapes or counts, which have no unit.
+    def implementation(a, *args, **kwargs):
+        return function(_value(a), *args, **kwargs)
+    return implementation
+
+
+def _joining_function(function):
+    # Functions joining a sequence of arrays, converted to the unit of the first quantity.
+    def implementation(arrays, *args, out=None, **kwargs):
+        unit = _first_unit(arrays)
+        return _call(function, [[_in_unit(x, unit, function.__name__) for x in arrays]], unit, out, *args, **kwargs)
+    return implementation
+
+
+def _product_function(function):
+    # Products of two arrays, whose unit is the product of the units.
+    def implementation(a, b, *args, out=None, **kwargs):
+        unit_a, unit_b = _unit(a), _unit(b)
+        unit = unit_a * unit_b if unit_a is not None and unit_b is not None else unit_a or unit_b
+        return _call(function, [_value(a), _value(b)], unit, out, *args, **kwargs)
+    return implementation
+
+
+for _function in (np.sum, np.nansum, np.mean, np.nanmean, np.average, np.median, np.nanmedian,
+                  np.min, np.amin, np.nanmin, np.max, np.amax, np.nanmax, np.ptp, np.std, np.nanstd,
+                  np.cumsum, np.nancumsum, np.diff, np.sort, np.round, np.around,
+                  np.reshape, np.ravel, np.transpose, np.squeeze, np.expand_dims, np.broadcast_to,
+                  np.moveaxis, np.swapaxes, np.flip, np.roll, np.repeat, np.tile, np.take, np.copy,
+                  np.atleast_1d, np.atleast_2d, np.zeros_like, np.ones_like, np.empty_like, np.linalg.norm):
+    _FUNCTIONS[_function] = _same_unit_function(_function)
+
+for _function in (np.var, np.nanvar):
+    _FUNCTIONS[_function] = _squared_unit_function(_function)
+
+for _function in (np.argmin, np.argmax, np.argsort, np.nonzero, np.flatnonzero, np.count_nonzero,
+                  np.shape, np.ndim, np.size):
+    _FUNCTIONS[_function] = _plain_function(_function)
+
+for _function in (np.concatenate, np.stack, np.hstack, np.vstack, np.dstack, np.column_stack):
+    _FUNCTIONS[_function] = _joining_function(_function)
+
+for _function in (np.dot, np.inner, np.outer, np.cross, np.tensordot, np.kron):
+    _FUNCTIONS[_function] = _product_function(_function)
+
+
+def _prod_function(function):
+    # Products of the elements, whose unit is raised to the number of factors.
+    def implementation(a, axis=None, out=None, **kwargs):
+        shape = np.shape(_value(a))
+        count = int(np.prod(shape if axis is None else [shape[i] for i in np.atleast_1d(axis)]))
+        return _call(function, [_value(a)], a.unit ** count, out, axis=axis, **kwargs)
+    return implementation
+
+for _function in (np.prod, np.nanprod):
+    _FUNCTIONS[_function] = _prod_function(_function)
+
+
+@implements(np.where)
+def _where(condition, *values):
+    if not values:
+        return np.where(_value(condition))
+    unit = _first_unit(values)
+    return _wrap(np.where(_value(condition), *[_in_unit(x, unit, "where") for x in values]), unit)
+
+
+@implements(np.clip)
+def _clip(a, a_min=None, a_max=None, out=None, **kwargs):
+    bounds = [None if bound is None else _in_unit(bound, a.unit, "clip") for bound in (a_min, a_max)]
+    return _call(np.clip, [a.value, *bounds], a.unit, out, **kwargs)
+
+
+@implements(np.full_like)
+def _full_like(a, fill_value, *args, **kwargs):
+    unit = _unit(a) if _unit(a) is not None else _unit(fill_value)
+    return _wrap(np.full_like(_value(a), _in_unit(fill_value, unit, "full_like"), *args, **kwargs), unit)
+
+
+@implements(np.linspace)
+def _linspace(start, stop, *args, **kwargs):
+    unit = _first_unit((start, stop))
+    return _wrap(np.linspace(_in_unit(start, unit, "linspace"), _in_unit(stop, unit, "linspace"), *args, **kwargs), unit)
+
+
+def _close_function(function):
+    # Tolerance comparisons, with the operands and the absolute tolerance in the unit of the first quantity.
+    def implementation(a, b, rtol=1e-05, atol=1e-08, equal_nan=False):
+        unit = _first_unit((a, b))
+        atol = _in_unit(atol, unit, function.__name__) if isinstance(atol, Quantity) else atol
+        return function(_in_unit(a, unit, function.__name__), _in_unit(b, unit, function.__name__), rtol=rtol, atol=atol, equal_nan=equal_nan)
+    return implementation
+
+for _function in (np.isclose, np.allclose):
+    _FUNCTIONS[_function] = _close_function(_function)
+
+
+def _equal_function(function):
+    # Whole-array equality, false for quantities of different bases.
+    def implementation(a1, a2, *args, **kwargs):
+        if isinstance(a1, Quantity) and isinstance(a2, Quantity) and a1.unit.base != a2.unit.base:
+            return False
+        unit = _first_unit((a1, a2))
+        return function(_in_unit(a1, unit, function.__name__), _in_unit(a2, unit, function.__name__), *args, **kwargs)
+    return implementation
+
+for _function in (np.array_equal, np.array_equiv):
+    _FUNCTIONS[_function] = _equal_function(_function)
@@ -1,12 +1,28 @@
+from operator import add, sub
+
+
+# Names of the SI base dimensions, in the order of the dimension vector.
+_BASE_NAMES = ('m', 's', 'kg', 'K', 'A', 'mol', 'cd')
+
+# Registry of the canonical BaseQuantity instances, keyed by dimension vector.
+_registry = {}
+
 
 class BaseQuantity:
 
+    __slots__ = ("dimensions", "_repr")
 
-    def __init__(self, length, time, mass, temperature, electric_current, substance_amount, luminous_intensity):
+
+    def __new__(cls, length, time, mass, temperature, electric_current, substance_amount, luminous_intensity):
         """
         Construct a BaseQuantity object with dimensional information for a physical quantity.
         It uses the SI base units as a reference for each dimension.
 
+        The powers are stored as a fixed tuple, the dimension vector, and every
+        distinct vector is represented by a single shared instance: the arithmetic
+        adds or scales tuples and the equality is an identity check. Powers may be
+        fractional (e.g. the square root of an area).
+
         :param length: Power of length.
         :param time: Power of time.
         :param mass: Power of mass.
@@ -15,23 +31,42 @@ class BaseQuantity:
         :param substance_amount: Power of substance amount.
         :param luminous_intensity: Power of luminous intensity.
         """
-        self.quantity_info = {
-            'm': length,
-            's': time,
-            'kg': mass,
-            'K': temperature,
-            'A': electric_current,
-            'mol': substance_amount,
-            'cd': luminous_intensity
-        }
+        return cls._from_dimensions((length, time, mass, temperature, electric_current, substance_amount, luminous_intensity))
+
+
+    @classmethod
+    def _from_dimensions(cls, dimensions):
+        # Return the canonical instance of a dimension vector.
+        base = _registry.get(dimensions)
+        if base is None:
+            base = object.__new__(cls)
+            object.__setattr__(base, "dimensions", dimensions)
+            object.__setattr__(base, "_repr", "".join(
+                [f"{unit}" if power == 1 else f"{unit}^{power}"
+                for unit, power in zip(_BASE_NAMES, dimensions) if power != 0]
+            ))
+            base = _registry.setdefault(dimensions, base)
+        return base
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BaseQuantity objects are immutable.")
+
+
+    @property
+    def quantity_info(self):
+        # Powers of the base dimensions keyed by their SI unit, kept for compatibility.
+        return dict(zip(_BASE_NAMES, self.dimensions))
+
+
+    def __reduce__(self):
+        # Unpickled base quantities are looked up in the registry again.
+        return (BaseQuantity, self.dimensions)
 
 
     def __repr__(self):
         # Return the string representation of the BaseQuantity.
-        return "".join(
-            [f"{unit}" if power == 1 else f"{unit}^{power}" 
-            for unit, power in self.quantity_info.items() if power != 0]
-        )
+        return self._repr
     
 
     # The following methods implement the arithmetic operations for BaseQuantity objects.
@@ -45,15 +80,7 @@ class BaseQuantity:
         :raises TypeError: If the operand type is not a BaseQuantity.
         """
         if isinstance(other, BaseQuantity):
-            return BaseQuantity(
-                self.quantity_info['m'] + other.quantity_info['m'],
-                self.quantity_info['s'] + other.quantity_info['s'],
-                self.quantity_info['kg'] + other.quantity_info['kg'],
-                self.quantity_info['K'] + other.quantity_info['K'],
-                self.quantity_info['A'] + other.quantity_info['A'],
-                self.quantity_info['mol'] + other.quantity_info['mol'],
-                self.quantity_info['cd'] + other.quantity_info['cd']
-            )
+            return BaseQuantity._from_dimensions(tuple(map(add, self.dimensions, other.dimensions)))
  
         raise TypeError("Unsupported operand type(s) for *: 'BaseQuantity' and '{}'".format(type(other).__name__))
 
@@ -66,15 +93,7 @@ class BaseQuantity:
         :raises TypeError: If the operand type is not a BaseQuantity.
         """
         if isinstance(other, BaseQuantity):
-            return BaseQuantity(
-                self.quantity_info['m'] - other.quantity_info['m'],
-                self.quantity_info['s'] - other.quantity_info['s'],
-                self.quantity_info['kg'] - other.quantity_info['kg'],
-                self.quantity_info['K'] - other.quantity_info['K'],
-                self.quantity_info['A'] - other.quantity_info['A'],
-                self.quantity_info['mol'] - other.quantity_info['mol'],
-                self.quantity_info['cd'] - other.quantity_info['cd']
-            )
+            return BaseQuantity._from_dimensions(tuple(map(sub, self.dimensions, other.dimensions)))
  
         raise TypeError("Unsupported operand type(s) for /: 'BaseQuantity' and '{}'".format(type(other).__name__))
 
@@ -87,19 +106,15 @@ class BaseQuantity:
         :raises TypeError: If the operand type is not an int or a float.
         """
         if isinstance(power, (int, float)):
-                
-            return BaseQuantity(
-                self.quantity_info['m'] * power,
-                self.quantity_info['s'] * power,
-                self.quantity_info['kg'] * power,
-                self.quantity_info['K'] * power,
-                self.quantity_info['A'] * power,
-                self.quantity_info['mol'] * power,
-                self.quantity_info['cd'] * power
-            )
+            return BaseQuantity._from_dimensions(tuple(dimension * power for dimension in self.dimensions))
 
         raise TypeError("Unsupported operand type(s) for **: 'BaseQuantity' and '{}'".format(type(power).__name__))
 
     def __eq__(self, other):
         # Check if two BaseQuantity objects are equal.
-        return self.quantity_info == other.quantity_info
+        if self is other:
+            return True
+        return isinstance(other, BaseQuantity) and self.dimensions == other.dimensions
+
+    def __hash__(self):
+        return hash(self.dimensions)
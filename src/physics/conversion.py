@@ -0,0 +1,114 @@
+# file    scipp/physics/conversion.py
+# @author  Lorenzo Liuzzo (lorenzoliuzzo@outlook.com)
+# @brief   This file contains the bulk unit conversion functions.
+# @date    2023-07-22
+# @copyright Copyright (c) 2023
+
+from .unit import conversion_factor
+
+import numpy as np
+
+
+# Number of elements converted at once by the chunked conversions.
+CHUNK_SIZE = 1 << 16
+
+
+def convert(values, unit, target_unit, out=None):
+    """
+    Convert plain values from a unit to a target unit with a single multiplication.
+
+    :param values: The values, a number or an array-like.
+    :param unit: The Unit of the values.
+    :param target_unit: The Unit to convert to.
+    :param out: An ndarray receiving the converted values, e.g. values itself to convert in place. Defaults to None.
+    :return: The converted values, or out.
+    :raises ValueError: If the units have different bases.
+    """
+    factor = conversion_factor(unit, target_unit)
+    if out is None:
+        return np.multiply(values, factor) if factor != 1 else np.copy(values)
+    return np.multiply(values, factor, out=out)
+
+
+def convert_many(quantities, target_unit, out=None, in_place=False):
+    """
+    Convert many quantities to a target unit.
+
+    The conversion factors come from the cache keyed on unit pairs, so converting
+    many quantities of the same units costs one lookup and one multiplication each.
+
+    :param quantities: A sequence of Quantity objects.
+    :param target_unit: The Unit to convert to, or a sequence with one Unit per quantity.
+    :param out: A sequence of Quantity objects or ndarrays receiving the converted values. Defaults to None.
+    :param in_place: Whether to convert the array-valued quantities in their own buffers. Defaults to False.
+    :return: The list of converted quantities.
+    :raises ValueError: If a quantity cannot be converted to its target unit.
+    """
+    targets = target_unit if isinstance(target_unit, (list, tuple)) else [target_unit] * len(quantities)
+    results = []
+    for i, (quantity, target) in enumerate(zip(quantities, targets)):
+        if out is not None:
+            results.append(quantity.to(target, out=out[i]))
+        elif in_place and isinstance(quantity.value, np.ndarray):
+            results.append(quantity.to(target, out=quantity))
+        else:
+            results.append(quantity.to(target))
+    return results
+
+
+def convert_columns(columns, units, target_units, in_place=False):
+    """
+    Convert the columns of a table, e.g. the arrays read from a file, to target units.
+
+    :param columns: A dict of ndarrays, keyed by column name.
+    :param units: A dict of the Unit of every column.
+    :param target_units: A dict of the Unit to convert every column to; the other columns are left unchanged.
+    :param in_place: Whether to convert the columns in their own buffers. Defaults to False.
+    :return: A dict of the converted columns.
+    :raises ValueError: If a column cannot be converted to its target unit.
+    """
+    converted = dict(columns)
+    for name, target in target_units.items():
+        column = columns[name]
+        converted[name] = convert(column, units[name], target, out=column if in_place else None)
+    return converted
+
+
+def iter_converted(values, unit, target_unit, chunk_size=CHUNK_SIZE):
+    """
+    Iterate over the values converted to a target unit, chunk by chunk along the first axis.
+
+    Only one chunk is converted at a time, so arrays larger than memory
+    (e.g. np.memmap files) can be streamed with a bounded working set.
+
+    :param values: An ndarray, or an iterable of array chunks.
+    :param unit: The Unit of the values.
+    :param target_unit: The Unit to convert to.
+    :param chunk_size: The number of rows per chunk, for ndarray values. Defaults to CHUNK_SIZE.
+    :return: A generator of converted chunks.
+    :raises ValueError: If the units have different bases.
+    """
+    factor = conversion_factor(unit, target_unit)
+    chunks = (values[start:start + chunk_size] for start in range(0, len(values), chunk_size)) if isinstance(values, np.ndarray) else values
+    for chunk in chunks:
+        yield np.multiply(chunk, factor)
+
+
+def convert_chunked(values, unit, target_unit, out=None, chunk_size=CHUNK_SIZE):
+    """
+    Convert a large array chunk by chunk, into a preallocated output.
+
+    :param values: The ndarray to convert, e.g. an np.memmap.
+    :param unit: The Unit of the values.
+    :param target_unit: The Unit to convert to.
+    :param out: The ndarray receiving the converted values, e.g. values itself to convert in place. Defaults to a new array.
+    :param chunk_size: The number of rows per chunk. Defaults to CHUNK_SIZE.
+    :return: out
+    :raises ValueError: If the units have different bases.
+    """
+    factor = conversion_factor(unit, target_unit)
+    if out is None:
+        out = np.empty(np.shape(values), dtype=np.result_type(values, factor))
+    for start in range(0, len(values), chunk_size):
+        np.multiply(values[start:start + chunk_size], factor, out=out[start:start + chunk_size])
+    return out
@@ -38,7 +38,9 @@ class Hamiltonian(object):
         mp      The material point.
         time    The time of the evaluation.
         """
-        kinetic_energy = potential_energy = Quantity(0, U.J)
+        # Two distinct accumulators: the in-place additions must not alias them.
+        kinetic_energy = Quantity(0, U.J)
+        potential_energy = Quantity(0, U.J)
 
         for body in self.pool:
             kinetic_energy += np.dot(body.momentum, body.momentum) / (2 * body.mass)
@@ -45,7 +45,9 @@ class Lagrangian(object):
         #     body.update(time)
 
         # Evaluate the kinetic energy and the potential energy.
-        kinetic_energy = potential_energy = Quantity(0, U.J)
+        # Two distinct accumulators: the in-place additions must not alias them.
+        kinetic_energy = Quantity(0, U.J)
+        potential_energy = Quantity(0, U.J)
 
         for body in self.pool:
             kinetic_energy += 0.5 * body.mass * np.dot(body.velocity, body.velocity)
@@ -1,5 +1,6 @@
 from physics.potential_energy import PotentialEnergy
 from physics.quantity import Quantity
+from mathematics import Node, stop_gradient
 
 import numpy as np
 
@@ -16,7 +17,8 @@ class Elastic(PotentialEnergy):
 class GravitationalPotential:
     def __init__(self, gravitational_constant, reference_position):
         self.gravitational_constant = gravitational_constant
-        self.reference_position = reference_position
+        # A node reused as the reference position is a constant of the potential.
+        self.reference_position = stop_gradient(reference_position) if isinstance(reference_position, Node) else reference_position
 
     def __call__(self, mass, position):
         displacement = position - self.reference_position
@@ -4,6 +4,8 @@
 # date    2023-07-20
 # copyright Copyright (c) 2023
 
+import math
+
 
 prefix_table = {
     'Y': 1e24,  # Yotta
@@ -29,28 +31,83 @@ prefix_table = {
 }
 
 
+# Symbol of every prefix, by power of ten.
+_symbols = {int(round(math.log10(multiplier))): symbol for symbol, multiplier in prefix_table.items()}
+
+# Registries of the canonical Prefix instances, by factor and by power of ten.
+_registry = {}
+_powers = {}
+
+
+def _power_of_ten(factor):
+    # Integer exponent of a factor that is a power of ten up to round-off, None otherwise.
+    if factor <= 0:
+        return None
+    exponent = round(math.log10(factor))
+    if math.isclose(factor, float(f"1e{exponent}"), rel_tol=1e-12):
+        return exponent
+    return None
+
+
 class Prefix:
 
+    __slots__ = ("factor", "exponent", "symbol")
 
-    def __init__(self, factor):
+
+    def __new__(cls, factor):
         """
         Construct a Prefix object with a given factor.
 
+        Prefixes are interned by factor. A factor that is a power of ten is
+        stored with its integer exponent and snapped to the exact decimal value,
+        so that the arithmetic of such prefixes is done on the exponents and
+        e.g. Prefix(1e-3) * Prefix(1e3) is exactly Prefix(1). Other factors
+        (e.g. the foot) fall back to float arithmetic.
+
         :param factor: The factor of the prefix.
         """
-        self.factor = factor
-        for symbol, multiplier in prefix_table.items():
-            if factor == multiplier: 
-                self.symbol = symbol 
-                break
-        else:
-            self.symbol = None
+        prefix = _registry.get(factor)
+        if prefix is None:
+            exponent = _power_of_ten(factor)
+            if exponent is not None:
+                prefix = cls._from_exponent(exponent)
+            else:
+                prefix = object.__new__(cls)
+                object.__setattr__(prefix, "factor", factor)
+                object.__setattr__(prefix, "exponent", None)
+                object.__setattr__(prefix, "symbol", None)
+            prefix = _registry.setdefault(factor, prefix)
+        return prefix
+
+
+    @classmethod
+    def _from_exponent(cls, exponent):
+        # Return the canonical prefix of a power of ten.
+        prefix = _powers.get(exponent)
+        if prefix is None:
+            prefix = object.__new__(cls)
+            object.__setattr__(prefix, "factor", float(f"1e{exponent}"))
+            object.__setattr__(prefix, "exponent", exponent)
+            object.__setattr__(prefix, "symbol", _symbols.get(exponent))
+            prefix = _powers.setdefault(exponent, prefix)
+            _registry.setdefault(prefix.factor, prefix)
+        return prefix
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Prefix objects are immutable.")
+
+
+    def __reduce__(self):
+        # Unpickled prefixes are looked up in the registry again.
+        return (Prefix, (self.factor,))
                 
 
     def __repr__(self):
         # Return the string representation of the Prefix.
         if self.symbol != None:
             return f"[{self.symbol}]"
+        return f"[{self.factor}]"
     
 
     # The following methods implement the arithmetic operations for Prefix objects.
@@ -61,6 +118,8 @@ class Prefix:
         :param other: Another Prefix to multiply with.
         :return: A new Prefix representing the result of multiplication.
         """
+        if self.exponent is not None and other.exponent is not None:
+            return Prefix._from_exponent(self.exponent + other.exponent)
         return Prefix(self.factor * other.factor)
     
     def __truediv__(self, other):
@@ -70,6 +129,8 @@ class Prefix:
         :param other: Another Prefix to divide with.
         :return: A new Prefix representing the result of division.
         """
+        if self.exponent is not None and other.exponent is not None:
+            return Prefix._from_exponent(self.exponent - other.exponent)
         return Prefix(self.factor / other.factor)
     
     def __pow__(self, power):
@@ -79,9 +140,15 @@ class Prefix:
         :param power: The exponent to raise the Prefix to.
         :return: A new Prefix representing the result of exponentiation.
         """
+        if self.exponent is not None and float(self.exponent * power).is_integer():
+            return Prefix._from_exponent(int(self.exponent * power))
         return Prefix(self.factor ** power)
     
     def __eq__(self, other):
         # Check if two Prefix objects are equal.
-        return self.factor == other.factor
-        
\ No newline at end of file
+        if self is other:
+            return True
+        return isinstance(other, Prefix) and self.factor == other.factor
+
+    def __hash__(self):
+        return hash(self.factor)
@@ -4,35 +4,96 @@
 # @date    2023-07-22
 # @copyright Copyright (c) 2023
 
-from .unit import Unit
+from .unit import Unit, conversion_factor
 from .basis import scalar, angle
 from .units import dimensionless, rad
 
 from mathematics import Node
 
+import warnings
+
 import numpy as np
 
 
+# Unit rules of the NumPy ufuncs and implementations of the NumPy functions
+# supported by Quantity objects, registered by the array_functions module.
+_UFUNCS = {}
+_FUNCTIONS = {}
+
+
+def _uncertain(*operands):
+    # Whether any operand carries a variance.
+    return any(getattr(operand, "variance", None) is not None for operand in operands)
+
+
+def _warn_variance(name, operands):
+    # The NumPy ufuncs and functions, and the step functions, only handle the values and the units.
+    if _uncertain(*operands):
+        warnings.warn(f"The variance of the operands is not propagated by {name}; "
+                      "use the arithmetic operators or mathematics.propagate_uncertainty.", stacklevel=3)
+
+
+def _variance(*terms):
+    """
+    Return the first-order variance of a result from its (operand, partial derivative) pairs.
+
+    The operands are independent, except for repeated occurrences of the same
+    object (e.g. q * q), whose derivatives are added up first.
+
+    :return: The variance, or None if no operand has one.
+    """
+    derivatives = {}
+    for operand, derivative in terms:
+        variance = getattr(operand, "variance", None)
+        if variance is not None:
+            _, total = derivatives.get(id(operand), (variance, 0.0))
+            derivatives[id(operand)] = (variance, total + derivative)
+    if not derivatives:
+        return None
+    return sum(derivative * derivative * variance for variance, derivative in derivatives.values())
+
+
 class Quantity:
     # Class representing a physical quantity with a numerical value and a specific unit.
 
+    # Scalar quantities are held by the million: no per-instance __dict__.
+    __slots__ = ("value", "unit", "variance")
+
 
-    def __init__(self, value, unit: Unit = dimensionless):
+    def __init__(self, value, unit: Unit = dimensionless, variance=None):
         """
         Construct a Quantity object with a given numerical value and an associated Unit.
 
+        The value is held as given, not copied: the in-place operators (+=, -=,
+        *=, /= and to(out=...)) update an ndarray value in its own buffer, so
+        they are seen by every holder of that array. Use +q or copy the array
+        to get an independent quantity.
+
         :param value: The numerical value of the quantity.
         :param unit: The Unit object representing the unit of the quantity.
+        :param variance: The variance of the value (in the unit squared), if the quantity is a measurement. Defaults to None.
+            It is propagated to first order by the arithmetic operators, the operands being independent.
         """
         self.value = value
         self.unit = unit
+        self.variance = variance
             
 
     def __repr__(self):
         # Return the string representation of the Quantity.
+        if self.variance is not None:
+            return f"{self.value} ± {self.std} {self.unit}"
         return f"{self.value} {self.unit}"
 
 
+    @property
+    def std(self):
+        """
+        Return the standard deviation of the quantity, or None if it has no variance.
+        """
+        return None if self.variance is None else np.sqrt(self.variance)
+
+
     def __add__(self, other):
         """
         Add a Quantity object or a numeric value to the current Quantity object.
@@ -44,22 +105,26 @@ class Quantity:
         """
 
         if isinstance(other, (int, float)):
-            return Quantity(self.value + other, self.unit)
+            return Quantity(self.value + other, self.unit, self.variance)
 
         elif isinstance(other, Quantity):
             if self.unit.base == other.unit.base:
-                if self.unit.prefix == other.unit.prefix:
-                    return Quantity(self.value + other.value, self.unit)
+                factor = 1 if self.unit.prefix == other.unit.prefix else other.unit.prefix.factor / self.unit.prefix.factor
+                variance = _variance((self, 1), (other, factor)) if _uncertain(self, other) else None
+                if factor == 1:
+                    return Quantity(self.value + other.value, self.unit, variance)
                 else:
-                    return Quantity(self.value + other.value * other.unit.prefix.factor / self.unit.prefix.factor, self.unit)
+                    return Quantity(self.value + other.value * factor, self.unit, variance)
             else:
                 raise TypeError(f"Unsupported operands for +: 'Quantity' of base '{self.unit.base}' and '{other.unit.base}'")
                 
         elif isinstance(other, np.ndarray):
-            if isinstance(other.dtype, Quantity):
-                return Quantity(self.value + other.value, self.unit)
+            if other.dtype == object:
+                # Arrays of quantities are converted once to a single-unit array
+                from .quantity_array import QuantityArray
+                return QuantityArray(other).__radd__(self)
             else:
-                return Quantity(self.value + other, self.unit)
+                return Quantity(self.value + other, self.unit, self.variance)
             
         elif isinstance(other, Node):
             return other + self
@@ -82,15 +147,17 @@ class Quantity:
         """
         if isinstance(other, (int, float)):
             if self.unit.base == scalar:
-                return Quantity(self.value - other, self.unit)
+                return Quantity(self.value - other, self.unit, self.variance)
             else:
                 raise TypeError(f"Unsupported operands for -: 'Quantity' of base ' {self.unit.base}' and '{type(other).__name__}'")
         
         if isinstance(other, Quantity) and self.unit.base == other.unit.base:
-            if self.unit.prefix == other.unit.prefix:
-                return Quantity(self.value - other.value, self.unit)
+            factor = 1 if self.unit.prefix == other.unit.prefix else other.unit.prefix.factor / self.unit.prefix.factor
+            variance = _variance((self, 1), (other, -factor)) if _uncertain(self, other) else None
+            if factor == 1:
+                return Quantity(self.value - other.value, self.unit, variance)
             else:
-                return Quantity(self.value - other.value * other.unit.prefix.factor / self.unit.prefix.factor, self.unit)
+                return Quantity(self.value - other.value * factor, self.unit, variance)
         elif isinstance(other, Node):
             return -other + self
         else:
@@ -107,16 +174,19 @@ class Quantity:
         :raises ValueError: If the operands have incompatible units.
         """
         if isinstance(other, Quantity):
-            return Quantity(self.value * other.value, self.unit * other.unit)
+            variance = _variance((self, other.value), (other, self.value)) if _uncertain(self, other) else None
+            return Quantity(self.value * other.value, self.unit * other.unit, variance)
         
         elif isinstance(other, (int, float)):
-            return Quantity(self.value * other, self.unit)
+            return Quantity(self.value * other, self.unit, _variance((self, other)))
 
         elif isinstance(other, np.ndarray):
-            if isinstance(other.dtype, Quantity):
-                return self * [Quantity(val, unit) for val, unit in other]
+            if other.dtype == object:
+                # Arrays of quantities are converted once to a single-unit array
+                from .quantity_array import QuantityArray
+                return QuantityArray(other).__rmul__(self)
             else:
-                return Quantity(self.value * other, self.unit)
+                return Quantity(self.value * other, self.unit, _variance((self, other)))
             
         elif isinstance(other, Node):
             return other * self
@@ -137,10 +207,11 @@ class Quantity:
         :raises ValueError: If the operands have incompatible types.
         """
         if isinstance(other, Quantity):
-            return Quantity(self.value / other.value, self.unit / other.unit)
+            variance = _variance((self, 1 / other.value), (other, -self.value / other.value ** 2)) if _uncertain(self, other) else None
+            return Quantity(self.value / other.value, self.unit / other.unit, variance)
         
         elif isinstance(other, (int, float)):
-            return Quantity(self.value / other, self.unit)
+            return Quantity(self.value / other, self.unit, _variance((self, 1 / other)))
 
         raise ValueError("Unsupported operands for /: 'Quantity' and '{}'".format(type(other).__name__))     
     
@@ -148,10 +219,12 @@ class Quantity:
     def __rtruediv__(self, other):
 
         if isinstance(other, (int, float)):
-            return Quantity(other / self.value, self.unit ** -1)
+            variance = _variance((self, -other / self.value ** 2)) if _uncertain(self) else None
+            return Quantity(other / self.value, self.unit ** -1, variance)
     
         elif isinstance(other, Quantity):
-            return Quantity(other.value / self.value, other.unit / self.unit)
+            variance = _variance((other, 1 / self.value), (self, -other.value / self.value ** 2)) if _uncertain(self, other) else None
+            return Quantity(other.value / self.value, other.unit / self.unit, variance)
 
         raise ValueError("Unsupported operands for /: '{}' and 'Quantity'".format(type(other).__name__))
     
@@ -165,31 +238,162 @@ class Quantity:
         :raises ValueError: If the operands have incompatible type.
         """
         if isinstance(other, (int, float)):
-            return Quantity(self.value ** other, self.unit ** other)
+            variance = _variance((self, other * self.value ** (other - 1))) if _uncertain(self) else None
+            return Quantity(self.value ** other, self.unit ** other, variance)
         
         elif isinstance(other, Quantity):
-            return Quantity(self.value ** other.value, self.unit ** other.value)
+            value = self.value ** other.value
+            variance = None
+            if _uncertain(self, other):
+                variance = _variance((self, other.value * self.value ** (other.value - 1)), (other, value * np.log(self.value)))
+            return Quantity(value, self.unit ** other.value, variance)
 
         raise TypeError("Unsupported operands for **: 'Quantity' and '{}'".format(type(other).__name__))
     
 
-    def to(self, target_unit: Unit):
+    def _magnitude(self, other, operation):
+        # Magnitude of an operand expressed in the unit of the quantity, plain values only for a scalar base.
+        if isinstance(other, Quantity):
+            if other.unit.base != self.unit.base:
+                raise TypeError(f"Unsupported operands for {operation}: '{type(self).__name__}' of base '{self.unit.base}' and 'Quantity' of base '{other.unit.base}'")
+            factor = conversion_factor(other.unit, self.unit)
+            return other.value if factor == 1 else other.value * factor
+        if self.unit.base != scalar:
+            raise TypeError(f"Unsupported operands for {operation}: '{type(self).__name__}' of base '{self.unit.base}' and '{type(other).__name__}'")
+        return other if self.unit.prefix.factor == 1 else np.asarray(other) / self.unit.prefix.factor
+
+
+    @staticmethod
+    def _fits(buffer, *operands):
+        # Whether the result of an operation can be written into a buffer: a writeable
+        # ndarray of the broadcast shape, whose dtype the result can be cast to.
+        return (isinstance(buffer, np.ndarray) and buffer.flags.writeable
+                and np.broadcast_shapes(*map(np.shape, operands)) == buffer.shape
+                and np.can_cast(np.result_type(*operands), buffer.dtype, "same_kind"))
+
+
+    def _inplace(self, ufunc, magnitude, variance=None):
+        # Update the value with a ufunc, in its own buffer when the result fits in it, and set the new variance.
+        value = self.value
+        if Quantity._fits(value, value, magnitude):
+            ufunc(value, magnitude, out=value)
+        else:
+            self.value = ufunc(value, magnitude)
+        self.variance = variance
+        return self
+
+
+    # The following methods implement the in-place arithmetic operations: the
+    # value buffer is updated after a single unit check, and the unit is
+    # updated for products and quotients. Nodes fall back to a new node.
+
+    def __iadd__(self, other):
+        """
+        Add a Quantity object or a numeric value in place.
+
+        :param other: The Quantity object or numeric value to be added, converted to the unit of the current one.
+        :return: The current Quantity object.
+        :raises TypeError: If the operands have incompatible units.
+        """
+        if isinstance(other, Node):
+            return other + self
+        if isinstance(other, Quantity):
+            magnitude = self._magnitude(other, "+=")
+            variance = _variance((self, 1), (other, conversion_factor(other.unit, self.unit))) if _uncertain(self, other) else None
+            return self._inplace(np.add, magnitude, variance)
+        if not isinstance(other, (int, float, np.number, np.ndarray)):
+            return NotImplemented
+        # As in __add__, numeric values are added to the value as they are
+        return self._inplace(np.add, other, self.variance)
+
+    def __isub__(self, other):
+        """
+        Subtract a Quantity object (or a numeric value, for a scalar base) in place.
+
+        :param other: The Quantity object or numeric value to be subtracted. Quantities are converted to the unit of the current one.
+        :return: The current Quantity object.
+        :raises TypeError: If the operands have incompatible units.
+        """
+        if isinstance(other, Node):
+            return -other + self
+        if isinstance(other, Quantity):
+            magnitude = self._magnitude(other, "-=")
+            variance = _variance((self, 1), (other, -conversion_factor(other.unit, self.unit))) if _uncertain(self, other) else None
+            return self._inplace(np.subtract, magnitude, variance)
+        if not isinstance(other, (int, float, np.number, np.ndarray)):
+            return NotImplemented
+        # As in __sub__, numeric values are subtracted as they are, for a scalar base only
+        if self.unit.base != scalar:
+            raise TypeError(f"Unsupported operands for -=: 'Quantity' of base '{self.unit.base}' and '{type(other).__name__}'")
+        return self._inplace(np.subtract, other, self.variance)
+
+    def __imul__(self, other):
+        """
+        Multiply by a Quantity object or a numeric value in place.
+
+        :param other: The Quantity object or numeric value to multiply by.
+        :return: The current Quantity object, whose unit is the product of the units.
+        """
+        if isinstance(other, Node):
+            return other * self
+        if isinstance(other, Quantity):
+            variance = _variance((self, other.value), (other, self.value)) if _uncertain(self, other) else None
+            self._inplace(np.multiply, other.value, variance)
+            self.unit = self.unit * other.unit
+            return self
+        if not isinstance(other, (int, float, np.number, np.ndarray)):
+            return NotImplemented
+        return self._inplace(np.multiply, other, _variance((self, other)))
+
+    def __itruediv__(self, other):
+        """
+        Divide by a Quantity object or a numeric value in place.
+
+        :param other: The Quantity object or numeric value to divide by.
+        :return: The current Quantity object, whose unit is the quotient of the units.
+        """
+        if isinstance(other, Node):
+            return self / other
+        if isinstance(other, Quantity):
+            variance = _variance((self, 1 / other.value), (other, -self.value / other.value ** 2)) if _uncertain(self, other) else None
+            self._inplace(np.true_divide, other.value, variance)
+            self.unit = self.unit / other.unit
+            return self
+        if not isinstance(other, (int, float, np.number, np.ndarray)):
+            return NotImplemented
+        return self._inplace(np.true_divide, other, _variance((self, 1 / other)))
+
+
+    def to(self, target_unit: Unit, out=None):
         """
         Convert the quantity to the specified target unit.
 
         :param target_unit: The target unit to convert to.
-        :return: A new Quantity object with the converted value and unit.
+        :param out: A Quantity or ndarray receiving the converted values, e.g. the quantity itself to rescale it in place. Defaults to None.
+        :return: A new Quantity object with the converted value and unit, or out.
         :raises ValueError: If the conversion is not possible due to incompatible units.
         """
-        if self.unit.base != target_unit.base:
-            raise ValueError("Incompatible units for conversion.")
-        
-        # Convert the value to the target unit's prefix
-        return Quantity(self.value * self.unit.prefix.factor / target_unit.prefix.factor, target_unit)
+        factor = conversion_factor(self.unit, target_unit)
+        variance = _variance((self, factor))
+        if out is None:
+            # Convert the value to the target unit's prefix
+            return Quantity(self.value * factor, target_unit, variance)
+        if isinstance(out, Quantity):
+            # Scalar or integer values cannot hold the result: they are rebound instead
+            if Quantity._fits(out.value, self.value, factor):
+                np.multiply(self.value, factor, out=out.value)
+            else:
+                out.value = self.value * factor
+            out.unit = target_unit
+            out.variance = variance
+        else:
+            np.multiply(self.value, factor, out=out)
+        return out
 
 
     # Additional arithmetic operations
     def __floordiv__(self, other):
+        _warn_variance("//", (self, other))
         if isinstance(other, Quantity):
             return Quantity(self.value // other.value, self.unit / other.unit)
         elif isinstance(other, (int, float)):
@@ -197,14 +401,17 @@ class Quantity:
         raise ValueError("Unsupported operands for //: 'Quantity' and '{}'".format(type(other).__name__))
 
     def __mod__(self, other):
+        # a % b = a - b * floor(a / b), whose derivatives are 1 and -floor(a / b)
         if isinstance(other, Quantity):
-            return Quantity(self.value % other.value, self.unit)
+            variance = _variance((self, 1), (other, -np.floor(self.value / other.value))) if _uncertain(self, other) else None
+            return Quantity(self.value % other.value, self.unit, variance)
         elif isinstance(other, (int, float)):
-            return Quantity(self.value % other, self.unit)
+            return Quantity(self.value % other, self.unit, self.variance)
         raise ValueError("Unsupported operands for %: 'Quantity' and '{}'".format(type(other).__name__))
 
 
     def __rfloordiv__(self, other):
+        _warn_variance("//", (other, self))
         if isinstance(other, (int, float)):
             return Quantity(other // self.value, self.unit ** -1)
         elif isinstance(other, Quantity):
@@ -213,14 +420,16 @@ class Quantity:
     
     def __rmod__(self, other):
         if isinstance(other, (int, float)):
-            return Quantity(other % self.value, self.unit)
+            variance = _variance((self, -np.floor(other / self.value))) if _uncertain(self) else None
+            return Quantity(other % self.value, self.unit, variance)
         elif isinstance(other, Quantity):
-            return Quantity(other.value % self.value, other.unit)
+            variance = _variance((other, 1), (self, -np.floor(other.value / self.value))) if _uncertain(self, other) else None
+            return Quantity(other.value % self.value, other.unit, variance)
         raise ValueError("Unsupported operands for %: '{}' and 'Quantity'".format(type(other).__name__))
     
 
     def __abs__(self):
-        return Quantity(np.abs(self.value), self.unit)
+        return Quantity(np.abs(self.value), self.unit, self.variance)
     
 
     def __neg__(self):
@@ -228,28 +437,34 @@ class Quantity:
     
 
     def __pos__(self):
-        return self
+        # An independent copy, so that in-place updates of the result do not reach the operand.
+        return Quantity(self.value.copy() if isinstance(self.value, np.ndarray) else self.value, self.unit, self.variance)
     
 
     def __inv__(self):
-        return Quantity(1 / self.value, self.unit ** -1)
+        return Quantity(1 / self.value, self.unit ** -1, _variance((self, -1 / self.value ** 2)) if _uncertain(self) else None)
     
 
+    def _derived_variance(self, derivative):
+        # First-order variance of f(self), from the derivative of f evaluated at the value.
+        return _variance((self, derivative(self.value))) if _uncertain(self) else None
+
+
     def __exp__(self):
         if self.unit.base == scalar:
-            return Quantity(np.exp(self.value), dimensionless)
+            return Quantity(np.exp(self.value), dimensionless, self._derived_variance(np.exp))
         raise TypeError("Unsupported operand for exp: 'Quantity' of base '{}'".format(self.unit.base))
     
 
     def __log__(self):
         if self.unit.base == scalar:
-            return Quantity(np.log(self.value), dimensionless)
+            return Quantity(np.log(self.value), dimensionless, self._derived_variance(lambda x: 1 / x))
         raise TypeError("Unsupported operand for log: 'Quantity' of base '{}'".format(self.unit.base))
 
 
     def __sin__(self):
         if self.unit.base == angle:
-            return Quantity(np.sin(self.value), dimensionless)
+            return Quantity(np.sin(self.value), dimensionless, self._derived_variance(np.cos))
         
         else:        
             raise TypeError("Unsupported operand for sin: 'Quantity' of base '{}'".format(self.unit.base))
@@ -257,7 +472,7 @@ class Quantity:
 
     def __cos__(self):
         if self.unit.base == angle:
-            return Quantity(np.cos(self.value), dimensionless)
+            return Quantity(np.cos(self.value), dimensionless, self._derived_variance(lambda x: -np.sin(x)))
         
         else:        
             raise TypeError("Unsupported operand for sin: 'Quantity' of base '{}'".format(self.unit.base))
@@ -265,7 +480,7 @@ class Quantity:
 
     def __tan__(self):
         if self.unit.base == angle:
-            return Quantity(np.tan(self.value), dimensionless)
+            return Quantity(np.tan(self.value), dimensionless, self._derived_variance(lambda x: 1 / np.cos(x) ** 2))
         raise TypeError("Unsupported operand for tan: 'Quantity' of base '{}'".format(self.unit.base))
 
 
@@ -273,14 +488,14 @@ class Quantity:
         if self.unit.base == scalar:
             if np.isscalar(self.value):  # For scalar values
                 if -1 <= self.value <= 1:  # Check if the value is within the valid range for arcsin
-                    return Quantity(np.arcsin(self.value), rad)
+                    return Quantity(np.arcsin(self.value), rad, self._derived_variance(lambda x: 1 / np.sqrt(1 - x * x)))
                 else:
                     raise ValueError("math domain error: arcsin argument out of range [-1, 1]")
             
             else:  # For array values
                 valid_range = np.logical_and(-1 <= self.value, self.value <= 1)
                 if valid_range.all():  # Check if all elements are within the valid range
-                    return Quantity(np.arcsin(self.value), rad)
+                    return Quantity(np.arcsin(self.value), rad, self._derived_variance(lambda x: 1 / np.sqrt(1 - x * x)))
                 else:
                     raise ValueError("math domain error: arcsin argument out of range [-1, 1]")
                 
@@ -291,14 +506,14 @@ class Quantity:
         if self.unit.base == scalar:
             if np.isscalar(self.value):  # For scalar values
                 if -1 <= self.value <= 1:  # Check if the value is within the valid range for arcsin
-                    return Quantity(np.arccos(self.value), rad)
+                    return Quantity(np.arccos(self.value), rad, self._derived_variance(lambda x: -1 / np.sqrt(1 - x * x)))
                 else:
                     raise ValueError("math domain error: arccos argument out of range [-1, 1]")
             
             else:  # For array values
                 valid_range = np.logical_and(-1 <= self.value, self.value <= 1)
                 if valid_range.all():  # Check if all elements are within the valid range
-                    return Quantity(np.arccos(self.value), rad)
+                    return Quantity(np.arccos(self.value), rad, self._derived_variance(lambda x: -1 / np.sqrt(1 - x * x)))
                 else:
                     raise ValueError("math domain error: arccos argument out of range [-1, 1]")
                 
@@ -307,67 +522,75 @@ class Quantity:
 
     def __atan__(self):
         if self.unit.base == scalar:
-            return Quantity(np.arctan(self.value), rad)
+            return Quantity(np.arctan(self.value), rad, self._derived_variance(lambda x: 1 / (1 + x * x)))
         raise TypeError("Unsupported operand for atan: 'Quantity' of base '{}'".format(self.unit.base))
 
 
     def __sinh__(self):
         if self.unit.base == angle:
-            return Quantity(np.sinh(self.value), dimensionless)
+            return Quantity(np.sinh(self.value), dimensionless, self._derived_variance(np.cosh))
         raise TypeError("Unsupported operand for sinh: 'Quantity' of base '{}'".format(self.unit.base))
     
 
     def __cosh__(self):
         if self.unit.base == angle:
-            return Quantity(np.cosh(self.value), dimensionless)
+            return Quantity(np.cosh(self.value), dimensionless, self._derived_variance(np.sinh))
         raise TypeError("Unsupported operand for cosh: 'Quantity' of base '{}'".format(self.unit.base))
     
 
     def __tanh__(self):
         if self.unit.base == angle:
-            return Quantity(np.tanh(self.value), dimensionless)
+            return Quantity(np.tanh(self.value), dimensionless, self._derived_variance(lambda x: 1 / np.cosh(x) ** 2))
         raise TypeError("Unsupported operand for tanh: 'Quantity' of base '{}'".format(self.unit.base))
     
 
     def __asinh__(self):
-        if self.unit.base == dimensionless:
-            if self.value >= 0:
-                return Quantity(np.log(self.value + np.sqrt(self.value ** 2 + 1)), rad)
-            else:
-                return Quantity(np.log(-self.value + np.sqrt(self.value ** 2 + 1)), rad)
+        if self.unit.base == scalar:
+            factor = self.unit.prefix.factor
+            return Quantity(np.arcsinh(self.value * factor), rad, self._derived_variance(lambda x: factor / np.sqrt(1 + (x * factor) ** 2)))
         raise TypeError("Unsupported operand for asinh: 'Quantity' of base '{}'".format(self.unit.base))
 
     def __acosh__(self):
-        if self.unit.base == dimensionless:
-            if self.value >= 1:
-                return Quantity(np.log(self.value + np.sqrt(self.value ** 2 - 1)), rad)
+        if self.unit.base == scalar:
+            value = self.value * self.unit.prefix.factor
+            if np.all(value >= 1):
+                factor = self.unit.prefix.factor
+                return Quantity(np.arccosh(value), rad, self._derived_variance(lambda x: factor / np.sqrt((x * factor) ** 2 - 1)))
             else:
                 raise ValueError("math domain error")
         raise TypeError("Unsupported operand for acosh: 'Quantity' of base '{}'".format(self.unit.base))
             
 
     def __atanh__(self):
-        if self.unit.base == dimensionless:
-            if abs(self.value) < 1:
-                return Quantity(0.5 * np.log((1 + self.value) / (1 - self.value)), rad)
+        if self.unit.base == scalar:
+            value = self.value * self.unit.prefix.factor
+            if np.all(np.abs(value) < 1):
+                factor = self.unit.prefix.factor
+                return Quantity(np.arctanh(value), rad, self._derived_variance(lambda x: factor / (1 - (x * factor) ** 2)))
             else:
                 raise ValueError("math domain error")
         raise TypeError("Unsupported operand for atanh: 'Quantity' of base '{}'".format(self.unit.base))
    
 
+    # The step functions have no first-order propagation of the variance.
+
     def __round__(self, n=None):
+        _warn_variance("round", (self,))
         return Quantity(round(self.value, n), self.unit)
     
 
     def __floor__(self):
+        _warn_variance("floor", (self,))
         return Quantity(np.floor(self.value), self.unit)
     
 
     def __ceil__(self):
+        _warn_variance("ceil", (self,))
         return Quantity(np.ceil(self.value), self.unit)
     
 
     def __trunc__(self):
+        _warn_variance("trunc", (self,))
         return Quantity(np.trunc(self.value), self.unit)
     
 
@@ -429,38 +652,28 @@ class Quantity:
 
     # Implement the __array_ufunc__ method for compatibility with NumPy
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
-        if ufunc in (np.add, np.subtract, np.multiply, np.true_divide, np.power, np.floor_divide, np.mod):
-            return getattr(self, method)(*inputs, **kwargs)
-        elif ufunc is np.sin:
-            return self.__sin__()
-        elif ufunc is np.cos:
-            return self.__cos__()
-        elif ufunc is np.tan:
-            return self.__tan__()
-        elif ufunc is np.arcsin:
-            return self.__asin__()
-        elif ufunc is np.arccos:
-            return self.__acos__()
-        elif ufunc is np.arctan:
-            return self.__atan__()
-        elif ufunc is np.arcsinh:
-            return self.__asinh__()
-        elif ufunc is np.arccosh:
-            return self.__acosh__()
-        elif ufunc is np.arctanh:
-            return self.__atanh__()
-        return NotImplemented
-    
-
-    def __array_finalize__(self, obj):
-        if obj is None:
-            return
-        self.unit = getattr(obj, 'unit', None)
+        # Ufuncs run once on the values, with the unit rule of the ufunc (see array_functions.py).
+        if method != "__call__" or ufunc not in _UFUNCS:
+            return NotImplemented
+        if any(isinstance(item, Node) for item in inputs):
+            return NotImplemented
+        _warn_variance(f"np.{ufunc.__name__}", inputs)
+        return _UFUNCS[ufunc](ufunc, *inputs, **kwargs)
+
+
+    def __array_function__(self, function, types, args, kwargs):
+        # NumPy functions registered in array_functions.py keep the units, the other
+        # ones keep their default behaviour on the quantities as Python objects.
+        if function in _FUNCTIONS:
+            _warn_variance(f"np.{function.__name__}", args)
+            return _FUNCTIONS[function](*args, **kwargs)
+        return function._implementation(*args, **kwargs)
 
 
     def __getitem__(self, key):
         if np.isscalar(self.value):
             return self.value
         elif isinstance(self.value, np.ndarray):
-            return Quantity(self.value[key], self.unit)
+            variance = self.variance if np.ndim(self.variance) == 0 else self.variance[key]
+            return Quantity(self.value[key], self.unit, variance)
         raise TypeError("Unsupported operand for []: 'Quantity' of base '{}'".format(self.unit.base))
\ No newline at end of file
@@ -0,0 +1,428 @@
+# file    scipp/physics/quantity_array.py
+# @author  Lorenzo Liuzzo (lorenzoliuzzo@outlook.com)
+# @brief   This file contains the implementation of the QuantityArray class.
+# @date    2023-07-22
+# @copyright Copyright (c) 2023
+
+import operator
+
+from .unit import Unit, conversion_factor
+from .units import dimensionless
+from .quantity import Quantity, _FUNCTIONS, _uncertain, _variance, _warn_variance
+
+import numpy as np
+
+
+def _holds_quantities(value):
+    # Whether a value is a (possibly nested) sequence or object array of Quantity objects.
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return False
+    if not isinstance(value, (list, tuple, np.ndarray)) or not np.size(value):
+        return False
+    return isinstance(np.ravel(np.asarray(value, dtype=object))[0], Quantity)
+
+
+class QuantityArray(Quantity):
+    # Class representing an array of physical quantities sharing a single unit.
+
+    __slots__ = ()
+
+
+    def __init__(self, value, unit: Unit = None, variance=None, dtype=None, copy=False):
+        """
+        Construct a QuantityArray object from a numeric buffer and a Unit.
+
+        The values are held in one contiguous ndarray and the unit is stored
+        once for the whole array: the arithmetic checks and combines the units
+        once per operation and then runs on the plain buffer, never per element.
+
+        :param value: An array-like of numbers, a Quantity, or a sequence of Quantity objects.
+        :param unit: The Unit of the values. Defaults to the unit of value if it has one, else dimensionless.
+        :param variance: The variance of the values (in the unit squared). Defaults to None.
+        :param dtype: The dtype of the buffer. Defaults to the dtype inferred by NumPy.
+        :param copy: Whether to copy the buffer. Defaults to False.
+        :raises TypeError: If the quantities have incompatible units.
+        """
+        if isinstance(value, Quantity):
+            unit = unit if unit is not None else value.unit
+            variance = variance if variance is not None else value.variance
+            value = value.value * conversion_factor(value.unit, unit) if value.unit != unit else value.value
+        elif _holds_quantities(value):
+            # Sequences of quantities are converted once, at construction
+            items = np.asarray(value, dtype=object)
+            unit = unit if unit is not None else items.flat[0].unit
+            value = np.array([item.value * conversion_factor(item.unit, unit) for item in items.flat]).reshape(items.shape)
+        unit = unit if unit is not None else dimensionless
+
+        self.value = np.array(value, dtype=dtype, copy=True) if copy else np.asarray(value, dtype=dtype)
+        self.unit = unit
+        self.variance = variance
+
+
+    @classmethod
+    def _wrap(cls, value, unit, variance=None):
+        # Construct a QuantityArray from a buffer without any check.
+        array = object.__new__(cls)
+        array.value = value
+        array.unit = unit
+        array.variance = variance
+        return array
+
+
+    def __repr__(self):
+        # Return the string representation of the QuantityArray.
+        return f"QuantityArray({self.value}, {self.unit})"
+
+
+    # The following properties mirror the ones of the underlying ndarray.
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    @property
+    def size(self):
+        return self.value.size
+
+    @property
+    def dtype(self):
+        return self.value.dtype
+
+    @property
+    def T(self):
+        return self.transpose()
+
+
+    def __len__(self):
+        return len(self.value)
+
+
+    def __iter__(self):
+        for i in range(len(self.value)):
+            yield self[i]
+
+
+    def __getitem__(self, key):
+        """
+        Index the array as its buffer: basic slices are views, fancy indices copies.
+
+        :param key: The index.
+        :return: A Quantity for a single element, a QuantityArray otherwise.
+        """
+        value = self.value[key]
+        variance = self.variance if np.ndim(self.variance) == 0 else self.variance[key]
+        if np.ndim(value) == 0:
+            return Quantity(value, self.unit, variance)
+        return QuantityArray._wrap(value, self.unit, variance)
+
+
+    def __setitem__(self, key, item):
+        self.value[key] = self._magnitude(item, "[]=")
+
+
+    # The following methods implement the arithmetic operations for QuantityArray objects.
+
+    def __add__(self, other):
+        """
+        Add a Quantity, a QuantityArray or (for a dimensionless array) a numeric value.
+
+        :param other: The operand, converted once to the unit of the array.
+        :return: A new QuantityArray in the unit of the current one.
+        :raises TypeError: If the operands have incompatible units.
+        """
+        if not isinstance(other, (Quantity, int, float, np.ndarray, np.number)):
+            return NotImplemented
+        return QuantityArray._wrap(self.value + self._magnitude(other, "+"), self.unit, self._sum_variance(other, 1))
+
+    def __radd__(self, other):
+        if not isinstance(other, (Quantity, int, float, np.ndarray, np.number)):
+            return NotImplemented
+        if isinstance(other, Quantity):
+            factor = conversion_factor(self.unit, other.unit)
+            variance = _variance((other, 1), (self, factor)) if _uncertain(self, other) else None
+            return QuantityArray._wrap(other.value + self.value * factor, other.unit, variance)
+        return QuantityArray._wrap(self._magnitude(other, "+") + self.value, self.unit, self.variance)
+
+
+    def __sub__(self, other):
+        """
+        Subtract a Quantity, a QuantityArray or (for a dimensionless array) a numeric value.
+
+        :param other: The operand, converted once to the unit of the array.
+        :return: A new QuantityArray in the unit of the current one.
+        :raises TypeError: If the operands have incompatible units.
+        """
+        if not isinstance(other, (Quantity, int, float, np.ndarray, np.number)):
+            return NotImplemented
+        return QuantityArray._wrap(self.value - self._magnitude(other, "-"), self.unit, self._sum_variance(other, -1))
+
+    def __rsub__(self, other):
+        if not isinstance(other, (Quantity, int, float, np.ndarray, np.number)):
+            return NotImplemented
+        if isinstance(other, Quantity):
+            factor = conversion_factor(self.unit, other.unit)
+            variance = _variance((other, 1), (self, -factor)) if _uncertain(self, other) else None
+            return QuantityArray._wrap(other.value - self.value * factor, other.unit, variance)
+        return QuantityArray._wrap(self._magnitude(other, "-") - self.value, self.unit, self.variance)
+
+
+    def _sum_variance(self, other, sign):
+        # Variance of the sum (sign 1) or difference (sign -1) with an operand converted to the unit of the array.
+        if not _uncertain(self, other):
+            return None
+        factor = conversion_factor(other.unit, self.unit) if isinstance(other, Quantity) else 0.0
+        return _variance((self, 1), (other, sign * factor))
+
+
+    def __iadd__(self, other):
+        # Unlike scalar quantities, numeric values are only added in place to dimensionless arrays.
+        if isinstance(other, (int, float, np.number, np.ndarray)):
+            return self._inplace(np.add, self._magnitude(other, "+="), self.variance)
+        return Quantity.__iadd__(self, other)
+
+    def __isub__(self, other):
+        if isinstance(other, (int, float, np.number, np.ndarray)):
+            return self._inplace(np.subtract, self._magnitude(other, "-="), self.variance)
+        return Quantity.__isub__(self, other)
+
+
+    def __mul__(self, other):
+        """
+        Multiply by a Quantity, a QuantityArray or a numeric value.
+
+        :param other: The operand.
+        :return: A new QuantityArray whose unit is the product of the units.
+        """
+        if isinstance(other, Quantity):
+            variance = _variance((self, other.value), (other, self.value)) if _uncertain(self, other) else None
+            return QuantityArray._wrap(self.value * other.value, self.unit * other.unit, variance)
+        if isinstance(other, (int, float, np.ndarray, np.number)):
+            return QuantityArray._wrap(self.value * other, self.unit, _variance((self, other)))
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, Quantity):
+            variance = _variance((self, other.value), (other, self.value)) if _uncertain(self, other) else None
+            return QuantityArray._wrap(other.value * self.value, other.unit * self.unit, variance)
+        return self.__mul__(other)
+
+
+    def __truediv__(self, other):
+        """
+        Divide by a Quantity, a QuantityArray or a numeric value.
+
+        :param other: The operand.
+        :return: A new QuantityArray whose unit is the quotient of the units.
+        """
+        if isinstance(other, Quantity):
+            variance = _variance((self, 1 / other.value), (other, -self.value / other.value ** 2)) if _uncertain(self, other) else None
+            return QuantityArray._wrap(self.value / other.value, self.unit / other.unit, variance)
+        if isinstance(other, (int, float, np.ndarray, np.number)):
+            return QuantityArray._wrap(self.value / other, self.unit, _variance((self, 1 / other)) if _uncertain(self) else None)
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        if isinstance(other, Quantity):
+            variance = _variance((other, 1 / self.value), (self, -other.value / self.value ** 2)) if _uncertain(self, other) else None
+            return QuantityArray._wrap(other.value / self.value, other.unit / self.unit, variance)
+        if isinstance(other, (int, float, np.ndarray, np.number)):
+            variance = _variance((self, -other / self.value ** 2)) if _uncertain(self) else None
+            return QuantityArray._wrap(other / self.value, self.unit ** -1, variance)
+        return NotImplemented
+
+
+    def __pow__(self, other):
+        """
+        Raise the array to a numeric power, shared by all the elements.
+
+        :param other: The exponent, a number or a dimensionless scalar Quantity.
+        :return: A new QuantityArray whose unit is the unit raised to the power.
+        :raises TypeError: If the exponent is not a scalar.
+        """
+        if isinstance(other, Quantity):
+            other = other.value * other.unit.prefix.factor
+        if np.ndim(other) != 0:
+            raise TypeError("Unsupported operands for **: 'QuantityArray' and an array of exponents")
+        variance = _variance((self, other * self.value ** (other - 1))) if _uncertain(self) else None
+        return QuantityArray._wrap(self.value ** other, self.unit ** float(other), variance)
+
+
+    def __neg__(self):
+        return QuantityArray._wrap(-self.value, self.unit, self.variance)
+
+    def __pos__(self):
+        return QuantityArray._wrap(self.value.copy(), self.unit, self.variance)
+
+    def __abs__(self):
+        return QuantityArray._wrap(np.abs(self.value), self.unit, self.variance)
+
+
+    # Comparisons return boolean arrays, the operands being converted to the unit of the array.
+
+    def _compare(self, other, comparison, symbol):
+        if not isinstance(other, (Quantity, int, float, np.ndarray, np.number)):
+            return NotImplemented
+        return comparison(self.value, self._magnitude(other, symbol))
+
+    def __eq__(self, other):
+        if isinstance(other, Quantity) and other.unit.base != self.unit.base:
+            return np.zeros(self.shape, dtype=bool)
+        return self._compare(other, operator.eq, "==")
+
+    def __ne__(self, other):
+        if isinstance(other, Quantity) and other.unit.base != self.unit.base:
+            return np.ones(self.shape, dtype=bool)
+        return self._compare(other, operator.ne, "!=")
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt, "<")
+
+    def __le__(self, other):
+        return self._compare(other, operator.le, "<=")
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt, ">")
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge, ">=")
+
+    __hash__ = None
+
+
+    def to(self, target_unit: Unit, out=None):
+        """
+        Convert the array to the specified target unit.
+
+        :param target_unit: The target unit to convert to.
+        :param out: A Quantity or ndarray receiving the converted values, e.g. the array itself to rescale it in place. Defaults to None.
+        :return: A new QuantityArray object with the converted values, or out.
+        :raises ValueError: If the conversion is not possible due to incompatible units.
+        """
+        if out is not None:
+            return Quantity.to(self, target_unit, out=out)
+        factor = conversion_factor(self.unit, target_unit)
+        return QuantityArray._wrap(self.value * factor, target_unit, _variance((self, factor)))
+
+
+    # The following methods mirror the ndarray ones, keeping the unit.
+
+    def copy(self):
+        return QuantityArray._wrap(self.value.copy(), self.unit, self.variance)
+
+    def astype(self, dtype):
+        return QuantityArray._wrap(self.value.astype(dtype), self.unit, self.variance)
+
+    def _shaped_variance(self, method, *args):
+        # The variance rearranged as the values, a scalar variance being shared by all the elements.
+        if np.ndim(self.variance) == 0:
+            return self.variance
+        return getattr(np.broadcast_to(self.variance, self.shape), method)(*args)
+
+    def reshape(self, *shape):
+        return QuantityArray._wrap(self.value.reshape(*shape), self.unit, self._shaped_variance("reshape", *shape))
+
+    def ravel(self):
+        return QuantityArray._wrap(self.value.ravel(), self.unit, self._shaped_variance("ravel"))
+
+    def transpose(self, *axes):
+        return QuantityArray._wrap(self.value.transpose(*axes), self.unit, self._shaped_variance("transpose", *axes))
+
+
+    # Reductions run once on the buffer and attach the resulting unit.
+
+    def _reduced(self, value, variance=None):
+        return Quantity(value, self.unit, variance) if np.ndim(value) == 0 else QuantityArray._wrap(value, self.unit, variance)
+
+    def _summed_variance(self, axis, keepdims):
+        # Variance of the sum of independent elements.
+        if self.variance is None:
+            return None
+        return np.broadcast_to(self.variance, self.shape).sum(axis=axis, keepdims=keepdims)
+
+    def sum(self, axis=None, keepdims=False):
+        return self._reduced(self.value.sum(axis=axis, keepdims=keepdims), self._summed_variance(axis, keepdims))
+
+    def mean(self, axis=None, keepdims=False):
+        value = self.value.mean(axis=axis, keepdims=keepdims)
+        variance = self._summed_variance(axis, keepdims)
+        if variance is not None:
+            variance = variance / (self.size / np.size(value)) ** 2
+        return self._reduced(value, variance)
+
+    def _selected_variance(self, indices, axis, keepdims):
+        # Variance of the elements selected along an axis by argmin or argmax.
+        if np.ndim(self.variance) == 0:
+            return self.variance
+        variance = np.broadcast_to(self.variance, self.shape)
+        if axis is None:
+            selected = variance.flat[indices]
+            return np.reshape(selected, (1,) * self.ndim) if keepdims else selected
+        selected = np.take_along_axis(variance, np.expand_dims(indices, axis), axis)
+        return selected if keepdims else np.squeeze(selected, axis)
+
+    def min(self, axis=None, keepdims=False):
+        variance = self._selected_variance(self.value.argmin(axis=axis), axis, keepdims)
+        return self._reduced(self.value.min(axis=axis, keepdims=keepdims), variance)
+
+    def max(self, axis=None, keepdims=False):
+        variance = self._selected_variance(self.value.argmax(axis=axis), axis, keepdims)
+        return self._reduced(self.value.max(axis=axis, keepdims=keepdims), variance)
+
+    # The spread of the elements is np.std(a): a.std is the measurement uncertainty, as for Quantity.
+
+    def var(self, axis=None, ddof=0, keepdims=False):
+        value = self.value.var(axis=axis, ddof=ddof, keepdims=keepdims)
+        return Quantity(value, self.unit ** 2) if np.ndim(value) == 0 else QuantityArray._wrap(value, self.unit ** 2)
+
+    def cumsum(self, axis=None):
+        # Every partial sum has the summed variance of its independent terms.
+        variance = None if self.variance is None else np.broadcast_to(self.variance, self.shape).cumsum(axis=axis)
+        return QuantityArray._wrap(self.value.cumsum(axis=axis), self.unit, variance)
+
+    def prod(self, axis=None, keepdims=False):
+        count = self.size if axis is None else int(np.prod([self.shape[i] for i in np.atleast_1d(axis)]))
+        value = self.value.prod(axis=axis, keepdims=keepdims)
+        return Quantity(value, self.unit ** count) if np.ndim(value) == 0 else QuantityArray._wrap(value, self.unit ** count)
+
+    def argmin(self, axis=None):
+        return self.value.argmin(axis=axis)
+
+    def argmax(self, axis=None):
+        return self.value.argmax(axis=axis)
+
+
+    # The ufuncs and NumPy functions are dispatched by Quantity (see array_functions.py).
+
+    def __array__(self, dtype=None, copy=None):
+        # The plain buffer, without the unit (as float() for scalar quantities).
+        if dtype is None or np.dtype(dtype) == self.value.dtype:
+            return self.value.copy() if copy else self.value
+        if copy is False:
+            raise ValueError(f"Unable to avoid a copy when casting from {self.value.dtype} to {np.dtype(dtype)}.")
+        return self.value.astype(dtype)
+
+
+    def __array_function__(self, function, types, args, kwargs):
+        # Unlike scalar quantities, arrays never fall back to the default implementations:
+        # they would run on the buffers given by __array__ and silently drop the unit.
+        if function not in _FUNCTIONS:
+            return NotImplemented
+        _warn_variance(f"np.{function.__name__}", args)
+        return _FUNCTIONS[function](*args, **kwargs)
+
+
+def _elementwise(method):
+    # The Quantity implementation of a function of mathematics.functions, returning a QuantityArray.
+    def implementation(self):
+        result = method(self)
+        return QuantityArray._wrap(np.asarray(result.value), result.unit, result.variance)
+    implementation.__name__ = method.__name__
+    return implementation
+
+for _name in ("__exp__", "__log__", "__sin__", "__cos__", "__tan__", "__asin__", "__acos__", "__atan__",
+              "__sinh__", "__cosh__", "__tanh__", "__asinh__", "__acosh__", "__atanh__", "__inv__"):
+    setattr(QuantityArray, _name, _elementwise(getattr(Quantity, _name)))
@@ -4,33 +4,73 @@
 # date    2023-07-20
 # copyright Copyright (c) 2023
 
+from functools import lru_cache
+
 from .base_quantity import BaseQuantity
 from .prefix import Prefix
 
 
+# Registry of the canonical Unit instances, keyed by (dimension vector, prefix factor, symbol).
+_registry = {}
+
+# Number of operand pairs remembered by each cache of the unit algebra.
+CACHE_SIZE = 4096
+
+
 class Unit:
 
+    __slots__ = ("base", "prefix", "symbol", "key", "canonical")
 
-    def __init__(self, base, prefix=Prefix(1), symbol=None):
+
+    def __new__(cls, base, prefix=Prefix(1), symbol=None):
         """
-        Construct a Unit object with a BaseQuantity, a Prefix, and a symbol.
+        Return the canonical Unit object with a BaseQuantity, a Prefix, and a symbol.
+
+        Units are interned: every distinct (dimension vector, prefix, symbol) is
+        represented by a single immutable instance, shared by all the quantities.
+        Units that differ only by their symbol (e.g. N and kg*m/s^2, or rad and
+        dimensionless) share the same canonical symbol-less unit, so that their
+        equality is an identity check.
 
         :param base: The BaseQuantity associated with the Unit.
         :param prefix: The Prefix associated with the Unit. Defaults to None.
         :param symbol: The symbol associated with the Unit. Defaults to None.
         :raises TypeError: If the base parameter is not a BaseQuantity.
         """
-        if isinstance(base, BaseQuantity):
-            self.base = base 
-        else:
+        if not isinstance(base, BaseQuantity):
             raise TypeError(f"Unsupported operand type(s) for Unit: '{type(base).__name__}' and 'BaseQuantity'")
-        
-        if isinstance(prefix, Prefix):
-            self.prefix = prefix
-        else:
+        if not isinstance(prefix, Prefix):
             raise TypeError(f"Unsupported operand type(s) for Unit: '{type(prefix).__name__}' and 'Prefix'")
-        
-        self.symbol = symbol if symbol else base.__repr__()
+
+        symbol = symbol if symbol else base.__repr__()
+        key = (base.dimensions, prefix.factor, symbol)
+        unit = _registry.get(key)
+        if unit is None:
+            unit = object.__new__(cls)
+            object.__setattr__(unit, "base", base)
+            object.__setattr__(unit, "prefix", prefix)
+            object.__setattr__(unit, "symbol", symbol)
+            object.__setattr__(unit, "key", key[:2])
+            canonical = unit if symbol == base.__repr__() else Unit(base, prefix)
+            object.__setattr__(unit, "canonical", canonical)
+            unit = _registry.setdefault(key, unit)
+        return unit
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Unit objects are immutable.")
+
+
+    def __reduce__(self):
+        # Unpickled units are looked up in the registry again.
+        return (Unit, (self.base, self.prefix, self.symbol))
+
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
 
     def __repr__(self):
@@ -56,7 +96,7 @@ class Unit:
         :raises TypeError: If the operand type is not a Unit.
         """
         if isinstance(other, Unit):
-            return Unit(self.base * other.base, self.prefix * other.prefix)
+            return _multiply(self, other)
             
         raise TypeError(f"Unsupported operand type(s) for *: 'Unit' and '{type(other).__name__}'")
 
@@ -69,7 +109,7 @@ class Unit:
         :raises TypeError: If the operand type is not a Unit.
         """
         if isinstance(other, Unit):
-            return Unit(self.base / other.base, self.prefix / other.prefix)
+            return _divide(self, other)
             
         raise TypeError(f"Unsupported operand type(s) for /: 'Unit' and '{type(other).__name__}'")
 
@@ -82,7 +122,7 @@ class Unit:
         :raises TypeError: If the operand type is not an int or a float.
         """
         if isinstance(power, (int, float)):
-            return Unit(self.base ** power, self.prefix ** power)
+            return _power(self, power)
             
         raise TypeError(f"Unsupported operand type(s) for **: 'Unit' and '{type(power).__name__}'")
 
@@ -93,5 +133,61 @@ class Unit:
         :param other: Another Unit object to compare with.
         :return: True if both bases and prefixes are equal, False otherwise.
         """
-        return self.base == other.base and self.prefix == other.prefix
+        if not isinstance(other, Unit):
+            return NotImplemented
+        return self.canonical is other.canonical
+
+    def __hash__(self):
+        # Consistent with the equality: units differing only by their symbol hash alike.
+        return hash(self.key)
+
+
+# The following functions memoize the unit algebra. The operands are keyed by
+# their canonical unit, so e.g. N * m and kg*m/s^2 * m share one cache entry.
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _multiply(unit, other):
+    return Unit(unit.base * other.base, unit.prefix * other.prefix)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _divide(unit, other):
+    return Unit(unit.base / other.base, unit.prefix / other.prefix)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _power(unit, power):
+    return Unit(unit.base ** power, unit.prefix ** power)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def conversion_factor(unit, target_unit):
+    """
+    Return the factor converting values in a unit to values in a target unit.
+
+    :param unit: The Unit to convert from.
+    :param target_unit: The Unit to convert to.
+    :return: The factor by which the values are multiplied.
+    :raises ValueError: If the units have different bases.
+    """
+    if unit.base != target_unit.base:
+        raise ValueError("Incompatible units for conversion.")
+    return unit.prefix.factor / target_unit.prefix.factor
+
+
+def unit_cache_info():
+    """
+    Return the hit and miss counters of the unit algebra caches.
+
+    :return: A dict of functools cache statistics, keyed by operation.
+    """
+    return {
+        '*': _multiply.cache_info(),
+        '/': _divide.cache_info(),
+        '**': _power.cache_info(),
+        'to': conversion_factor.cache_info()
+    }
+
 
+def clear_unit_cache():
+    # Empty the unit algebra caches and reset their counters.
+    for function in (_multiply, _divide, _power, conversion_factor):
+        function.cache_clear()
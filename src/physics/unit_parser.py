@@ -0,0 +1,178 @@
+# file    scipp/physics/unit_parser.py
+# @author  Lorenzo Liuzzo (lorenzoliuzzo@outlook.com)
+# @brief   This file contains the parser of unit expressions such as "kg*m/s^2".
+# @date    2023-07-22
+# @copyright Copyright (c) 2023
+
+from functools import lru_cache
+from fractions import Fraction
+import re
+
+from .prefix import Prefix, prefix_table
+from .unit import Unit, CACHE_SIZE
+from .units import definitions
+
+
+# Token kinds, by regex group: 1 power operator, 2 operator or parenthesis, 3 number, 4 symbol, 5 sign.
+_token = re.compile(r"\s*(?:(\*\*|\^)|([*/·()])|(\d+(?:\.\d*)?)|([^\W\d]+)|([-+]))")
+_name = re.compile(r"[^\W\d]+")
+
+
+def _written(unit):
+    # Symbol of a unit as written in expressions: the symbol of the unit preceded by
+    # the symbol of its prefix, e.g. 'km' or 'min'. The mass prefixes apply to the gram.
+    if unit.symbol == "kg":
+        prefix = unit.prefix * Prefix(1e3)
+        return (prefix.symbol or "") + "g"
+    return (unit.prefix.symbol or "") + unit.symbol
+
+
+# Units of the definitions module by written symbol; the symbols that are not a
+# single name (e.g. 'm^2', the symbol of the symbol-less m2) cannot be written.
+_symbols = {}
+for _unit in vars(definitions).values():
+    if isinstance(_unit, Unit) and _name.fullmatch(_written(_unit)):
+        _symbols.setdefault(_written(_unit), _unit)
+
+# Units to which a prefix can be added: the unprefixed ones and the gram, not the kilogram.
+_prefixable = {symbol: unit for symbol, unit in _symbols.items() if unit.prefix.factor == 1 and symbol != "kg"}
+_prefixable["g"] = definitions.g
+
+# Prefix symbols, longest first so that 'da' is tried before 'd'.
+_prefixes = sorted(prefix_table, key=len, reverse=True)
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _token.match(expression, position)
+        if match is None:
+            raise ValueError(f"Invalid character '{expression[position]}' in the unit '{expression}'")
+        kind = match.lastindex
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _symbol(symbol):
+    # Unit of a symbol, either a defined unit or a prefix followed by a prefixable one.
+    unit = _symbols.get(symbol)
+    if unit is not None:
+        return unit
+    for prefix in _prefixes:
+        unit = _prefixable.get(symbol[len(prefix):]) if symbol.startswith(prefix) else None
+        if unit is not None:
+            return Unit(unit.base, Prefix(prefix_table[prefix]) * unit.prefix, unit.symbol)
+    raise ValueError(f"Unknown unit '{symbol}'")
+
+
+class _Parser:
+    # Recursive descent over the tokens of a unit expression:
+    #   product := power (('*' | '·' | '/' | space) power)*
+    #   power   := factor (('^' | '**') exponent)?
+    #   factor  := symbol | '1' | '(' product ')'
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise ValueError(f"Unexpected end of the unit '{self.expression}'")
+        self.position += 1
+        return token
+
+    def error(self, token):
+        return ValueError(f"Unexpected '{token}' in the unit '{self.expression}'")
+
+
+    def parse(self):
+        unit = self.product()
+        if self.peek()[0] is not None:
+            raise self.error(self.peek()[1])
+        return unit
+
+
+    def product(self):
+        unit = self.power()
+        while True:
+            kind, token = self.peek()
+            if token in ('*', '·', '/'):
+                self.position += 1
+                unit = unit / self.power() if token == '/' else unit * self.power()
+            elif kind == 4 or token == '(':
+                # Juxtaposed units, e.g. "N m", are multiplied
+                unit = unit * self.power()
+            else:
+                return unit
+
+
+    def power(self):
+        unit = self.factor()
+        if self.peek()[0] == 1:
+            self.position += 1
+            unit = unit ** self.exponent()
+        return unit
+
+
+    def exponent(self):
+        # A signed number, or a parenthesized fraction such as (1/2) or (-3)
+        kind, token = self.next()
+        if token == '(':
+            value = self.exponent()
+            if self.peek()[1] == '/':
+                self.position += 1
+                value = Fraction(value) / Fraction(self.exponent())
+            if self.next()[1] != ')':
+                raise self.error(self.tokens[self.position - 1][1])
+            value = Fraction(value)
+            return value.numerator if value.denominator == 1 else float(value)
+        if kind == 5:
+            value = self.exponent()
+            return -value if token == '-' else value
+        if kind == 3:
+            return int(token) if token.isdigit() else float(token)
+        raise self.error(token)
+
+
+    def factor(self):
+        kind, token = self.next()
+        if kind == 4:
+            return _symbol(token)
+        if token == '1':
+            return definitions.dimensionless
+        if token == '(':
+            unit = self.product()
+            if self.next()[1] != ')':
+                raise self.error(self.tokens[self.position - 1][1])
+            return unit
+        raise self.error(token)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_unit(expression):
+    """
+    Return the Unit of a unit expression, e.g. "kg*m/s^2", "N/m" or "km/h".
+
+    The expression is made of the units of physics.units.definitions, optionally
+    preceded by a symbol of the prefix_table (e.g. "kN", "ms", or "mg", the mass
+    prefixes applying to the gram and not to the kilogram), combined with
+    products ('*', '·' or a space), quotients ('/'), powers ('^' or '**', with
+    an integer, decimal or parenthesized fractional exponent) and parentheses.
+    The results are memoized, so that parsing a repeated expression costs one
+    cache lookup, and are the interned Unit instances of the unit algebra.
+
+    :param expression: The unit expression.
+    :return: The parsed Unit.
+    :raises ValueError: If the expression is invalid or contains an unknown unit.
+    """
+    return _Parser(expression).parse()
@@ -46,6 +46,13 @@ yd = Unit(basis.length, Prefix(91.44e-2), 'yd')   # yard unit
 mi = Unit(basis.length, Prefix(1609.344e-2), 'mi')    # mile unit
 nmi = Unit(basis.length, Prefix(1852e-2), 'nmi')  # nautical mile unit
 
+g = Unit(basis.mass, Prefix(1e-3))      # gram unit
+mg = Unit(basis.mass, Prefix(1e-6))     # milligram unit
+ug = Unit(basis.mass, Prefix(1e-9))     # microgram unit
+
+minute = Unit(basis.time, Prefix(60), 'min')     # minute unit
+hour = Unit(basis.time, Prefix(3600), 'h')       # hour unit
+
 
 m2 = Unit(basis.area)    # square metre unit
 
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from physics import Quantity, QuantityArray
+from physics import units as U
+
+
+class TestArrayFunctions(unittest.TestCase):
+
+    def setUp(self):
+        self.x = Quantity(np.array([3.0, 4.0, 12.0]), U.m)
+        self.y = Quantity(np.array([1.0, 2.0, 3.0]), U.km)
+
+
+    def test_reductions(self):
+        total = np.sum(self.x)
+        self.assertIsInstance(total, Quantity)
+        self.assertEqual(total.value, 19.0)
+        self.assertEqual(total.unit, U.m)
+        self.assertEqual(np.mean(self.x).unit, U.m)
+        self.assertEqual(np.var(self.x).unit, U.m ** 2)
+        self.assertEqual(np.prod(self.x).unit, U.m ** 3)
+        grid = QuantityArray(np.ones((2, 3, 4)), U.m)
+        self.assertEqual(np.prod(grid, axis=(0, 2)).unit, U.m ** 8)
+        self.assertEqual(np.prod(grid, axis=-1).unit, U.m ** 4)
+        self.assertEqual(grid.prod(axis=(0, 1)).unit, U.m ** 6)
+        self.assertEqual(np.linalg.norm(self.x).value, 13.0)
+        self.assertEqual(np.linalg.norm(self.x).unit, U.m)
+        self.assertEqual(np.argmax(self.x), 2)
+        self.assertEqual(np.shape(self.x), (3,))
+
+
+    def test_joining_and_selection(self):
+        joined = np.concatenate([self.x, self.y])
+        self.assertIsInstance(joined, QuantityArray)
+        np.testing.assert_allclose(joined.value, [3.0, 4.0, 12.0, 1000.0, 2000.0, 3000.0])
+
+        selected = np.where(np.array([True, False, True]), self.x, self.y)
+        self.assertEqual(selected.unit, U.m)
+        np.testing.assert_allclose(selected.value, [3.0, 2000.0, 12.0])
+
+        dot = np.dot(self.x, Quantity(np.ones(3), U.N))
+        self.assertEqual(dot.value, 19.0)
+        self.assertEqual(dot.unit, U.m * U.N)
+        self.assertTrue(np.allclose(self.y, Quantity(np.array([1e3, 2e3, 3e3]), U.m)))
+        with self.assertRaises(TypeError):
+            np.concatenate([self.x, Quantity(np.ones(2), U.s)])
+
+
+    def test_ufuncs(self):
+        self.assertEqual(np.add(self.x, self.y).unit, U.m)
+        np.testing.assert_allclose(np.add(self.x, self.y).value, [1003.0, 2004.0, 3012.0])
+        self.assertEqual(np.multiply(self.x, self.y).unit, U.m * U.km)
+        self.assertEqual(np.sqrt(self.x * self.x).unit, U.m)
+        self.assertEqual(np.hypot(self.x, self.x).unit, U.m)
+        np.testing.assert_array_equal(np.greater(self.y, self.x), [True, True, True])
+        self.assertEqual(np.arctan2(self.x, self.x).unit, U.rad)
+        np.testing.assert_allclose(np.arcsinh(Quantity(np.array([0.0, 1.0]))).value, np.arcsinh([0.0, 1.0]))
+        self.assertAlmostEqual(Quantity(0.5).__atanh__().value, np.arctanh(0.5))
+        with self.assertRaises(TypeError):
+            np.exp(self.x)
+
+        # The floor is taken once both operands are in the same unit
+        ratio = np.floor_divide(QuantityArray([1.5], U.km), Quantity(1.0, U.m))
+        self.assertEqual(ratio.unit, U.dimensionless)
+        np.testing.assert_allclose(ratio.value, [1500.0])
+        np.testing.assert_allclose(np.floor_divide(QuantityArray([3.5], U.km), Quantity(2.0, U.s)).value, [1750.0])
+
+
+    def test_out_and_where(self):
+        out = QuantityArray(np.zeros(3), U.km)
+        result = np.add(self.x, self.x, out=out)
+        self.assertIs(result, out)
+        self.assertEqual(out.unit, U.m)
+        np.testing.assert_allclose(out.value, [6.0, 8.0, 24.0])
+
+        # Elements outside the mask keep their value, converted to the unit of the result
+        out = QuantityArray(np.ones(3), U.km)
+        np.multiply(self.x, 2.0, out=out, where=np.array([True, False, True]))
+        self.assertEqual(out.unit, U.m)
+        np.testing.assert_allclose(out.value, [6.0, 1000.0, 24.0])
+
+        total = QuantityArray(np.zeros(()), U.m)
+        np.sum(self.y, out=total)
+        self.assertEqual(total.unit, U.km)
+        self.assertEqual(float(total.value), 6.0)
+        with self.assertRaises(TypeError):
+            np.add(self.x, self.x, out=np.zeros(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from physics import Quantity, QuantityArray, unit_cache_info
+from physics import convert, convert_many, convert_columns, iter_converted, convert_chunked
+from physics import units as U
+
+
+class TestBulkConversion(unittest.TestCase):
+
+    def test_convert_into_preallocated_output(self):
+        values = np.arange(5.0)
+        out = np.empty(5)
+        self.assertIs(convert(values, U.mm, U.m, out=out), out)
+        np.testing.assert_allclose(out, values * 1e-3)
+        np.testing.assert_allclose(convert(values, U.ft, U.m), values * 0.3048)
+        np.testing.assert_allclose(convert([1.0, 2.0], U.km, U.m), [1000.0, 2000.0])
+        self.assertEqual(convert(2.0, U.km, U.m), 2000.0)
+        with self.assertRaises(ValueError):
+            convert(values, U.m, U.s)
+
+
+    def test_convert_many_reuses_the_cached_factors(self):
+        quantities = [Quantity(np.full(3, float(i)), U.mm) for i in range(10)]
+        convert_many(quantities[:1], U.m)
+        hits = unit_cache_info()["to"].hits
+        converted = convert_many(quantities, U.m)
+        self.assertGreaterEqual(unit_cache_info()["to"].hits - hits, 10)
+        self.assertTrue(all(q.unit == U.m for q in converted))
+        np.testing.assert_allclose(converted[4].value, 4e-3)
+        np.testing.assert_allclose(quantities[4].value, 4.0)
+
+
+    def test_convert_many_in_place_and_per_target(self):
+        a, b = QuantityArray(np.ones(3), U.m), Quantity(np.ones(3), U.km)
+        buffers = a.value, b.value
+        converted = convert_many([a, b], [U.mm, U.m], in_place=True)
+        self.assertIs(converted[0], a)
+        self.assertIs(a.value, buffers[0])
+        self.assertIs(b.value, buffers[1])
+        self.assertEqual(a.unit, U.mm)
+        np.testing.assert_allclose(a.value, 1e3)
+        np.testing.assert_allclose(b.value, 1e3)
+
+        out = [np.empty(3), Quantity(np.empty(3), U.s)]
+        convert_many([a, b], U.km, out=out)
+        np.testing.assert_allclose(out[0], 1e-3)
+        self.assertEqual(out[1].unit, U.km)
+
+
+    def test_convert_columns(self):
+        columns = {"x": np.array([1.0, 2.0]), "t": np.array([0.0, 1.0])}
+        x = columns["x"]
+        converted = convert_columns(columns, {"x": U.ft, "t": U.s}, {"x": U.m}, in_place=True)
+        self.assertIs(converted["x"], x)
+        self.assertIs(converted["t"], columns["t"])
+        np.testing.assert_allclose(x, [0.3048, 0.6096])
+
+
+    def test_chunked_conversion(self):
+        values = np.arange(10.0).reshape(5, 2)
+        chunks = list(iter_converted(values, U.m, U.mm, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        np.testing.assert_allclose(np.concatenate(chunks), values * 1e3)
+
+        out = convert_chunked(values, U.m, U.mm, chunk_size=3)
+        np.testing.assert_allclose(out, values * 1e3)
+        self.assertIs(convert_chunked(values, U.m, U.cm, out=values, chunk_size=2), values)
+        np.testing.assert_allclose(values, np.arange(10.0).reshape(5, 2) * 1e2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from mathematics.fitting import curve_fit
+from mathematics import stop_gradient
+from mathematics.functions import exp
+from physics import Quantity
+from physics import units as U
+
+
+class TestFitting(unittest.TestCase):
+
+    def test_exponential(self):
+        rng = np.random.default_rng(0)
+        t = np.linspace(0.0, 2.0, 200)
+        y = 3.0 * np.exp(-1.5 * t) + 0.01 * rng.standard_normal(200)
+
+        result = curve_fit(lambda x, a, k: a * exp(x * k * -1.0), (t, y), [1.0, 1.0])
+        self.assertTrue(result.converged)
+        np.testing.assert_allclose(result.params, [3.0, 1.5], atol=0.01)
+
+        # Streaming over chunks gives the same fit.
+        chunked = curve_fit(lambda x, a, k: a * exp(x * k * -1.0), (t, y), [1.0, 1.0], chunk_size=64)
+        np.testing.assert_allclose(chunked.params, result.params)
+        np.testing.assert_allclose(chunked.covariance, result.covariance)
+
+
+    def test_stalled_fit_is_not_converged(self):
+        # The gradient of the model points the wrong way, so every step is rejected
+        t = np.linspace(0.0, 1.0, 20)
+        result = curve_fit(lambda x, a: stop_gradient(a * 3.0) - a * 2.0 + x, (t, t + 2.0), [1.0])
+        self.assertFalse(result.converged)
+        self.assertIn("stalled", result.message)
+        self.assertLess(result.n_iter, 100)
+
+
+    def test_spring_constant(self):
+        # Hooke's law F = k (x - l), positions in km and initial rest length in m
+        x = Quantity(np.linspace(1.0, 2.0, 50), U.km)
+        F = Quantity(30.0 * (x.value * 1000.0 - 500.0), U.N)
+
+        def chunks():
+            for start in range(0, 50, 20):
+                yield x[start:start + 20], F[start:start + 20], Quantity(0.1, U.N)
+
+        result = curve_fit(lambda x, k, l: k * (x - l), chunks, [Quantity(10.0, U.N / U.m), Quantity(100.0, U.m)],
+                           absolute_sigma=True)
+        self.assertTrue(result.converged)
+        self.assertEqual(result.n_data, 50)
+        k, l = result.params
+        self.assertAlmostEqual(k.value, 30.0)
+        self.assertAlmostEqual(l.value, 500.0)
+        self.assertEqual(k.unit, U.N / U.m)
+        self.assertEqual(result.errors[1].unit, U.m)
+        self.assertEqual(result.covariance_units[0][1], U.N / U.m * U.m)
+
+
+if __name__ == '__main__':
+    unittest.main()
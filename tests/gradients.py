@@ -1,6 +1,7 @@
 import unittest
-from mathematics import Variable, gradients
-from mathematics.functions import exp
+import numpy as np
+from mathematics import Variable, Constant, Tape, stop_gradient, gradients, multi_gradients
+from mathematics.functions import exp, where
 from physics import Quantity
 from physics import units as U
 
@@ -16,5 +17,97 @@ class TestFunctions(unittest.TestCase):
         self.assertEqual(g[x], 1)
 
 
+    def test_multi_gradients(self):
+        q = Variable("q", 2.0)
+        p = Variable("p", 3.0)
+        kinetic = p * p * 0.5
+        potential = q * q * q
+        lagrangian = kinetic - potential
+        hamiltonian = kinetic + potential
+
+        dL, dH = multi_gradients([lagrangian, hamiltonian], [q, p])
+        self.assertAlmostEqual(dL[q].value, -12.0)
+        self.assertAlmostEqual(dH[q].value, 12.0)
+        self.assertAlmostEqual(dL[p].value, 3.0)
+        self.assertAlmostEqual(dH[p].value, 3.0)
+
+        # Same results as separate backward passes.
+        self.assertAlmostEqual(gradients(lagrangian, [q])[q].value, dL[q].value)
+        self.assertAlmostEqual(gradients(hamiltonian, [p])[p].value, dH[p].value)
+
+
+    def test_multi_gradients_seeds(self):
+        x = Variable("x", np.array([1.0, 2.0]))
+        y = x * x
+        (g,) = multi_gradients([y], [x], seeds=[np.array([1.0, 0.0])])
+        self.assertTrue(np.array_equal(g[x].value, np.array([2.0, 0.0])))
+
+        # Outputs which do not depend on an input get a zero gradient.
+        z = Variable("z", 1.0)
+        g_y, g_z = multi_gradients([y, z * 2.0], [x, z])
+        self.assertEqual(g_y[z], 0.0)
+        self.assertEqual(g_z[x], 0.0)
+
+
+    def test_rmatmul(self):
+        A = np.array([[1.0, 2.0], [3.0, 4.0]])
+        x = Variable("x", np.array([[0.0, 1.0], [1.0, 0.0]]))
+        y = A @ x
+        self.assertTrue(np.array_equal(y.value, A @ x.value))
+
+        # With the seed dY, dx = A^T dY.
+        seed = np.array([[1.0, 0.0], [2.0, 1.0]])
+        (g,) = multi_gradients([y], [x], seeds=[seed])
+        self.assertTrue(np.array_equal(g[x].value, A.T @ seed))
+
+
+    def test_stop_gradient(self):
+        x = Variable("x", 3.0)
+        c = Constant("c", 2.0)
+        y = x * stop_gradient(x) + c * x
+        g = gradients(y, [x, c])
+        self.assertEqual(y.value, 15.0)
+        self.assertAlmostEqual(g[x].value, 5.0)
+        # Constants receive no gradient.
+        self.assertEqual(g[c], 0.0)
+
+
+    def test_where(self):
+        x = Variable("x", np.array([-1.0, 0.5, 2.0]))
+        # Harmonic wall beyond x = 1
+        energy = where(x > 1.0, (x - 1.0) * (x - 1.0), x * 0.0)
+        g = gradients(energy, [x])
+        self.assertTrue(np.array_equal(energy.value, np.array([0.0, 0.0, 1.0])))
+        self.assertTrue(np.array_equal(g[x].value, np.array([0.0, 0.0, 2.0])))
+
+
+    def test_where_lazy(self):
+        x = Variable("x", np.array([0.1, 0.2]))
+        built = []
+
+        def wall():
+            built.append(1)
+            return x * x
+
+        energy = where(x > 1.0, wall, lambda: x * 2.0)
+        self.assertEqual(built, [])
+        self.assertTrue(np.array_equal(energy.value, np.array([0.2, 0.4])))
+        self.assertTrue(np.array_equal(gradients(energy, [x])[x].value, np.array([2.0, 2.0])))
+
+        # Replays that keep the wall unselected work, the others cannot silently use its placeholder
+        for strip_units in (False, True):
+            tape = Tape([energy], strip_units=strip_units)
+            np.testing.assert_allclose(tape.replay({x: np.array([0.3, 0.4])})[0], [0.6, 0.8])
+            with self.assertRaises(ValueError):
+                tape.replay({x: np.array([2.0, 0.4])})
+
+
+    def test_where_quantity(self):
+        x = Variable("x", Quantity(np.array([1.0, 3.0]), U.m))
+        y = where(x > Quantity(2.0, U.m), x, Quantity(np.array([500.0, 500.0]), U.mm))
+        self.assertTrue(np.array_equal(y.value.value, np.array([0.5, 3.0])))
+        self.assertEqual(y.value.unit, U.m)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import numpy as np
+from mathematics import Variable
+from mathematics.autodiff import Node
+from physics import Quantity, QuantityArray
+from physics import units as U
+
+
+class TestInPlaceArithmetic(unittest.TestCase):
+
+    def test_accumulation_reuses_the_buffer(self):
+        total = Quantity(np.zeros(4), U.m)
+        buffer = total.value
+        for i in range(3):
+            total += Quantity(np.full(4, float(i)), U.m)
+        total += Quantity(np.ones(4), U.km)
+        total -= Quantity(np.ones(4), U.cm)
+        self.assertIs(total.value, buffer)
+        np.testing.assert_allclose(total.value, 3.0 + 1000.0 - 0.01)
+        self.assertEqual(total.unit, U.m)
+
+
+    def test_products_update_the_unit(self):
+        x = Quantity(np.array([2.0, 4.0]), U.m)
+        buffer = x.value
+        x *= Quantity(3.0, U.s)
+        x /= 2.0
+        self.assertIs(x.value, buffer)
+        self.assertEqual(x.unit, U.m * U.s)
+        np.testing.assert_allclose(x.value, [3.0, 6.0])
+
+        y = Quantity(2.0, U.m)
+        alias = y
+        y *= Quantity(2.0, U.m)
+        self.assertIs(y, alias)
+        self.assertEqual(y.value, 4.0)
+        self.assertEqual(y.unit, U.m ** 2)
+
+
+    def test_fallbacks(self):
+        # Results that do not fit the buffer (broadcasting, integer casting) are rebound
+        x = Quantity(np.arange(3), U.m)
+        x += Quantity(0.5, U.m)
+        np.testing.assert_allclose(x.value, [0.5, 1.5, 2.5])
+        z = Quantity(1.0, U.m)
+        z += Quantity(np.ones(2), U.m)
+        self.assertEqual(np.shape(z.value), (2,))
+
+        node = Quantity(1.0, U.m)
+        node += Variable("x", Quantity(2.0, U.m))
+        self.assertIsInstance(node, Node)
+        with self.assertRaises(TypeError):
+            z -= Quantity(1.0, U.s)
+        with self.assertRaises(TypeError):
+            QuantityArray(np.ones(2), U.m).__iadd__(1.0)
+
+
+    def test_to_out(self):
+        x = QuantityArray(np.array([1.0, 2.0]), U.km)
+        buffer = x.value
+        self.assertIs(x.to(U.m, out=x), x)
+        self.assertIs(x.value, buffer)
+        self.assertEqual(x.unit, U.m)
+        np.testing.assert_allclose(x.value, [1000.0, 2000.0])
+
+        out = np.empty(2)
+        Quantity(np.array([1.0, 2.0]), U.m).to(U.cm, out=out)
+        np.testing.assert_allclose(out, [100.0, 200.0])
+
+        # Scalar and integer values are rebound rather than written into
+        q = Quantity(1.0, U.km)
+        self.assertIs(q.to(U.m, out=q), q)
+        self.assertEqual(q.value, 1000.0)
+        self.assertEqual(q.unit, U.m)
+        n = Quantity(np.array([1, 2]), U.m)
+        n.to(U.km, out=n)
+        np.testing.assert_allclose(n.value, [1e-3, 2e-3])
+        self.assertEqual(n.unit, U.km)
+
+
+    def test_numbers_match_the_binary_operators(self):
+        q = Quantity(5.0, U.km / U.m)
+        q += 1
+        self.assertEqual(q.value, (Quantity(5.0, U.km / U.m) + 1).value)
+        q -= 1
+        self.assertEqual(q.value, (Quantity(6.0, U.km / U.m) - 1).value)
+        with self.assertRaises(TypeError):
+            length = Quantity(1.0, U.m)
+            length -= 1.0
+
+
+    def test_positive_copies(self):
+        x = np.array([1.0, 2.0])
+        a = Quantity(x, U.m)
+        b = +a
+        b += Quantity(np.ones(2), U.m)
+        np.testing.assert_allclose(x, [1.0, 2.0])
+        np.testing.assert_allclose(b.value, [2.0, 3.0])
+        c = +QuantityArray(x, U.m)
+        c -= Quantity(np.ones(2), U.m)
+        np.testing.assert_allclose(x, [1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
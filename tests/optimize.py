@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from mathematics import Variable
+from mathematics.autodiff import dot_op
+from mathematics.functions import sin
+from mathematics.optimize import Objective, minimize, finite_difference_hessp
+from physics import Quantity
+from physics import units as U
+
+
+def rosenbrock():
+    x = Variable("x", np.array([-1.2]))
+    y = Variable("y", np.array([1.0]))
+    return (1.0 - x) ** 2 + 100.0 * (y - x * x) ** 2, x, y
+
+
+class TestOptimize(unittest.TestCase):
+
+    def test_methods(self):
+        for method, max_iter in (("gradient_descent", 50000), ("lbfgs", 500), ("newton_cg", 500)):
+            f, x, y = rosenbrock()
+            result = minimize(f, [x, y], method=method, max_iter=max_iter, tol=1e-8)
+            self.assertTrue(result.converged, method)
+            # The variables are left at the solution.
+            np.testing.assert_allclose(x.value, [1.0], atol=1e-5)
+            np.testing.assert_allclose(y.value, [1.0], atol=1e-5)
+
+
+    def test_hessp(self):
+        x = Variable("x", np.array([0.3, -0.5]))
+        f = sin(x) * x * 2.0
+        objective = Objective(dot_op(f, f), [x])
+        self.assertIsNotNone(objective.hvp_tape)
+        point, direction = np.array([0.3, -0.5]), np.array([1.0, 2.0])
+        np.testing.assert_allclose(objective.hessp(point, direction),
+                                   finite_difference_hessp(objective, point, direction), rtol=1e-6)
+
+
+    def test_quantity(self):
+        # Equilibrium of a spring: minimum of k (x - l)^2 / 2
+        x = Variable("x", Quantity(np.array([3.0]), U.m))
+        energy = (x - Quantity(1.0, U.m)) ** 2 * Quantity(15.0, U.N / U.m)
+        result = minimize(energy, [x])
+        self.assertTrue(result.converged)
+        np.testing.assert_allclose(x.value.value, [1.0], atol=1e-6)
+        self.assertEqual(x.value.unit, U.m)
+
+
+if __name__ == '__main__':
+    unittest.main()
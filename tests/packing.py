@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from mathematics import Variable, Tape, ParameterVector, gradients
+from physics import Quantity
+from physics import units as U
+
+
+class TestParameterVector(unittest.TestCase):
+
+    def test_layout(self):
+        x = Variable("x", np.array([[1.0, 2.0], [3.0, 4.0]]))
+        y = Variable("y", 5.0)
+        q = Variable("q", Quantity(np.array([6.0, 7.0]), U.m))
+        params = ParameterVector([x, y, q])
+
+        self.assertEqual(len(params), 7)
+        self.assertTrue(np.array_equal(params.buffer, np.arange(1.0, 8.0)))
+        self.assertEqual(params.slice(q), slice(5, 7))
+        self.assertEqual(q.value.unit, U.m)
+
+        # The values of the variables are views into the buffer.
+        params.set(params.buffer * 2.0)
+        self.assertTrue(np.array_equal(x.value, np.array([[2.0, 4.0], [6.0, 8.0]])))
+        self.assertEqual(y.value, 10.0)
+        self.assertTrue(np.array_equal(q.value.value, np.array([12.0, 14.0])))
+
+
+    def test_gradients(self):
+        x = Variable("x", np.array([1.0, 2.0]))
+        y = Variable("y", 3.0)
+        z = Variable("z", np.zeros(2))
+        params = ParameterVector([x, y, z])
+        loss = x * x * y
+
+        packed = params.gradients(loss)
+        self.assertTrue(np.array_equal(packed, [6.0, 12.0, 5.0, 0.0, 0.0]))
+
+        # Gradient descent step on the packed state, replayed through a tape.
+        grads = gradients(loss, [x, y, z])
+        tape = Tape([loss] + [grads[variable] for variable in params.variables])
+        params.set(params.buffer - 0.1 * packed)
+        values = tape.replay()
+        self.assertTrue(np.allclose(params.pack(values[1:]), [2 * 0.4 * 2.5, 2 * 0.8 * 2.5, 0.4 ** 2 + 0.8 ** 2, 0.0, 0.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
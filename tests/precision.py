@@ -0,0 +1,73 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from mathematics import Variable, Tape, gradients, use_precision, get_precision
+from mathematics.functions import exp, sin
+from mathematics.autodiff import norm_op
+from physics import Quantity
+from physics import units as U
+
+
+class TestPrecision(unittest.TestCase):
+
+    def test_float32(self):
+        with use_precision(np.float32):
+            x = Variable("x", np.linspace(0.0, 1.0, 5))
+            y = Variable("y", 2.0)
+            f = sin(x) * y + exp(x) * x
+            g = gradients(f, [x, y])
+            self.assertEqual(x.value.dtype, np.float32)
+            self.assertEqual(np.asarray(y.value).dtype, np.float32)
+            self.assertEqual(f.value.dtype, np.float32)
+            self.assertEqual(g[x].value.dtype, np.float32)
+            self.assertEqual(g[y].value.dtype, np.float32)
+
+            expected = np.cos(x.value) * 2.0 + np.exp(x.value) * (x.value + 1.0)
+            np.testing.assert_allclose(g[x].value, expected, rtol=1e-6)
+
+            tape = Tape([f])
+            value, = tape.replay({x: np.ones(5)})
+            self.assertEqual(value.dtype, np.float32)
+
+        self.assertEqual(get_precision(), (None, None))
+        self.assertEqual(Variable("z", np.ones(2)).value.dtype, np.float64)
+
+
+    def test_policy_is_recorded_on_the_graph(self):
+        with use_precision(np.float32):
+            x = Variable("x", np.linspace(0.0, 1.0, 5))
+            n = Variable("n", np.arange(5))
+            f = sin(x) * 2.0 + x * n
+            self.assertEqual(n.value.dtype, np.arange(5).dtype)
+
+        # Replays and gradients after the policy was reset keep the dtypes of the graph
+        for strip_units in (False, True):
+            value, = Tape([f], strip_units=strip_units).replay({x: np.ones(5)})
+            self.assertEqual(value.dtype, np.float32)
+        self.assertEqual(gradients(f, [x])[x].value.dtype, np.float32)
+
+        # The policy of a thread does not leak into the graphs built by the others
+        with ThreadPoolExecutor(1) as executor, use_precision(np.float32):
+            other = executor.submit(lambda: Variable("z", np.ones(2)).value.dtype).result()
+        self.assertEqual(other, np.float64)
+
+
+    def test_accumulate(self):
+        values = np.full(10000, 0.1, dtype=np.float64)
+        with use_precision(np.float32, accumulate=np.float64):
+            x = Variable("x", values)
+            n = norm_op(x)
+            self.assertEqual(np.asarray(n.value).dtype, np.float32)
+            self.assertAlmostEqual(float(n.value), 10.0, places=5)
+
+
+    def test_quantity(self):
+        with use_precision(np.float32):
+            x = Variable("x", Quantity(np.arange(3), U.m))
+            y = x * 2.0
+            self.assertEqual(y.value.value.dtype, np.float32)
+            self.assertEqual(y.value.unit, U.m)
+
+
+if __name__ == '__main__':
+    unittest.main()
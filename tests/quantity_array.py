@@ -0,0 +1,116 @@
+import unittest
+import numpy as np
+from mathematics.functions import asin, cos, exp
+from physics import Quantity, QuantityArray
+from physics import units as U
+
+
+class TestQuantityArray(unittest.TestCase):
+
+    def setUp(self):
+        self.x = QuantityArray(np.arange(6.0).reshape(2, 3), U.m)
+
+
+    def test_construction(self):
+        a = QuantityArray([Quantity(1.0, U.m), Quantity(2.0, U.km)])
+        self.assertEqual(a.unit, U.m)
+        np.testing.assert_allclose(a.value, [1.0, 2000.0])
+        self.assertEqual(a.dtype, np.float64)
+
+        b = QuantityArray(Quantity(np.array([1.0, 2.0]), U.km), U.m)
+        np.testing.assert_allclose(b.value, [1000.0, 2000.0])
+
+        c = Quantity(2.0, U.s) * np.array([Quantity(1.0, U.m), Quantity(3.0, U.m)], dtype=object)
+        self.assertIsInstance(c, QuantityArray)
+        self.assertEqual(c.unit, U.s * U.m)
+        np.testing.assert_allclose(c.value, [2.0, 6.0])
+
+
+    def test_indexing(self):
+        row = self.x[1]
+        self.assertIsInstance(row, QuantityArray)
+        row[0] = Quantity(1.0, U.km)
+        self.assertEqual(self.x.value[1, 0], 1000.0)
+
+        element = self.x[0, 1]
+        self.assertIsInstance(element, Quantity)
+        self.assertEqual(element.value, 1.0)
+
+        fancy = self.x[:, [0, 2]]
+        fancy[0, 0] = Quantity(5.0, U.m)
+        self.assertEqual(self.x.value[0, 0], 0.0)
+        self.assertEqual(len(list(self.x)), 2)
+
+
+    def test_arithmetic(self):
+        y = self.x + Quantity(1.0, U.km)
+        self.assertEqual(y.unit, U.m)
+        self.assertEqual(y.value[0, 0], 1000.0)
+
+        z = Quantity(1.0, U.km) + self.x
+        self.assertEqual(z.unit, U.km)
+        self.assertAlmostEqual(z.value[1, 2], 1.005)
+
+        v = self.x / Quantity(2.0, U.s)
+        self.assertIsInstance(v, QuantityArray)
+        self.assertEqual(v.unit, U.m / U.s)
+
+        self.assertEqual((self.x ** 2).unit, U.m ** 2)
+        self.assertEqual((2.0 / self.x[:, 1:]).unit, U.m ** -1)
+        np.testing.assert_array_equal(self.x > Quantity(2.5, U.m), [[False, False, False], [True, True, True]])
+        with self.assertRaises(TypeError):
+            self.x + Quantity(1.0, U.s)
+        with self.assertRaises(TypeError):
+            self.x + 1.0
+
+
+    def test_numpy_protocols(self):
+        self.assertIsInstance(np.sqrt(self.x * self.x), QuantityArray)
+        self.assertEqual(np.sqrt(self.x * self.x).unit, U.m)
+        self.assertEqual((np.ones(3) * self.x).unit, U.m)
+
+        total = np.sum(self.x)
+        self.assertIsInstance(total, Quantity)
+        self.assertEqual(total.value, 15.0)
+        np.testing.assert_allclose(np.mean(self.x, axis=0).value, [1.5, 2.5, 3.5])
+        self.assertEqual(self.x.var().unit, U.m ** 2)
+        self.assertEqual(np.std(self.x).unit, U.m)
+        self.assertIsNone(self.x.std)
+        np.testing.assert_allclose(QuantityArray([1.0, 2.0], U.m, np.array([4.0, 9.0])).std, [2.0, 3.0])
+        self.assertEqual(self.x[0, 1:].prod().unit, U.m ** 2)
+
+        joined = np.concatenate([self.x[0], QuantityArray([1.0], U.km)])
+        np.testing.assert_allclose(joined.value, [0.0, 1.0, 2.0, 1000.0])
+        self.assertEqual(np.stack([self.x[0], self.x[1]]).shape, (2, 3))
+        np.testing.assert_allclose(np.cos(QuantityArray([0.0, np.pi], U.rad)).value, [1.0, -1.0])
+
+
+    def test_functions(self):
+        angles = QuantityArray([0.0, np.pi], U.rad)
+        cosine = cos(angles)
+        self.assertIsInstance(cosine, QuantityArray)
+        np.testing.assert_allclose(cosine.value, [1.0, -1.0])
+
+        growth = exp(QuantityArray([0.0, 1.0]))
+        self.assertIsInstance(growth, QuantityArray)
+        self.assertEqual(growth.unit, U.dimensionless)
+        np.testing.assert_allclose(growth.value, [1.0, np.e])
+        self.assertIsInstance(asin(QuantityArray([0.5])), QuantityArray)
+
+        with self.assertRaises(TypeError):
+            exp(self.x)
+
+
+    def test_array_conversion_copies(self):
+        qa = QuantityArray([1.0, 2.5], U.m)
+        copied = np.array(qa, copy=True)
+        copied[0] = 99.0
+        np.testing.assert_allclose(qa.value, [1.0, 2.5])
+        self.assertIs(np.asarray(qa), qa.value)
+        self.assertEqual(np.array(qa, dtype=np.float32).dtype, np.float32)
+        with self.assertRaises(ValueError):
+            np.array(qa, dtype=np.float32, copy=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
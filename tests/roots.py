@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from mathematics.roots import newton
+from mathematics.functions import cos
+
+
+class TestRoots(unittest.TestCase):
+
+    def test_scalar(self):
+        c = np.linspace(1.0, 100.0, 1000)
+        for method in ("newton", "halley"):
+            result = newton(lambda x, c: x * x - c, np.ones_like(c), args=(c,), method=method)
+            self.assertTrue(result.converged.all())
+            np.testing.assert_allclose(result.x, np.sqrt(c))
+
+        # Halley converges in fewer iterations.
+        newton_result = newton(lambda x, c: x * x - c, np.ones_like(c), args=(c,))
+        halley_result = newton(lambda x, c: x * x - c, np.ones_like(c), args=(c,), method="halley")
+        self.assertLess(halley_result.n_iter.max(), newton_result.n_iter.max())
+
+
+    def test_masking(self):
+        # Systems started at their root converge in one iteration, the others keep going
+        M = np.linspace(0.1, 3.0, 8)
+        x0 = np.where(np.arange(8) % 2 == 0, M, 0.0)
+        result = newton(lambda x, M: x - M, x0, args=(M,))
+        self.assertTrue(result.converged.all())
+        self.assertTrue(np.all(result.n_iter[::2] == 1))
+        np.testing.assert_allclose(result.x, M)
+
+
+    def test_stalled_steps_are_not_converged(self):
+        # The residual of the closest float to sqrt(2) is far above the tolerance
+        result = newton(lambda x: 1e20 * (x * x - 2.0), np.array([1.0, 3.0]))
+        self.assertFalse(result.converged.any())
+        self.assertTrue(np.all(np.abs(result.fun) > 1e-10))
+        self.assertTrue(np.all(result.n_iter < 50))
+        np.testing.assert_allclose(result.x, np.sqrt(2.0))
+
+
+    def test_system(self):
+        # Intersection of the circle x^2 + y^2 = r^2 with the curve y = cos(x)
+        r = np.array([1.0, 2.0, 3.0])
+        result = newton(lambda v, r: [v[0] * v[0] + v[1] * v[1] - r * r, v[1] - cos(v[0])],
+                        np.tile([1.0, 0.5], (3, 1)), args=(r,))
+        self.assertTrue(result.converged.all())
+        x, y = result.x[:, 0], result.x[:, 1]
+        np.testing.assert_allclose(x * x + y * y, r * r)
+        np.testing.assert_allclose(y, np.cos(x))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from mathematics import Variable, Tape, GraphCache, gradients, structural_hash
+from mathematics import serialization
+from mathematics.functions import exp, sin
+from physics import Quantity
+from physics import units as U
+
+
+class TestSerialization(unittest.TestCase):
+
+    def test_roundtrip(self):
+        x = Variable("x", np.array([0.5, 1.0, 1.5]))
+        y = Variable("y", 2.0)
+        f = sin(x) * y + exp(y * 0.5)
+        g = gradients(f, [x, y])
+
+        f2, gx2, gy2 = serialization.loads(serialization.dumps([f, g[x], g[y]]))
+        np.testing.assert_array_equal(f2.value, f.value)
+        np.testing.assert_array_equal(gx2.value, g[x].value)
+        np.testing.assert_array_equal(gy2.value, g[y].value)
+        self.assertEqual(f2.name, f.name)
+
+
+    def test_tape_replay(self):
+        x = Variable("x", np.array([[1.0, 2.0], [3.0, 4.0]]))
+        w = Variable("w", np.eye(2))
+        f = x @ w + 1.0
+        tape = serialization.loads(serialization.dumps(Tape([f])))
+        self.assertIsInstance(tape, Tape)
+
+        x2, w2 = tape.inputs
+        self.assertEqual((x2.name, w2.name), ("x", "w"))
+        value, = tape.replay({w2: 2.0 * np.eye(2)})
+        np.testing.assert_array_equal(value, 2.0 * x.value + 1.0)
+
+
+    def test_quantity(self):
+        x = Variable("x", Quantity(2.0, U.m))
+        f = x * Quantity(3.0, U.s)
+        f2, = serialization.loads(serialization.dumps([f]))
+        self.assertEqual(f2.value.value, 6.0)
+        self.assertEqual(f2.value.unit, U.m * U.s)
+
+
+    def test_structural_hash(self):
+        x = Variable("x", 1.0)
+        y = Variable("y", 1.0)
+        a = Variable("x", 5.0)
+        b = Variable("y", -3.0)
+        self.assertEqual(structural_hash([sin(x) * y]), structural_hash([sin(a) * b]))
+        self.assertNotEqual(structural_hash([sin(x) * y]), structural_hash([sin(x) + y]))
+        self.assertNotEqual(structural_hash([x * 2.0]), structural_hash([x * 3.0]))
+
+
+    def test_cache(self):
+        builds = []
+
+        def builder():
+            builds.append(1)
+            x = Variable("x", np.arange(3.0))
+            return Tape([exp(x) * x])
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = GraphCache(directory)
+            self.assertIsNone(cache.get("model"))
+            first = cache.get_or_build("model", builder)
+            second = GraphCache(directory).get_or_build("model", builder)
+            self.assertEqual(len(builds), 1)
+            self.assertTrue(os.path.exists(cache.path("model")))
+            np.testing.assert_array_equal(second.replay()[0], first.replay()[0])
+
+
+    def test_cache_rebuilds_unreadable_entries(self):
+        builds = []
+
+        def builder():
+            builds.append(1)
+            x = Variable("x", np.arange(3.0))
+            return Tape([exp(x) * x])
+
+        data = serialization.dumps(builder())
+        old_version = data[:4] + (serialization.VERSION + 1).to_bytes(2, "little") + data[6:]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = GraphCache(directory)
+            for content in [data[:len(data) // 2], b"foreign file", old_version]:
+                with open(cache.path("model"), "wb") as file:
+                    file.write(content)
+                with self.assertRaises(ValueError):
+                    serialization.load(cache.path("model"))
+                self.assertIsNone(cache.get("model"))
+                graph = cache.get_or_build("model", builder)
+                np.testing.assert_array_equal(graph.replay()[0], np.exp(np.arange(3.0)) * np.arange(3.0))
+                # The bad entry is overwritten
+                self.assertIsNotNone(cache.get("model"))
+            self.assertEqual(len(builds), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
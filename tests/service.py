@@ -0,0 +1,93 @@
+import asyncio
+import time
+import unittest
+import numpy as np
+from mathematics import CompiledExpression, EvaluationService, InProcessClient, exp
+from physics import Quantity
+from physics import units as U
+
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        # Energy of a damped spring, element-wise in the stacked requests
+        self.expression = CompiledExpression(lambda x, k: 0.5 * k * x * x + exp(-x), {"x": 1.0, "k": 2.0})
+        self.requests = [{"x": 0.1 * i, "k": 1.0 + i} for i in range(50)]
+
+
+    def test_batched_results(self):
+        service = EvaluationService(max_batch_size=16, max_delay=0.01)
+        service.register("spring", self.expression)
+        results = asyncio.run(InProcessClient(service).evaluate_many("spring", self.requests))
+
+        for inputs, (value, grads) in zip(self.requests, results):
+            x, k = inputs["x"], inputs["k"]
+            self.assertAlmostEqual(value, 0.5 * k * x * x + np.exp(-x))
+            self.assertAlmostEqual(grads["x"], k * x - np.exp(-x))
+            self.assertAlmostEqual(grads["k"], 0.5 * x * x)
+        self.assertEqual(service.n_requests, 50)
+        self.assertEqual(service.n_batches, 4)
+
+
+    def test_delay_flushes_partial_batches(self):
+        service = EvaluationService(max_batch_size=1000, max_delay=0.001)
+        service.register("spring", self.expression)
+        client = InProcessClient(service)
+
+        async def requests():
+            first = await client.evaluate_many("spring", self.requests[:5])
+            second = await client.evaluate("spring", **self.requests[5])
+            return first, second
+
+        first, second = asyncio.run(requests())
+        self.assertEqual(service.n_batches, 2)
+        self.assertAlmostEqual(second[0], 0.5 * 6.0 * 0.25 + np.exp(-0.5))
+
+
+    def test_event_loop_runs_during_a_batch(self):
+        expression = self.expression
+
+        class SlowExpression(object):
+            check = staticmethod(expression.check)
+
+            def __call__(self, batch, scheduler=None):
+                time.sleep(0.2)
+                return expression(batch, scheduler)
+
+        service = EvaluationService(max_delay=0.0)
+        service.register("spring", SlowExpression())
+
+        async def requests():
+            ticks = 0
+            evaluation = asyncio.ensure_future(service.evaluate("spring", **self.requests[1]))
+            while not evaluation.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return ticks, await evaluation
+
+        ticks, (value, _) = asyncio.run(requests())
+        self.assertGreater(ticks, 5)
+        self.assertAlmostEqual(value, 0.5 * 2.0 * 0.01 + np.exp(-0.1))
+
+
+    def test_units(self):
+        expression = CompiledExpression(lambda x, k: 0.5 * k * x * x, {"x": Quantity(1.0, U.m), "k": Quantity(2.0, U.N / U.m)}, wrt=["x"])
+        service = EvaluationService()
+        service.register("spring", expression)
+        value, grads = asyncio.run(service.evaluate("spring", x=Quantity(200.0, U.cm), k=Quantity(3.0, U.N / U.m)))
+        self.assertTrue(value.unit.base == U.J.base)
+        self.assertAlmostEqual(value.value * value.unit.prefix.factor, 6.0)
+        self.assertAlmostEqual(grads["x"].value * grads["x"].unit.prefix.factor, 6.0)
+
+
+    def test_invalid_inputs(self):
+        service = EvaluationService()
+        service.register("spring", self.expression)
+        with self.assertRaises(ValueError):
+            asyncio.run(service.evaluate("spring", x=np.ones(3), k=1.0))
+        with self.assertRaises(ValueError):
+            asyncio.run(service.evaluate("spring", x=1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import numpy as np
+from mathematics import Variable, Constant, Tape, ThreadScheduler, gradients, multi_gradients
+from mathematics.functions import exp, sin
+from physics import Quantity
+from physics import units as U
+
+
+def wide_graph(x, y):
+    # Independent terms, each depending on both variables
+    terms = [sin(x * float(k)) * y + exp(y * 0.1 * k) * x for k in range(1, 9)]
+    total = terms[0]
+    for term in terms[1:]:
+        total = total + term
+    return total
+
+
+class TestTape(unittest.TestCase):
+
+    def test_parallel_gradients(self):
+        x = Variable("x", np.linspace(0.0, 1.0, 1000))
+        y = Variable("y", np.linspace(1.0, 2.0, 1000))
+        f = wide_graph(x, y)
+
+        sequential = gradients(f, [x, y])
+        with ThreadScheduler(max_workers=4) as scheduler:
+            parallel = gradients(f, [x, y], scheduler=scheduler)
+            dL, dH = multi_gradients([f, f * 2.0], [x, y], scheduler=scheduler)
+
+        for node in (x, y):
+            np.testing.assert_array_equal(parallel[node].value, sequential[node].value)
+            np.testing.assert_array_equal(dL[node].value, sequential[node].value)
+            np.testing.assert_allclose(dH[node].value, 2.0 * sequential[node].value)
+
+
+    def test_replay(self):
+        x = Variable("x", np.array([0.5, 1.0]))
+        y = Variable("y", np.array([2.0, 3.0]))
+        f = wide_graph(x, y)
+        g = gradients(f, [x, y])
+        tape = Tape([f, g[x], g[y]])
+
+        new_x, new_y = np.array([0.1, -0.4]), np.array([1.5, 0.2])
+        a = Variable("a", new_x)
+        b = Variable("b", new_y)
+        expected_f = wide_graph(a, b)
+        expected_g = gradients(expected_f, [a, b])
+
+        values = tape.replay({x: new_x, y: new_y})
+        np.testing.assert_allclose(values[0], expected_f.value)
+        np.testing.assert_allclose(values[1], expected_g[a].value)
+        np.testing.assert_allclose(values[2], expected_g[b].value)
+
+        with ThreadScheduler(max_workers=4) as scheduler:
+            parallel_values = tape.replay({x: new_x * 2.0, y: new_y}, scheduler=scheduler)
+        sequential_values = tape.replay({x: new_x * 2.0, y: new_y})
+        for parallel_value, sequential_value in zip(parallel_values, sequential_values):
+            np.testing.assert_array_equal(parallel_value, sequential_value)
+
+
+    def test_replay_unknown_input(self):
+        x = Variable("x", 1.0)
+        z = Variable("z", 2.0)
+        tape = Tape([x * x])
+        with self.assertRaises(ValueError):
+            tape.replay({z: 3.0})
+
+
+    def test_constant_folding(self):
+        x = Variable("x", 2.0)
+        c = Constant("c", np.array([1.0, 2.0]))
+        folded = exp(c) * 3.0
+        f = x * folded
+        tape = Tape([f])
+        self.assertEqual(tape.operations, [f])
+        value, = tape.replay({x: 4.0})
+        np.testing.assert_allclose(value, 4.0 * 3.0 * np.exp(c.value))
+
+
+    def test_strip_units(self):
+        x = Variable("x", Quantity(np.array([1.0, 2.0]), U.km))
+        t = Variable("t", Quantity(np.array([2.0, 4.0]), U.s))
+        v = x / t
+        energy = v * v * Quantity(3.0, U.kg) * 0.5
+        g = gradients(energy, [x, t])
+        tape = Tape([energy, g[x], g[t]], strip_units=True)
+
+        self.assertEqual(tape.output_units, [energy.value.unit, g[x].value.unit, g[t].value.unit])
+        values = tape.replay()
+        np.testing.assert_allclose(values[0], energy.value.value)
+        np.testing.assert_allclose(values[1], g[x].value.value)
+        np.testing.assert_allclose(values[2], g[t].value.value)
+
+        # Plain magnitudes are in the recorded unit of the input, quantities are converted.
+        doubled = tape.replay({x: np.array([2.0, 4.0])})
+        np.testing.assert_allclose(doubled[0], 4.0 * energy.value.value)
+        converted = tape.replay({x: Quantity(np.array([2000.0, 4000.0]), U.m)})
+        np.testing.assert_allclose(converted[0], doubled[0])
+        with self.assertRaises(TypeError):
+            tape.replay({x: Quantity(np.array([1.0, 1.0]), U.s)})
+
+        # The nodes are left untouched.
+        np.testing.assert_array_equal(x.value.value, np.array([1.0, 2.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# @file: tests/taylor.py
+# @desc: Test the Taylor-mode higher order derivatives of the mathematics package
+
+import unittest
+import math
+import numpy as np
+from mathematics import Variable, taylor_series, taylor_derivatives
+from mathematics import functions as fn
+
+
+class TestTaylorMode(unittest.TestCase):
+
+    def test_exp(self):
+        x = Variable("x", 0.3)
+        derivatives = taylor_derivatives(fn.exp(x), x, 6)
+        self.assertTrue(np.allclose(derivatives, [math.exp(0.3)] * 7))
+
+
+    def test_log(self):
+        x = Variable("x", 0.3)
+        derivatives = taylor_derivatives(fn.log(x), x, 3)
+        self.assertTrue(np.allclose(derivatives, [math.log(0.3), 1 / 0.3, -1 / 0.3 ** 2, 2 / 0.3 ** 3]))
+
+
+    def test_quotient(self):
+        x = Variable("x", 0.3)
+        derivatives = taylor_derivatives(x / (x + 1.0), x, 3)
+        self.assertTrue(np.allclose(derivatives[1:], [1.3 ** -2, -2 * 1.3 ** -3, 6 * 1.3 ** -4]))
+
+
+    def test_power(self):
+        x = Variable("x", 2.0)
+        self.assertTrue(np.allclose(taylor_derivatives(x ** 3, x, 4), [8, 12, 12, 6, 0]))
+
+        y = x ** x
+        derivatives = taylor_derivatives(y, x, 2)
+        self.assertTrue(np.allclose(derivatives[1:], [4 * (math.log(2) + 1), 4 * (math.log(2) + 1) ** 2 + 2]))
+
+
+    def test_helix_jerk(self):
+        # Jerk and snap of the x coordinate of a helix, r cos(t).
+        t = Variable("t", 0.5)
+        x = 2.0 * fn.cos(t)
+        derivatives = taylor_derivatives(x, t, 4)
+        self.assertTrue(np.allclose(derivatives[3], 2.0 * math.sin(0.5)))
+        self.assertTrue(np.allclose(derivatives[4], 2.0 * math.cos(0.5)))
+
+
+    def test_coefficients(self):
+        x = Variable("x", 0.0)
+        coefficients = taylor_series(fn.sin(x), x, 5)
+        self.assertTrue(np.allclose(coefficients, [0, 1, 0, -1 / 6, 0, 1 / 120]))
+
+
+    def test_abs(self):
+        x = Variable("x", np.array([-2.0, 0.0, 3.0]))
+        with np.errstate(all="raise"):
+            derivatives = taylor_derivatives(fn.abs(x), x, 2)
+        self.assertTrue(np.allclose(derivatives, [[2, 0, 3], [-1, 0, 1], [0, 0, 0]]))
+
+
+    def test_constant_subgraph(self):
+        x = Variable("x", 0.3)
+        y = Variable("y", 0.7)
+        self.assertTrue(np.allclose(taylor_derivatives(fn.sin(y) * x, x, 2), [math.sin(0.7) * 0.3, math.sin(0.7), 0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
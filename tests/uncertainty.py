@@ -0,0 +1,111 @@
+import unittest
+import numpy as np
+import math
+from mathematics import Variable, propagate_uncertainty
+from mathematics.functions import exp, log, sin, atanh
+from physics import Quantity, QuantityArray
+from physics import units as U
+
+
+class TestUncertainty(unittest.TestCase):
+
+    def setUp(self):
+        # Gravitational acceleration from pendulum lengths and periods, g = 4 pi^2 L / T^2
+        self.L = Variable("L", Quantity(np.array([1.0, 2.0]), U.m, variance=np.array([1e-4, 4e-4])))
+        self.T = Variable("T", Quantity(np.array([2.0, 3.0]), U.s, variance=1e-2))
+        self.g = self.L * 4.0 * np.pi ** 2 / (self.T * self.T)
+        L, T = self.L.value.value, self.T.value.value
+        self.dL = 4.0 * np.pi ** 2 / T ** 2
+        self.dT = -8.0 * np.pi ** 2 * L / T ** 3
+
+
+    def test_independent(self):
+        variance = propagate_uncertainty(self.g, [self.L, self.T])
+        np.testing.assert_allclose(variance, self.dL ** 2 * np.array([1e-4, 4e-4]) + self.dT ** 2 * 1e-2)
+
+
+    def test_correlated(self):
+        covariance = np.array([[1e-4, 1e-4], [1e-4, 1e-2]])
+        variance = propagate_uncertainty(self.g, [self.L, self.T], covariance=covariance)
+        np.testing.assert_allclose(variance, self.dL ** 2 * 1e-4 + 2.0 * self.dL * self.dT * 1e-4 + self.dT ** 2 * 1e-2)
+
+
+    def test_quantity_variance(self):
+        q = Quantity(np.array([1.0, 2.0]), U.m, variance=np.array([0.04, 0.09]))
+        np.testing.assert_allclose(q.std, [0.2, 0.3])
+        self.assertEqual(q[1].variance, 0.09)
+        self.assertIsNone(Quantity(1.0, U.m).std)
+
+
+    def test_operators_propagate_the_variance(self):
+        a, b = Quantity(1.0, U.m, variance=0.01), Quantity(2.0, U.m, variance=0.04)
+        self.assertAlmostEqual((a + b).variance, 0.05)
+        self.assertAlmostEqual((a - b).variance, 0.05)
+        self.assertAlmostEqual((a * b).variance, 4.0 * 0.01 + 1.0 * 0.04)
+        self.assertAlmostEqual((a / b).variance, 0.01 / 4.0 + 0.04 / 16.0)
+        self.assertAlmostEqual((b ** 3).variance, (3.0 * 4.0) ** 2 * 0.04)
+        self.assertAlmostEqual((a * 3.0).variance, 0.09)
+        self.assertAlmostEqual((a - a).variance, 0.0)
+        self.assertIn("±", repr(a + b))
+
+        # Conversions scale the variance, in-place updates keep it
+        self.assertAlmostEqual(Quantity(1.0, U.km, variance=1e-6).to(U.m).variance, 1.0)
+        self.assertAlmostEqual((a + Quantity(1.0, U.cm, variance=1.0)).variance, 0.01 + 1e-4)
+        c = Quantity(np.ones(2), U.m, variance=0.01)
+        c += Quantity(np.ones(2), U.m, variance=0.02)
+        c *= 2.0
+        np.testing.assert_allclose(c.variance, 0.12)
+
+
+    def test_operators_match_the_graph_propagation(self):
+        L, T = self.L.value, self.T.value
+        g = L * 4.0 * np.pi ** 2 / (T * T)
+        np.testing.assert_allclose(g.variance, propagate_uncertainty(self.g, [self.L, self.T]))
+
+
+    def test_arrays(self):
+        x = QuantityArray(np.array([1.0, 2.0]), U.m, variance=np.array([0.01, 0.04]))
+        np.testing.assert_allclose((x * x).variance, 4.0 * np.array([1.0, 4.0]) * np.array([0.01, 0.04]))
+        np.testing.assert_allclose(x.to(U.cm).variance, [100.0, 400.0])
+        self.assertAlmostEqual(x.sum().variance, 0.05)
+        self.assertAlmostEqual(x.mean().variance, 0.05 / 4.0)
+        with self.assertWarns(UserWarning):
+            np.sqrt(x)
+
+
+    def test_functions_propagate_the_variance(self):
+        x = Quantity(0.5, U.dimensionless, variance=0.01)
+        self.assertAlmostEqual(exp(x).variance, np.exp(1.0) * 0.01)
+        self.assertAlmostEqual(log(x).variance, 0.04)
+        self.assertAlmostEqual(atanh(x).variance, 0.01 / 0.75 ** 2)
+        self.assertAlmostEqual(sin(Quantity(0.5, U.rad, variance=0.01)).variance, np.cos(0.5) ** 2 * 0.01)
+        np.testing.assert_allclose(exp(QuantityArray([0.0, 1.0], variance=0.01)).variance, np.exp([0.0, 2.0]) * 0.01)
+
+        a, b = Quantity(7.0, U.m, variance=0.01), Quantity(2.0, U.m, variance=0.04)
+        self.assertAlmostEqual((a % b).variance, 0.01 + 9.0 * 0.04)
+        with self.assertWarns(UserWarning):
+            a // b
+        with self.assertWarns(UserWarning):
+            math.floor(a)
+
+
+    def test_array_methods_keep_the_variance(self):
+        variance = np.array([[0.01, 0.02, 0.03], [0.04, 0.05, 0.06]])
+        x = QuantityArray(np.array([[3.0, 1.0, 2.0], [0.0, 5.0, 4.0]]), U.m, variance=variance)
+        np.testing.assert_allclose(x.reshape(3, 2).variance, variance.reshape(3, 2))
+        np.testing.assert_allclose(x.ravel().variance, variance.ravel())
+        np.testing.assert_allclose(x.T.variance, variance.T)
+        np.testing.assert_allclose(x.cumsum(axis=1).variance, variance.cumsum(axis=1))
+        np.testing.assert_allclose(x.cumsum().variance, variance.cumsum())
+        self.assertAlmostEqual(x.min().variance, 0.04)
+        self.assertAlmostEqual(x.max().variance, 0.05)
+        np.testing.assert_allclose(x.min(axis=1).variance, [0.02, 0.04])
+        np.testing.assert_allclose(x.max(axis=0, keepdims=True).variance, [[0.01, 0.05, 0.06]])
+        self.assertEqual([q.variance for q in x[0]], [0.01, 0.02, 0.03])
+
+        # A variance shared by all the elements stays shared
+        self.assertEqual(QuantityArray(np.ones((2, 2)), U.m, variance=0.01).T.variance, 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from physics import Unit, Prefix, parse_unit
+from physics import units as U
+
+
+class TestUnitParser(unittest.TestCase):
+
+    def test_products_quotients_and_powers(self):
+        self.assertEqual(parse_unit("kg*m/s^2"), U.N)
+        self.assertEqual(parse_unit("kg m^2 s^-2"), U.J)
+        self.assertEqual(parse_unit("N/m"), U.N / U.m)
+        self.assertEqual(parse_unit("(m/s)**2"), U.m ** 2 / U.s ** 2)
+        self.assertEqual(parse_unit("m/s/s"), U.m / U.s ** 2)
+        self.assertEqual(parse_unit("1/s"), U.Hz)
+        self.assertEqual(parse_unit("m^(1/2)"), U.m ** 0.5)
+        self.assertEqual(parse_unit("m^(4/2)"), U.m2)
+
+
+    def test_prefixes_and_symbols(self):
+        self.assertIs(parse_unit("N"), U.N)
+        self.assertIs(parse_unit("km"), U.km)
+        self.assertIs(parse_unit("dam"), U.dam)
+        self.assertEqual(parse_unit("ms"), Unit(U.s.base, Prefix(1e-3)))
+        self.assertEqual(parse_unit("kN").prefix, Prefix(1e3))
+        self.assertEqual(parse_unit("mm^3"), U.mm ** 3)
+        self.assertAlmostEqual(parse_unit("km/h").prefix.factor, 1 / 3.6)
+        self.assertIs(parse_unit("min"), U.minute)
+        self.assertIs(parse_unit("h"), U.hour)
+        self.assertFalse(hasattr(U, "min") or hasattr(U, "h"))
+        with self.assertRaises(ValueError):
+            parse_unit("kkm")
+
+
+    def test_grams(self):
+        self.assertIs(parse_unit("kg"), U.kg)
+        self.assertIs(parse_unit("g"), U.g)
+        self.assertIs(parse_unit("mg"), U.mg)
+        self.assertIs(parse_unit("ug"), U.ug)
+        self.assertEqual(parse_unit("Mg").prefix, Prefix(1e3))
+        self.assertEqual(parse_unit("mg/m^3"), U.mg / U.m ** 3)
+        for expression in ["kkg", "mkg", "m2"]:
+            with self.assertRaises(ValueError):
+                parse_unit(expression)
+
+
+    def test_results_are_cached_and_interned(self):
+        unit = parse_unit("kg*m/s^2")
+        hits = parse_unit.cache_info().hits
+        for _ in range(100):
+            self.assertIs(parse_unit("kg*m/s^2"), unit)
+        self.assertEqual(parse_unit.cache_info().hits - hits, 100)
+        self.assertIs(unit, U.kg * U.m / U.s ** 2)
+
+
+    def test_invalid_expressions(self):
+        for expression in ["", "xyz", "m^", "m)", "(m", "m/", "2m", "m^a", "m%s"]:
+            with self.assertRaises(ValueError):
+                parse_unit(expression)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import copy
+import pickle
+import unittest
+from physics import Unit, Prefix, BaseQuantity, Quantity, conversion_factor, unit_cache_info, clear_unit_cache
+from physics import basis
+from physics import units as U
+
+
+class TestUnitRegistry(unittest.TestCase):
+
+    def test_interning(self):
+        self.assertIs(Unit(basis.length), U.m)
+        self.assertIs(Unit(basis.length, Prefix(1e3)), U.km)
+        self.assertIs(Unit(BaseQuantity(1, -2, 1, 0, 0, 0, 0), Prefix(1), 'N'), U.N)
+        self.assertIs(copy.deepcopy(U.J), U.J)
+        self.assertIs(pickle.loads(pickle.dumps(U.km)), U.km)
+
+
+    def test_equality(self):
+        self.assertIs(U.kg * U.m / U.s ** 2, (U.kg * U.m / U.s ** 2))
+        self.assertEqual(U.kg * U.m / U.s ** 2, U.N)
+        self.assertEqual(U.rad, U.dimensionless)
+        self.assertNotEqual(U.km, U.m)
+        self.assertNotEqual(U.m, U.s)
+        self.assertEqual(len({U.N, U.kg * U.m / U.s ** 2, U.J}), 2)
+
+
+    def test_derived_units_are_cached(self):
+        self.assertIs(U.N * U.m, U.N * U.m)
+        self.assertIs(U.km ** 2, U.km ** 2)
+        self.assertEqual((U.km / U.s).prefix.factor, 1e3)
+
+
+    def test_base_quantity(self):
+        self.assertIs(basis.length / basis.time, basis.velocity)
+        self.assertEqual((basis.mass * basis.acceleration).dimensions, (1, -2, 1, 0, 0, 0, 0))
+        self.assertEqual(basis.force.quantity_info, {'m': 1, 's': -2, 'kg': 1, 'K': 0, 'A': 0, 'mol': 0, 'cd': 0})
+        self.assertEqual(repr(basis.length ** 0.5), "m^0.5")
+        self.assertIs(basis.area ** 0.5, basis.length)
+        self.assertIs(pickle.loads(pickle.dumps(basis.energy)), basis.energy)
+
+
+    def test_prefix(self):
+        self.assertIs(Prefix(1e-3), Prefix(0.001))
+        self.assertIs(Prefix(1e-3) * Prefix(1e3), Prefix(1))
+        self.assertIs(Prefix(1e-2) ** 2, Prefix(1e-4))
+        self.assertIs(Prefix(1e-3) / Prefix(1e-6), Prefix(1e3))
+        self.assertEqual(Prefix(1e3).symbol, 'k')
+        self.assertEqual((Prefix(1e2) ** 0.5).factor, 10.0)
+        self.assertIsNone(Prefix(0.3048).exponent)
+        self.assertAlmostEqual((Prefix(0.3048) ** 2).factor, 0.09290304)
+        self.assertIs(U.km * U.mm, U.m ** 2)
+
+
+    def test_cache(self):
+        clear_unit_cache()
+        for _ in range(3):
+            U.N / U.m * U.m2
+            U.J / U.s
+        info = unit_cache_info()
+        self.assertEqual(info['*'].misses, 1)
+        self.assertEqual(info['*'].hits, 2)
+        self.assertEqual(info['/'].misses, 2)
+        self.assertEqual(info['/'].hits, 4)
+
+        self.assertAlmostEqual(conversion_factor(U.km, U.cm), 1e5)
+        self.assertAlmostEqual(Quantity(2.0, U.km).to(U.m).value, 2000.0)
+        self.assertEqual(unit_cache_info()['to'].misses, 2)
+        with self.assertRaises(ValueError):
+            conversion_factor(U.km, U.s)
+
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            U.m.symbol = "metre"
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@
 # @desc: Test the Variable class for automatic differentiation on the Quantity class of the physics package
 
 import unittest
+import numpy as np
 from mathematics import Variable, gradients
 from mathematics import functions as fn
 from physics import Quantity
@@ -60,6 +61,30 @@ class TestVariableOperations(unittest.TestCase):
         self.assertEqual(b.value, 0)
 
 
+    def test_functions_dispatch(self):
+        # Arrays and scalars go to NumPy, quantities check their units.
+        self.assertTrue(np.allclose(fn.exp(np.array([0.0, 1.0])), [1.0, np.e]))
+        self.assertEqual(fn.abs(-2.0), 2.0)
+        angles = fn.sin(Quantity(np.array([0.0, np.pi / 2]), U.rad))
+        self.assertTrue(np.allclose(angles.value, [0.0, 1.0]))
+        with self.assertRaises(TypeError):
+            fn.sin(Quantity(1.0, U.m))
+
+        # Nodes on either side build graph nodes.
+        a = Variable('a', 2.0)
+        self.assertEqual(fn.sub(3.0, a).value, 1.0)
+        self.assertEqual(fn.pow(2.0, a).value, 4.0)
+        self.assertEqual(fn.mul(np.ones(2), a).value.tolist(), [2.0, 2.0])
+
+
+    def test_gradient_difference(self):
+        a = Variable("a", Quantity(2, U.m))
+        b = Variable("b", Quantity(1, U.m))
+        grads = gradients(a - b, [a, b])
+        self.assertEqual(grads[a], 1)
+        self.assertEqual(grads[b], -1)
+
+
     def test_gradient_sum(self):
         a = Variable("a", Quantity(2, U.m))
         b = Variable("b", Quantity(1, U.m))